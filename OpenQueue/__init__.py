@@ -1,30 +1,34 @@
 # -*- coding: utf-8 -*-
 
-import backblaze
-import dathost
-import aiohttp
-import aiojobs
-import bcrypt
-
-from typing import Tuple, Union, AsyncGenerator
-from databases import Database
+import asyncio
+import logging
+
+from typing import Any, Awaitable, Dict, List, Tuple, Union, AsyncGenerator
 from datetime import datetime
-from sqlalchemy.sql import or_, func, select
-from secrets import token_urlsafe
+from time import perf_counter
+from sqlalchemy.sql import select
 
-from .resources import Sessions, Config
+from .resources import Sessions, Config, QueueGlobal, Cache
 from .webhook import WebhookSender
+from .ban_index import ActiveBanIndex
+from .ban_sweeper import BanSweeper
+from .match_archiver import MatchArchiver
+from .external_ids import ExternalIdResolver
+from .search import FULL_TEXT_ENGINES, SearchIndex
+from .database import InstrumentedDatabase
+from .scheduler import JobScheduler
+from .migrations import migrate
 
 from .tables import (
-    create_tables,
     user_table,
-    league_table,
     integration_table
 )
 
 from .user import User
 from .league import League
+from .league.transfer import Progress, import_league
 from .queue import Queue
+from .queue.timer import TimerWheel
 from .login import Login
 
 from .settings.database import DatabaseSettings
@@ -40,19 +44,23 @@ from .settings.webhook import WebhookSettings
 from .settings.playwin import PlaywinSettings
 from .settings.smtp import SmtpSettings
 from .settings.integration import IntegrationSettings
+from .settings.ban import BanSweepSettings
+from .settings.archive import MatchArchiveSettings
+from .settings.scheduler import SchedulerSettings
 
 from .misc import str_uuid4, cache_events, leagues
 
-from .exceptions import (
-    UserTaken,
-    InvalidUser
-)
+from .exceptions import UserTaken
 
 from .models.user import UserModel
 from .models.league import LeagueModel
 from .models.integration import IntegrationModel
+from .models.columnar import ColumnarResult
 
-from .email import send_email
+from .email import send_template
+from .email.sender import MailSender
+from .email.templates import compile_templates
+from .email.code import create_email_code
 
 
 __version__ = "0.0.37"
@@ -63,6 +71,9 @@ __author_email__ = "wardpearce@protonmail.com"
 __license__ = "AGPL-3.0 License"
 
 
+logger = logging.getLogger("OpenQueue")
+
+
 class OpenQueue:
     def __init__(self, database_settings: DatabaseSettings,
                  b2_settings: B2Settings,
@@ -74,7 +85,10 @@ class OpenQueue:
                  game_tick_settings: GameTickSettings = GameTickSettings(),
                  demo_settings: DemoSettings = DemoSettings(),
                  playwin_settings: PlaywinSettings = None,
-                 integration_settings: IntegrationSettings = None
+                 integration_settings: IntegrationSettings = None,
+                 ban_sweep_settings: BanSweepSettings = BanSweepSettings(),
+                 match_archive_settings: MatchArchiveSettings = None,
+                 scheduler_settings: SchedulerSettings = SchedulerSettings()
                  ) -> None:
         """Skrim Base functionality.
 
@@ -97,6 +111,15 @@ class OpenQueue:
             If not provided then it will use defaults
             already saved in the database.
             by default None
+        ban_sweep_settings : BanSweepSettings, optional
+            If None expired bans are never archived,
+            by default BanSweepSettings()
+        match_archive_settings : MatchArchiveSettings, optional
+            If None old matches are never archived,
+            by default None
+        scheduler_settings : SchedulerSettings, optional
+            Deadlines of background jobs on shutdown,
+            by default SchedulerSettings()
         """
 
         # Sessions should never be created here
@@ -112,6 +135,7 @@ class OpenQueue:
         assert isinstance(steam_settings, SteamSettings)
         assert isinstance(webhook_settings, WebhookSettings)
         assert isinstance(game_tick_settings, GameTickSettings)
+        assert isinstance(scheduler_settings, SchedulerSettings)
         assert isinstance(
             playwin_settings, PlaywinSettings
         ) if playwin_settings else True
@@ -126,22 +150,63 @@ class OpenQueue:
         Config.game_tick = game_tick_settings
         Config.database = database_settings
         Config.smtp = smtp_settings
+        Config.scheduler = scheduler_settings
 
         self.dathost_settings = dathost_settings
         self.integration_settings = integration_settings
+        self.ban_sweep_settings = ban_sweep_settings
+        self.match_archive_settings = match_archive_settings
+
+        self.startup_timings: Dict[str, float] = {}
+
+    async def __timed(self, name: str, coro: Awaitable) -> Any:
+        """Records how long a startup step took in milliseconds.
+        """
+
+        start = perf_counter()
+        result = await coro
+        self.startup_timings[name] = round((perf_counter() - start) * 1000, 3)
+
+        return result
+
+    async def migrate(self) -> List[Tuple[int, int, int]]:
+        """Creates missing tables & applies pending migrations,
+        ran by OpenQueue.startup.
 
-        create_tables(
+        Returns
+        -------
+        List[Tuple[int, int, int]]
+            Versions applied.
+        """
+
+        # Migrations use a synchronous engine.
+        return await asyncio.get_event_loop().run_in_executor(
+            None,
+            migrate,
             "{}+{}{}".format(
-                database_settings.engine,
-                database_settings.alchemy_engine,
-                database_settings.url
+                Config.database.engine,
+                Config.database.alchemy_engine,
+                Config.database.url
             )
         )
 
     async def startup(self) -> None:
         """Connects to sessions
+
+        Notes
+        -----
+        Independent steps are ran concurrently, how long
+        each took is stored in OpenQueue.startup_timings.
         """
 
+        start = perf_counter()
+
+        # Imported here so importing OpenQueue for its models
+        # doesn't pay for the HTTP clients.
+        import backblaze
+        import dathost
+        import aiohttp
+
         self.b2 = backblaze.Awaiting(
             Config.b2.key_id,
             Config.b2.application_key
@@ -159,48 +224,163 @@ class OpenQueue:
             Config.b2.bucket_id
         )
 
-        Sessions.database = Database(
-            Config.database.engine + Config.database.url
+        Sessions.database = InstrumentedDatabase(
+            Config.database.engine + Config.database.url,
+            slow_query_ms=Config.database.slow_query_ms,
+            replicas=Config.database.replicas,
+            replica_sticky=Config.database.replica_sticky,
+            replica_retry=Config.database.replica_retry,
+            pool_timeout=Config.database.pool_timeout,
+            **Config.database.pool_options
         )
 
-        Sessions.scheduler = await aiojobs.create_scheduler()
+        Sessions.scheduler = JobScheduler(Config.scheduler)
+        Sessions.mail = MailSender(Config.smtp)
 
-        await Sessions.database.connect()
-        await self.b2.authorize()
+        QueueGlobal.timer_wheel = TimerWheel()
 
-        await cache_events()
+        Cache.external_ids = ExternalIdResolver()
+        Cache.bans = ActiveBanIndex()
+        Cache.search = (
+            SearchIndex() if Config.database.engine not in FULL_TEXT_ENGINES
+            else None
+        )
 
-        if self.integration_settings:
-            current_integrations = await Sessions.database.fetch_all(
+        loop = asyncio.get_event_loop()
+
+        # Static fragments of email templates are rendered once.
+        await asyncio.gather(
+            self.__timed("migrate", self.migrate()),
+            self.__timed("database", Sessions.database.connect()),
+            self.__timed("b2", self.b2.authorize()),
+            self.__timed("templates",
+                         loop.run_in_executor(None, compile_templates))
+        )
+
+        # Each step runs in its own task, so gets its own connection.
+        steps = [
+            self.__timed("events", cache_events()),
+            self.__timed("integrations", self.__seed_integrations()),
+            self.__timed("bans", Cache.bans.load()),
+            self.__timed("jobs", Sessions.scheduler.resume(self))
+        ]
+        if Cache.search:
+            steps.append(self.__timed("search", Cache.search.load()))
+
+        await asyncio.gather(*steps)
+
+        if self.ban_sweep_settings:
+            await Sessions.scheduler.spawn(
+                BanSweeper(self.ban_sweep_settings).run(),
+                "sweeper"
+            )
+
+        if self.match_archive_settings:
+            await Sessions.scheduler.spawn(
+                MatchArchiver(self.match_archive_settings).run(),
+                "archiver"
+            )
+
+        self.startup_timings["total"] = round(
+            (perf_counter() - start) * 1000, 3
+        )
+
+        logger.info("Started in %.0fms, %s", self.startup_timings["total"],
+                    self.startup_timings)
+
+    async def __seed_integrations(self) -> None:
+        """Inserts default integrations what are missing.
+        """
+
+        if not self.integration_settings:
+            return
+
+        current_integrations = {
+            row["name"] for row in await Sessions.database.fetch_all(
                 select([
                     integration_table.c.name
                 ]).select_from(integration_table)
             )
-            if current_integrations:
-                current_integrations = [
-                    name[0] for name in current_integrations
-                ]
-            else:
-                current_integrations = []
-
-            for intergration in self.integration_settings.defaults:
-                if intergration.name not in current_integrations:
-                    await Sessions.database.execute(
-                        integration_table.insert().values(
-                            **intergration.api_schema(False)
-                        )
-                    )
+        }
+
+        missing = [
+            intergration.api_schema(False)
+            for intergration in self.integration_settings.defaults
+            if intergration.name not in current_integrations
+        ]
+
+        if missing:
+            await Sessions.database.execute(
+                integration_table.insert().values(missing)
+            )
 
     async def shutdown(self) -> None:
         """Closes sessions.
+
+        Notes
+        -----
+        Background jobs are drained first, jobs what don't finish
+        within the deadline of their class are cancelled. Demo
+        uploads, webhooks & server stops are persisted & resumed
+        on the next startup.
         """
 
-        await Sessions.scheduler.close()
+        await QueueGlobal.timer_wheel.close()
+        await Sessions.scheduler.drain()
+        await Sessions.mail.close()
         await Sessions.database.disconnect()
         await Sessions.requests.close()
         await Sessions.game.close()
         await self.b2.close()
 
+    def query_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Used to get query timings, keyed by module & function
+        what ran the query, e.g. "league.players".
+
+        Returns
+        -------
+        Dict[str, Dict[str, Any]]
+            count, rows, total_ms, mean_ms, max_ms, p50_ms, p95_ms,
+            p99_ms & buckets of latencies in milliseconds.
+        """
+
+        return Sessions.database.stats.snapshot()
+
+    def pool_stats(self) -> Dict[str, Any]:
+        """Used to get stats of the primary's connection pool.
+
+        Returns
+        -------
+        Dict[str, Any]
+            size, idle, in_use, peak_in_use, acquired, timeouts,
+            wait_total_ms, wait_mean_ms & wait_max_ms.
+        """
+
+        return Sessions.database.pool_stats()
+
+    def replica_stats(self) -> List[Dict[str, Any]]:
+        """Used to get reads, failures & health of read replicas.
+
+        Returns
+        -------
+        List[Dict[str, Any]]
+        """
+
+        return Sessions.database.replica_stats()
+
+    def job_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Used to get queue depth & latency per background job class.
+
+        Returns
+        -------
+        Dict[str, Dict[str, Any]]
+            limit, pending_limit, running, pending, peak_pending,
+            spawners_waiting, spawned, failed, cancelled & timings
+            of waiting for a slot & running in milliseconds.
+        """
+
+        return Sessions.scheduler.stats()
+
     async def create_user(self, name: str, email: str,
                           password: str) -> Tuple[UserModel, User]:
         """Used to create user.
@@ -217,15 +397,18 @@ class OpenQueue:
         User
         """
 
+        import bcrypt
+
         user_id = str_uuid4()
-        email_code = token_urlsafe(24)
+        email_code, hashed_code, code_expires = create_email_code()
 
         values = {
             "user_id": user_id,
             "name": name,
             "email": email,
             "email_confirmed": False,
-            "email_code": email_code,
+            "email_code": hashed_code,
+            "email_code_expires": code_expires,
             "password": bcrypt.hashpw(password.encode(), bcrypt.gensalt()),
             "timestamp": datetime.now()
         }
@@ -239,23 +422,17 @@ class OpenQueue:
         else:
             user_model = UserModel(**values)
 
-            await Sessions.scheduler.spawn(
-                WebhookSender(user_model).user_created()
-            )
+            if Cache.search:
+                Cache.search.add_user(name)
+
+            await WebhookSender(user_model).spawn("user.created")
 
             await Sessions.scheduler.spawn(
-                send_email(
-                    to=email,
-                    subject="Skrim.gg | Please confirm your email!",
-                    header="Welcome to Skrim.gg, {}!".format(name),
-                    body="""Thanks for joining Skrim.gg!
-                    Please click the button to confirm your email.
-
-                    If you didn't sign up to Skrim.gg, please
-                    ignore this email.""",
-                    button="Confirm my email",
-                    url=Config.smtp.confirmation + values["email_code"]
-                )
+                send_template(
+                    email, "confirmation", name=name,
+                    url=Config.smtp.confirmation + email_code
+                ),
+                "email"
             )
 
             return user_model, self.user(values["user_id"])
@@ -278,34 +455,30 @@ class OpenQueue:
         InvalidUser
         """
 
-        row = await Sessions.database.fetch_one(
-            select([
-                user_table,
-                func.group_concat(
-                    league_table.c.league_id
-                ).label("league_ids")
-            ]).select_from(
-                user_table.join(
-                    league_table,
-                    league_table.c.user_id == user_table.c.user_id,
-                    isouter=True
-                )
-            ).where(
-                or_(
-                    user_table.c.discord_id == external_id,
-                    user_table.c.steam_id == external_id,
-                    user_table.c.dathost_id == external_id
-                )
-            ).group_by(
-                user_table.c.user_id,
-                league_table.c.user_id
-            )
-        )
+        model = await Cache.external_ids.resolve(external_id)
+        return model, self.user(model.user_id)
 
-        if row:
-            return UserModel(**row), self.user(row["user_id"])
-        else:
-            raise InvalidUser()
+    async def external_ids_to_users(self, external_ids: List[Union[str, int]]
+                                    ) -> Dict[Union[str, int],
+                                              Tuple[UserModel, User]]:
+        """Converts many external IDs with one query.
+
+        Parameters
+        ----------
+        external_ids : List[Union[str, int]]
+
+        Returns
+        -------
+        Dict[Union[str, int], Tuple[UserModel, User]]
+            External IDs what didn't match a user are left out.
+        """
+
+        return {
+            external_id: (model, self.user(model.user_id))
+            for external_id, model in (
+                await Cache.external_ids.resolve_many(external_ids)
+            ).items()
+        }
 
     async def integrations(self) -> AsyncGenerator[IntegrationModel, None]:
         """Lists all optional integrations.
@@ -319,6 +492,20 @@ class OpenQueue:
         async for row in Sessions.database.iterate(query):
             yield IntegrationModel(**row)
 
+    async def integrations_columnar(self
+                                    ) -> ColumnarResult[IntegrationModel]:
+        """Lists all optional integrations without building
+        a model per integration.
+
+        Returns
+        -------
+        ColumnarResult[IntegrationModel]
+        """
+
+        return await ColumnarResult.fetch(
+            IntegrationModel, integration_table.select()
+        )
+
     def login(self, email: str, password: str) -> Login:
         """Used to interact with user login.
 
@@ -334,7 +521,8 @@ class OpenQueue:
 
         return Login(self, email, password)
 
-    def create_queue(self, capacity: int = 10) -> Queue:
+    def create_queue(self, capacity: int = 10, ready_timeout: float = 30.0,
+                     backfill_capacity: int = None) -> Queue:
         """Used to create a queue.
 
         Notes
@@ -345,13 +533,19 @@ class OpenQueue:
         ----------
         capacity : int, optional
             by default 10
+        ready_timeout : float, optional
+            Seconds players have to accept the ready check,
+            by default 30.0
+        backfill_capacity : int, optional
+            Players allowed to wait for a free slot,
+            by default same as capacity.
 
         Returns
         -------
         Queue
         """
 
-        return Queue(capacity)
+        return Queue(capacity, ready_timeout, backfill_capacity)
 
     def user(self, user_id: str) -> User:
         """Used to interact with user.
@@ -381,6 +575,39 @@ class OpenQueue:
 
         return League(league_id)
 
+    async def import_league(self, pathway: str, format: str = "ndjson",
+                            chunk_size: int = 500,
+                            progress: Progress = None,
+                            atomic: bool = True) -> Dict[str, int]:
+        """Used to import a league exported by League.export.
+
+        Parameters
+        ----------
+        pathway : str
+            File for ndjson, directory for csv.
+        format : str, optional
+            ndjson or csv, by default "ndjson"
+        chunk_size : int, optional
+            Rows per insert, by default 500
+        progress : Progress, optional
+            Called with the table & rows imported, by default None
+        atomic : bool, optional
+            Import in one transaction, else each chunk is committed
+            once inserted, by default True
+
+        Returns
+        -------
+        Dict[str, int]
+            Rows imported per table.
+
+        Notes
+        -----
+        Users the league references must already exist.
+        """
+
+        return await import_league(pathway, format, chunk_size, progress,
+                                   atomic)
+
     async def leagues(self, search: str = None,
                       desc: bool = True
                       ) -> AsyncGenerator[Tuple[LeagueModel, League], None]:
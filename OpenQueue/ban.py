@@ -5,8 +5,8 @@ from sqlalchemy.sql import and_
 from .models.ban import BanRevokedModel, BanModel
 
 from .exceptions import InvalidBan
-from .resources import Sessions
-from .tables import ban_table, ban_exception_table
+from .resources import Sessions, Cache
+from .tables import ban_table, ban_exception_table, ban_history_table
 from .webhook import WebhookSender
 
 
@@ -38,6 +38,10 @@ class Ban:
     async def get(self) -> BanModel:
         """Used to get ban.
 
+        Notes
+        -----
+        Falls back to the ban history for archived bans.
+
         Returns
         -------
         BanModel
@@ -51,8 +55,22 @@ class Ban:
             ban_table.select().where(self.__and_statement)
         )
 
+        if not row:
+            row = await Sessions.database.fetch_one(
+                ban_history_table.select().where(
+                    and_(
+                        ban_history_table.c.ban_id == self.ban_id,
+                        ban_history_table.c.user_id == self.user_id,
+                        ban_history_table.c.league_id == self.league_id
+                    )
+                )
+            )
+
         if row:
-            return BanModel(**row)
+            return BanModel(**{
+                key: value for key, value in row.items()
+                if key != "archived"
+            })
         else:
             raise InvalidBan()
 
@@ -76,17 +94,17 @@ class Ban:
         except Exception:
             raise InvalidBan()
 
-        await Sessions.scheduler.spawn(
-            WebhookSender(
-                BanRevokedModel(
-                    self.user_id,
-                    self.ban_id,
-                    True,
-                    self.league_id
-                ),
+        Cache.bans.add_exception(self.ban_id, self.league_id)
+
+        await WebhookSender(
+            BanRevokedModel(
+                self.user_id,
+                self.ban_id,
+                True,
                 self.league_id
-            ).user_ban_revoked()
-        )
+            ),
+            self.league_id
+        ).spawn("user.ban.revoked")
 
     async def revoke(self) -> None:
         """Used to revoke a ban.
@@ -100,14 +118,14 @@ class Ban:
             )
         )
 
-        await Sessions.scheduler.spawn(
-            WebhookSender(
-                BanRevokedModel(
-                    self.user_id,
-                    self.ban_id,
-                    True,
-                    self.league_id
-                ),
+        Cache.bans.remove(self.ban_id)
+
+        await WebhookSender(
+            BanRevokedModel(
+                self.user_id,
+                self.ban_id,
+                True,
                 self.league_id
-            ).user_ban_revoked()
-        )
+            ),
+            self.league_id
+        ).spawn("user.ban.revoked")
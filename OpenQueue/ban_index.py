@@ -0,0 +1,275 @@
+# -*- coding: utf-8 -*-
+
+import asyncio
+
+from datetime import datetime
+from heapq import heappush, heappop
+from time import monotonic
+from typing import Any, Dict, List, Set, Tuple, Union
+from sqlalchemy.sql import and_, or_, select
+
+from .resources import Sessions
+from .tables import ban_table, ban_exception_table
+
+from .models.ban import BanModel
+
+
+class ActiveBanIndex:
+    def __init__(self, ttl: float = 10.0) -> None:
+        """In memory index of active bans.
+
+        Parameters
+        ----------
+        ttl : float, optional
+            Seconds before the index is reloaded from the
+            database, by default 10.0
+
+        Notes
+        -----
+        Bans, revokes & exceptions of this process are applied
+        straight away, ones of other processes are seen once the
+        index is reloaded, so at most ttl seconds late.
+        """
+
+        self.ttl = ttl
+
+        self.__reset()
+
+        # monotonic time the index was loaded, None if it wasn't.
+        self.__loaded: Union[float, None] = None
+        self.__lock: Union[asyncio.Lock, None] = None
+        # Changes made while loading, replayed once loaded.
+        self.__changes: Union[List[Tuple[str, Tuple[Any, ...]]], None] = \
+            None
+
+    def __reset(self) -> None:
+        # ban_id -> BanModel
+        self.__bans: Dict[str, BanModel] = {}
+        # user_id -> ban_ids
+        self.__global: Dict[str, Set[str]] = {}
+        # league_id -> user_id -> ban_ids
+        self.__leagues: Dict[str, Dict[str, Set[str]]] = {}
+        # league_id -> ban_ids ignored by the league
+        self.__exceptions: Dict[str, Set[str]] = {}
+        # Heap of expires & ban_id
+        self.__expiries: List[Tuple[datetime, str]] = []
+
+    def __len__(self) -> int:
+        return len(self.__bans)
+
+    @property
+    def stale(self) -> bool:
+        return self.__loaded is None or \
+            monotonic() - self.__loaded >= self.ttl
+
+    def invalidate(self) -> None:
+        """Used to reload the index on its next use.
+        """
+
+        self.__loaded = None
+
+    async def load(self) -> None:
+        """Loads active bans & exceptions from the database.
+        """
+
+        if not self.__lock:
+            self.__lock = asyncio.Lock()
+
+        async with self.__lock:
+            await self.__load()
+
+    async def __load(self) -> None:
+        self.__changes = []
+        loaded = monotonic()
+
+        try:
+            bans = [
+                BanModel(**row) async for row in
+                Sessions.database.iterate(ban_table.select().where(
+                    and_(
+                        ban_table.c.revoked == False,  # noqa: E712
+                        or_(
+                            ban_table.c.expires == None,  # noqa: E711
+                            ban_table.c.expires > datetime.now()
+                        )
+                    )
+                ))
+            ]
+
+            exceptions = [
+                (row["ban_id"], row["league_id"]) async for row in
+                Sessions.database.iterate(select([
+                    ban_exception_table.c.ban_id,
+                    ban_exception_table.c.league_id
+                ]).select_from(ban_exception_table))
+            ]
+        except Exception:
+            self.__changes = None
+            raise
+
+        changes, self.__changes = self.__changes, None
+
+        self.__reset()
+
+        for ban in bans:
+            self.add(ban)
+
+        for ban_id, league_id in exceptions:
+            self.add_exception(ban_id, league_id)
+
+        # The queries may have ran before these were written.
+        for name, args in changes:
+            getattr(self, name)(*args)
+
+        self.__loaded = loaded
+
+    async def __fresh(self) -> None:
+        if not self.stale:
+            return
+
+        if not self.__lock:
+            self.__lock = asyncio.Lock()
+
+        async with self.__lock:
+            # Loaded while waiting on the lock.
+            if self.stale:
+                await self.__load()
+
+    def add(self, ban: BanModel) -> None:
+        """Used to index a ban.
+
+        Parameters
+        ----------
+        ban : BanModel
+        """
+
+        if self.__changes is not None:
+            self.__changes.append(("add", (ban,)))
+
+        if ban.revoked or ban.is_expired:
+            return
+
+        self.__bans[ban.ban_id] = ban
+
+        if ban.global_ or not ban.league_id:
+            users = self.__global
+        else:
+            users = self.__leagues.setdefault(ban.league_id, {})
+
+        users.setdefault(ban.user_id, set()).add(ban.ban_id)
+
+        if ban.expires:
+            heappush(self.__expiries, (ban.expires, ban.ban_id))
+
+    def remove(self, ban_id: str) -> None:
+        """Used to remove a ban, e.g. when revoked.
+
+        Parameters
+        ----------
+        ban_id : str
+        """
+
+        if self.__changes is not None:
+            self.__changes.append(("remove", (ban_id,)))
+
+        ban = self.__bans.pop(ban_id, None)
+        if not ban:
+            return
+
+        if ban.global_ or not ban.league_id:
+            users = self.__global
+        else:
+            users = self.__leagues.get(ban.league_id, {})
+
+        ban_ids = users.get(ban.user_id)
+        if ban_ids:
+            ban_ids.discard(ban_id)
+            if not ban_ids:
+                del users[ban.user_id]
+
+        # Exceptions are keyed by ban so can't outlive it.
+        for ignored in self.__exceptions.values():
+            ignored.discard(ban_id)
+
+    def add_exception(self, ban_id: str, league_id: str) -> None:
+        """Used to ignore a global ban for a league.
+
+        Parameters
+        ----------
+        ban_id : str
+        league_id : str
+        """
+
+        if self.__changes is not None:
+            self.__changes.append(("add_exception", (ban_id, league_id)))
+
+        self.__exceptions.setdefault(league_id, set()).add(ban_id)
+
+    def __age(self) -> None:
+        """Drops expired bans.
+        """
+
+        now = datetime.now()
+        while self.__expiries and self.__expiries[0][0] <= now:
+            _, ban_id = heappop(self.__expiries)
+            self.remove(ban_id)
+
+    def __user_bans(self, user_id: str, league_id: str = None
+                    ) -> List[BanModel]:
+        ignored = self.__exceptions.get(league_id, ()) if league_id else ()
+
+        bans = [
+            self.__bans[ban_id]
+            for ban_id in self.__global.get(user_id, ())
+            if ban_id not in ignored
+        ]
+
+        if league_id and league_id in self.__leagues:
+            bans += [
+                self.__bans[ban_id]
+                for ban_id in self.__leagues[league_id].get(user_id, ())
+            ]
+
+        return bans
+
+    async def active_bans(self, user_ids: List[str], league_id: str = None
+                          ) -> List[BanModel]:
+        """Used to get active bans of users.
+
+        Parameters
+        ----------
+        user_ids : List[str]
+        league_id : str, optional
+            Include league bans & apply league exceptions,
+            by default None
+
+        Returns
+        -------
+        List[BanModel]
+        """
+
+        await self.__fresh()
+
+        self.__age()
+
+        bans = []
+        for user_id in user_ids:
+            bans += self.__user_bans(user_id, league_id)
+
+        return bans
+
+    async def is_banned(self, user_id: str, league_id: str = None) -> bool:
+        """Used to check if a user has a active ban.
+
+        Parameters
+        ----------
+        user_id : str
+        league_id : str, optional
+            by default None
+
+        Returns
+        -------
+        bool
+        """
+
+        return len(await self.active_bans([user_id], league_id)) > 0
@@ -0,0 +1,120 @@
+# -*- coding: utf-8 -*-
+
+from datetime import datetime
+from typing import Dict, List
+from sqlalchemy.sql import and_, or_
+
+from .resources import Sessions, Cache
+from .tables import ban_table, ban_history_table, ban_exception_table
+from .webhook import WebhookSender
+from .scheduler import periodic
+from .settings.ban import BanSweepSettings
+
+from .models.ban import BansModel, BanRevokedModel
+
+
+class BanSweeper:
+    def __init__(self, settings: BanSweepSettings) -> None:
+        """Moves expired & revoked bans into the ban history.
+
+        Parameters
+        ----------
+        settings : BanSweepSettings
+        """
+
+        self.settings = settings
+
+    async def sweep(self) -> int:
+        """Archives expired & revoked bans in batches.
+
+        Notes
+        -----
+        Sends one users.ban.revoked webhook per league & batch for
+        bans what expired, revoked bans already sent theirs.
+        Batches are claimed with SELECT ... FOR UPDATE SKIP LOCKED,
+        so processes sweeping at once never move the same bans.
+        SQLite has no row locks, a process what loses the race
+        fails its batch & retries on its next run.
+
+        Returns
+        -------
+        int
+            Amount of bans archived.
+        """
+
+        archived = 0
+
+        while True:
+            now = datetime.now()
+
+            async with Sessions.database.transaction():
+                # Claims the batch, other processes sweeping at
+                # the same time skip it.
+                rows = await Sessions.database.fetch_all(
+                    ban_table.select().where(
+                        or_(
+                            ban_table.c.revoked == True,  # noqa: E712
+                            and_(
+                                ban_table.c.expires != None,  # noqa: E711
+                                ban_table.c.expires <= now
+                            )
+                        )
+                    ).limit(
+                        self.settings.batch_size
+                    ).with_for_update(skip_locked=True)
+                )
+
+                if not rows:
+                    break
+
+                ban_ids = [row["ban_id"] for row in rows]
+
+                await Sessions.database.execute(
+                    ban_history_table.insert().values([
+                        {**row, "archived": now} for row in rows
+                    ])
+                )
+                await Sessions.database.execute(
+                    ban_exception_table.delete().where(
+                        ban_exception_table.c.ban_id.in_(ban_ids)
+                    )
+                )
+                await Sessions.database.execute(
+                    ban_table.delete().where(
+                        ban_table.c.ban_id.in_(ban_ids)
+                    )
+                )
+
+            expired: Dict[str, List[BanRevokedModel]] = {}
+            for row in rows:
+                Cache.bans.remove(row["ban_id"])
+
+                if not row["revoked"]:
+                    expired.setdefault(row["league_id"], []).append(
+                        BanRevokedModel(
+                            row["user_id"],
+                            row["ban_id"],
+                            False,
+                            row["league_id"]
+                        )
+                    )
+
+            for league_id, bans in expired.items():
+                await WebhookSender(
+                    BansModel(bans), league_id
+                ).spawn("users.ban.revoked")
+
+            archived += len(rows)
+
+            if len(rows) < self.settings.batch_size:
+                break
+
+        return archived
+
+    async def run(self) -> None:
+        """Sweeps forever, sleeping for the configured interval.
+        """
+
+        await periodic(
+            self.sweep, self.settings.interval.total_seconds(), "Ban sweep"
+        )
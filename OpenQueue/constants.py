@@ -40,6 +40,8 @@ WEBHOOK_EVENTS = {
     "user.updated": 141210,
     "league.user.created": 141211,
     "league.user.updated": 141212,
+    "users.banned": 141213,
+    "users.ban.revoked": 141214,
 }
 
 
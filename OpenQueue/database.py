@@ -0,0 +1,734 @@
+# -*- coding: utf-8 -*-
+
+import asyncio
+import logging
+import re
+import sys
+
+from bisect import bisect_left
+from contextvars import ContextVar
+from time import monotonic, perf_counter
+from typing import (
+    Any,
+    AsyncGenerator,
+    Callable,
+    Dict,
+    List,
+    Mapping,
+    Union
+)
+from databases import Database
+from databases.core import Transaction
+from sqlalchemy import Column
+from sqlalchemy.engine.interfaces import Dialect
+from sqlalchemy.sql import ClauseElement, literal_column
+
+
+logger = logging.getLogger("OpenQueue.database")
+
+# Upper bounds in milliseconds, anything slower lands in the last bucket.
+BUCKETS = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+BIND_SUFFIX = re.compile(r"_m?\d+$")
+MYSQL_DUPLICATE_KEY = re.compile(r"for key '([^']+)'")
+LABELS = ["<={}".format(bound) for bound in BUCKETS] + [
+    ">{}".format(BUCKETS[-1])
+]
+
+
+class QueryTimings:
+    __slots__ = ("count", "rows", "total", "max", "buckets")
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.rows = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.buckets = [0] * (len(BUCKETS) + 1)
+
+    def record(self, elapsed: float, rows: int) -> None:
+        self.count += 1
+        self.rows += rows
+        self.total += elapsed
+        if elapsed > self.max:
+            self.max = elapsed
+
+        self.buckets[bisect_left(BUCKETS, elapsed)] += 1
+
+    def percentile(self, percent: float) -> float:
+        """Upper bound of the bucket the percentile falls in.
+        """
+
+        target = self.count * percent / 100
+        seen = 0
+        for index, amount in enumerate(self.buckets):
+            seen += amount
+            if amount and seen >= target:
+                if index < len(BUCKETS):
+                    return float(BUCKETS[index])
+                break
+
+        return self.max
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "rows": self.rows,
+            "total_ms": round(self.total, 3),
+            "mean_ms": round(self.total / self.count, 3)
+            if self.count else 0.0,
+            "max_ms": round(self.max, 3),
+            "p50_ms": self.percentile(50),
+            "p95_ms": self.percentile(95),
+            "p99_ms": self.percentile(99),
+            "buckets": dict(zip(LABELS, self.buckets))
+        }
+
+
+class QueryStats:
+    def __init__(self, slow_query_ms: float = None,
+                 dialect: Dialect = None) -> None:
+        """Latency histograms per statement fingerprint.
+
+        Parameters
+        ----------
+        slow_query_ms : float, optional
+            Queries slower then this are logged, by default None
+            which disables logging.
+        dialect : Dialect, optional
+            Used to compile logged queries, by default None
+        """
+
+        self.slow_query_ms = slow_query_ms
+        self.dialect = dialect
+        self.__timings: Dict[str, QueryTimings] = {}
+
+    def record(self, fingerprint: str, elapsed: float, rows: int,
+               query: Union[ClauseElement, str], values: Any) -> None:
+        """Used to record a query.
+
+        Parameters
+        ----------
+        fingerprint : str
+        elapsed : float
+            Milliseconds.
+        rows : int
+        query : Union[ClauseElement, str]
+        values : Any
+        """
+
+        timings = self.__timings.get(fingerprint)
+        if not timings:
+            timings = self.__timings[fingerprint] = QueryTimings()
+
+        timings.record(elapsed, rows)
+
+        if self.slow_query_ms is not None and elapsed >= self.slow_query_ms:
+            logger.warning(
+                "Slow query %s took %.1fms, %d rows, params %s",
+                fingerprint, elapsed, rows,
+                param_shape(query, values, self.dialect)
+            )
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """Used to get timings of every fingerprint.
+
+        Returns
+        -------
+        Dict[str, Dict[str, Any]]
+        """
+
+        return {
+            fingerprint: timings.snapshot()
+            for fingerprint, timings in self.__timings.items()
+        }
+
+    def reset(self) -> None:
+        self.__timings.clear()
+
+
+def param_shape(query: Union[ClauseElement, str], values: Any,
+                dialect: Dialect = None) -> Dict[str, str]:
+    """Types of the parameters, never the values them self.
+    """
+
+    if isinstance(values, list):
+        return {"rows": str(len(values))}
+
+    params = dict(values or {})
+    if isinstance(query, ClauseElement):
+        try:
+            params.update(query.compile(dialect=dialect).params)
+        except Exception:
+            params["?"] = query
+
+    shape: Dict[str, str] = {}
+    repeats: Dict[str, int] = {}
+    for key, value in params.items():
+        # Anonymous binds are numbered, e.g. user_id_1 or name_m0
+        # for multi row inserts.
+        key = BIND_SUFFIX.sub("", key)
+
+        shape[key] = (
+            "{}[{}]".format(type(value).__name__, len(value))
+            if isinstance(value, (list, tuple)) else type(value).__name__
+        )
+        repeats[key] = repeats.get(key, 0) + 1
+
+    for key, amount in repeats.items():
+        if amount > 1:
+            shape[key] += " x{}".format(amount)
+
+    return shape
+
+
+def integrity_error(error: Exception) -> bool:
+    """Used to check if a driver error is a constraint violation.
+
+    Parameters
+    ----------
+    error : Exception
+
+    Returns
+    -------
+    bool
+
+    Notes
+    -----
+    databases raises the driver's own errors, they're matched
+    by name so no driver is imported.
+    """
+
+    return any(
+        parent.__name__ in ("IntegrityError",
+                            "IntegrityConstraintViolationError")
+        for parent in type(error).__mro__
+    )
+
+
+def unique_violation(error: Exception, column: Column) -> bool:
+    """Used to check if a driver error is a duplicate value of
+    a unique column.
+
+    Parameters
+    ----------
+    error : Exception
+    column : Column
+
+    Returns
+    -------
+    bool
+    """
+
+    if not integrity_error(error):
+        return False
+
+    # asyncpg, e.g. user_dathost_id_key
+    constraint = getattr(error, "constraint_name", None)
+    if constraint is not None:
+        return type(error).__name__ == "UniqueViolationError" \
+            and column.name in constraint
+
+    message = str(error.args[-1]) if error.args else ""
+
+    # pymysql, e.g. Duplicate entry 'x' for key 'user_dathost_id'
+    if error.args and error.args[0] == 1062:
+        key = MYSQL_DUPLICATE_KEY.search(message)
+        return bool(key) and column.name in key.group(1)
+
+    # sqlite3, e.g. UNIQUE constraint failed: user.dathost_id
+    return message.startswith("UNIQUE constraint failed") and \
+        "{}.{}".format(column.table.name, column.name) in message
+
+
+def fingerprint(depth: int = 2) -> str:
+    """Module & function of the caller, e.g. "league.players".
+    """
+
+    frame = sys._getframe(depth)
+    module = frame.f_globals.get("__name__", "")
+    if module.startswith("OpenQueue."):
+        module = module[10:]
+
+    return "{}.{}".format(module, frame.f_code.co_name)
+
+
+# monotonic time of the last write in this context.
+last_write: ContextVar[Union[float, None]] = ContextVar(
+    "last_write", default=None
+)
+
+
+class MeasuredPool:
+    def __init__(self, pool: Any, timeout: float = None) -> None:
+        """Wraps a backend pool to measure acquisitions.
+
+        Parameters
+        ----------
+        pool : Any
+            aiomysql, asyncpg or databases SQLite pool.
+        timeout : float, optional
+            Seconds to wait for a connection, by default None
+        """
+
+        self.pool = pool
+        self.timeout = timeout
+
+        self.acquired = 0
+        self.in_use = 0
+        self.peak_in_use = 0
+        self.timeouts = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.pool, name)
+
+    async def acquire(self) -> Any:
+        start = perf_counter()
+
+        try:
+            if self.timeout is None:
+                connection = await self.pool.acquire()
+            else:
+                connection = await asyncio.wait_for(
+                    self.pool.acquire(), self.timeout
+                )
+        except asyncio.TimeoutError:
+            self.timeouts += 1
+            raise
+        finally:
+            waited = (perf_counter() - start) * 1000
+            self.wait_total += waited
+            if waited > self.wait_max:
+                self.wait_max = waited
+
+        self.acquired += 1
+        self.in_use += 1
+        if self.in_use > self.peak_in_use:
+            self.peak_in_use = self.in_use
+
+        return connection
+
+    async def release(self, connection: Any) -> Any:
+        self.in_use -= 1
+
+        return await self.pool.release(connection)
+
+    def snapshot(self) -> Dict[str, Any]:
+        if hasattr(self.pool, "freesize"):
+            # aiomysql
+            size, idle = self.pool.size, self.pool.freesize
+        elif hasattr(self.pool, "get_idle_size"):
+            # asyncpg
+            size, idle = self.pool.get_size(), self.pool.get_idle_size()
+        else:
+            # SQLite opens a connection per acquire.
+            size, idle = self.in_use, 0
+
+        return {
+            "size": size,
+            "idle": idle,
+            "in_use": self.in_use,
+            "peak_in_use": self.peak_in_use,
+            "acquired": self.acquired,
+            "timeouts": self.timeouts,
+            "wait_total_ms": round(self.wait_total, 3),
+            "wait_mean_ms": round(self.wait_total / self.acquired, 3)
+            if self.acquired else 0.0,
+            "wait_max_ms": round(self.wait_max, 3)
+        }
+
+
+class Replica:
+    def __init__(self, database: Database) -> None:
+        self.database = database
+        self.retry_at = 0.0
+        self.reads = 0
+        self.failures = 0
+
+        self.__lock: Union[asyncio.Lock, None] = None
+
+    @property
+    def healthy(self) -> bool:
+        return self.retry_at <= monotonic()
+
+    async def connect(self) -> None:
+        if self.database.is_connected:
+            return
+
+        if not self.__lock:
+            self.__lock = asyncio.Lock()
+
+        async with self.__lock:
+            if not self.database.is_connected:
+                await self.database.connect()
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "url": self.database.url.obscure_password,
+            "healthy": self.healthy,
+            "reads": self.reads,
+            "failures": self.failures
+        }
+
+
+class InstrumentedDatabase(Database):
+    def __init__(self, url: str, slow_query_ms: float = None,
+                 replicas: List[str] = None, replica_sticky: float = 5.0,
+                 replica_retry: float = 30.0, pool_timeout: float = None,
+                 **options: Any) -> None:
+        """Database what records query timings & routes reads
+        asked for with replica=True to replicas.
+
+        Parameters
+        ----------
+        url : str
+        slow_query_ms : float, optional
+            by default None
+        replicas : List[str], optional
+            URLs of read replicas, by default None
+        replica_sticky : float, optional
+            Seconds reads stay on the primary after a write within
+            the same context, by default 5.0
+        replica_retry : float, optional
+            Seconds a failed replica is skipped for, by default 30.0
+        pool_timeout : float, optional
+            Seconds to wait for a pooled connection, by default None
+        **options
+            Passed to the backend's pool.
+
+        Notes
+        -----
+        Reads go to the primary by default, only reads what can
+        be stale e.g. listings & profiles should pass replica=True.
+        Those still go to the primary within transactions &
+        shortly after a write.
+        """
+
+        super().__init__(url, **options)
+
+        self.stats = QueryStats(slow_query_ms, self.dialect)
+
+        self.replica_sticky = replica_sticky
+        self.replica_retry = replica_retry
+        self.pool_timeout = pool_timeout
+
+        self.__replicas = [
+            Replica(Database(replica, **options))
+            for replica in replicas or []
+        ]
+        self.__next_replica = 0
+
+        self.__rowcount_lock: Union[asyncio.Lock, None] = None
+
+    @property
+    def dialect(self) -> Dialect:
+        return self._backend._dialect
+
+    def replica_stats(self) -> List[Dict[str, Any]]:
+        """Used to get reads & health of replicas.
+
+        Returns
+        -------
+        List[Dict[str, Any]]
+        """
+
+        return [replica.snapshot() for replica in self.__replicas]
+
+    def pool_stats(self) -> Dict[str, Any]:
+        """Used to get stats of the primary's connection pool.
+
+        Returns
+        -------
+        Dict[str, Any]
+        """
+
+        pool = self._backend._pool
+        if isinstance(pool, MeasuredPool):
+            return pool.snapshot()
+        else:
+            return {}
+
+    async def connect(self) -> None:
+        await super().connect()
+
+        # aiomysql & asyncpg pools are created on connect.
+        if not isinstance(self._backend._pool, MeasuredPool):
+            self._backend._pool = MeasuredPool(
+                self._backend._pool, self.pool_timeout
+            )
+
+        for replica in self.__replicas:
+            try:
+                await replica.connect()
+            except Exception:
+                self.__failed(replica)
+
+    async def disconnect(self) -> None:
+        for replica in self.__replicas:
+            if replica.database.is_connected:
+                await replica.database.disconnect()
+
+        await super().disconnect()
+
+    def transaction(self, *, force_rollback: bool = False,
+                    **kwargs: Any) -> Transaction:
+        last_write.set(monotonic())
+
+        return super().transaction(force_rollback=force_rollback, **kwargs)
+
+    def __replica(self, replica: bool) -> Union[Replica, None]:
+        """Replica to read from, None if the primary should be used.
+        """
+
+        if not replica or not self.__replicas:
+            return None
+
+        if self.connection()._transaction_stack:
+            return None
+
+        written = last_write.get()
+        if written is not None and \
+                monotonic() - written < self.replica_sticky:
+            return None
+
+        for _ in range(len(self.__replicas)):
+            replica = self.__replicas[
+                self.__next_replica % len(self.__replicas)
+            ]
+            self.__next_replica += 1
+
+            if replica.healthy:
+                return replica
+
+        return None
+
+    def __failed(self, replica: Replica,
+                 error: Exception = None) -> None:
+        replica.failures += 1
+        replica.retry_at = monotonic() + self.replica_retry
+
+        logger.warning(
+            "Replica %s failed, using primary for %.0fs",
+            replica.database.url.obscure_password, self.replica_retry,
+            exc_info=error or True
+        )
+
+    async def __read(self, method: Callable, replica: bool, *args: Any,
+                     **kwargs: Any) -> Any:
+        """Runs a read on a replica, falling back to the primary.
+
+        Notes
+        -----
+        The replica is only marked as failed if the primary runs the
+        query, a invalid query raises from the primary instead.
+        """
+
+        replica = self.__replica(replica)
+        if not replica:
+            return await method(self, *args, **kwargs)
+
+        try:
+            await replica.connect()
+            result = await method(replica.database, *args, **kwargs)
+        except Exception:
+            result = await method(self, *args, **kwargs)
+            self.__failed(replica)
+        else:
+            replica.reads += 1
+
+        return result
+
+    async def __iterate(self, query: Union[ClauseElement, str],
+                        values: dict, replica: bool
+                        ) -> AsyncGenerator[Mapping, None]:
+        """Iterates a replica, falling back to the primary if
+        the replica fails before the first row.
+        """
+
+        replica = self.__replica(replica)
+        if replica:
+            rows = Database.iterate(replica.database, query, values)
+            try:
+                await replica.connect()
+                first = await rows.__anext__()
+            except StopAsyncIteration:
+                replica.reads += 1
+                return
+            except Exception as replica_error:
+                error = replica_error
+                await rows.aclose()
+            else:
+                replica.reads += 1
+                try:
+                    yield first
+                    async for row in rows:
+                        yield row
+                finally:
+                    await rows.aclose()
+                return
+
+            rows = Database.iterate(self, query, values)
+            try:
+                first = await rows.__anext__()
+            except StopAsyncIteration:
+                self.__failed(replica, error)
+                return
+            else:
+                self.__failed(replica, error)
+                try:
+                    yield first
+                    async for row in rows:
+                        yield row
+                finally:
+                    await rows.aclose()
+            return
+
+        async for row in Database.iterate(self, query, values):
+            yield row
+
+    async def fetch_all(self, query: Union[ClauseElement, str],
+                        values: dict = None, replica: bool = False
+                        ) -> List[Mapping]:
+        name = fingerprint()
+        start = perf_counter()
+
+        rows = await self.__read(Database.fetch_all, replica, query, values)
+
+        self.stats.record(name, (perf_counter() - start) * 1000,
+                          len(rows), query, values)
+
+        return rows
+
+    async def fetch_one(self, query: Union[ClauseElement, str],
+                        values: dict = None, replica: bool = False
+                        ) -> Union[Mapping, None]:
+        name = fingerprint()
+        start = perf_counter()
+
+        row = await self.__read(Database.fetch_one, replica, query, values)
+
+        self.stats.record(name, (perf_counter() - start) * 1000,
+                          1 if row is not None else 0, query, values)
+
+        return row
+
+    async def fetch_val(self, query: Union[ClauseElement, str],
+                        values: dict = None, column: Any = 0,
+                        replica: bool = False) -> Any:
+        name = fingerprint()
+        start = perf_counter()
+
+        value = await self.__read(
+            Database.fetch_val, replica, query, values, column=column
+        )
+
+        self.stats.record(name, (perf_counter() - start) * 1000,
+                          1 if value is not None else 0, query, values)
+
+        return value
+
+    async def execute(self, query: Union[ClauseElement, str],
+                      values: dict = None) -> Any:
+        name = fingerprint()
+        start = perf_counter()
+
+        last_write.set(monotonic())
+
+        result = await super().execute(query, values)
+
+        self.stats.record(name, (perf_counter() - start) * 1000,
+                          0, query, values)
+
+        return result
+
+    async def execute_rowcount(self, query: ClauseElement,
+                               values: dict = None) -> int:
+        """Used to run a UPDATE or DELETE, giving the amount of
+        rows it changed.
+
+        Parameters
+        ----------
+        query : ClauseElement
+        values : dict, optional
+            by default None
+
+        Returns
+        -------
+        int
+
+        Notes
+        -----
+        execute gives the last row ID when there's one, so can't
+        be used to tell if a conditional UPDATE matched. The count
+        is read on the same connection right after the query, by
+        RETURNING on PostgreSQL, ROW_COUNT() on MySQL & changes()
+        on SQLite, so these are ran one at a time as tasks can
+        share a connection.
+        """
+
+        name = fingerprint()
+        start = perf_counter()
+
+        last_write.set(monotonic())
+
+        if not self.__rowcount_lock:
+            self.__rowcount_lock = asyncio.Lock()
+
+        async with self.__rowcount_lock, self.connection():
+            if self.dialect.name == "postgresql":
+                rowcount = len(await super().fetch_all(
+                    query.returning(literal_column("1")), values
+                ))
+            else:
+                await super().execute(query, values)
+                rowcount = await super().fetch_val(
+                    "SELECT ROW_COUNT()" if self.dialect.name == "mysql"
+                    else "SELECT changes()"
+                )
+
+        self.stats.record(name, (perf_counter() - start) * 1000,
+                          rowcount, query, values)
+
+        return rowcount
+
+    async def execute_many(self, query: Union[ClauseElement, str],
+                           values: list) -> None:
+        name = fingerprint()
+        start = perf_counter()
+
+        last_write.set(monotonic())
+
+        await super().execute_many(query, values)
+
+        self.stats.record(name, (perf_counter() - start) * 1000,
+                          len(values), query, values)
+
+    async def iterate(self, query: Union[ClauseElement, str],
+                      values: dict = None, replica: bool = False
+                      ) -> AsyncGenerator[Mapping, None]:
+        """Only time spent waiting on rows is recorded, not time
+        the caller spends on each row.
+        """
+
+        name = fingerprint()
+        elapsed = 0.0
+        rows = 0
+
+        iterator = self.__iterate(query, values, replica)
+        try:
+            while True:
+                start = perf_counter()
+                try:
+                    row = await iterator.__anext__()
+                except StopAsyncIteration:
+                    break
+                finally:
+                    elapsed += perf_counter() - start
+
+                rows += 1
+                yield row
+        finally:
+            await iterator.aclose()
+
+            self.stats.record(name, elapsed * 1000, rows, query, values)
@@ -1,25 +1,25 @@
 # -*- coding: utf-8 -*-
 
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Awaitable
 from sqlalchemy.sql import and_
 from os import path
-from dathost.exceptions import NotFound
-from dathost.server.awaiting import ServerAwaiting
-from backblaze.settings import UploadSettings, PartSettings
-from zipstream import AioZipStream
 
 from .resources import Sessions, Config
 from .webhook import WebhookSender
 from .tables import scoreboard_total_table
+from .scheduler import resumable
 
 from .models.match import DemoModel
 
 if TYPE_CHECKING:
+    from dathost.server.awaiting import ServerAwaiting
+
     from .league.match import Match
+    from . import OpenQueue
 
 
 class Demo:
-    def __init__(self, server: ServerAwaiting, match: "Match") -> None:
+    def __init__(self, server: "ServerAwaiting", match: "Match") -> None:
         """Used to upload demos to b2.
 
         Parameters
@@ -57,10 +57,29 @@ class Demo:
             )
         )
 
+    async def spawn(self) -> None:
+        """Used to upload the demo in the background, persisted
+        if the upload didn't finish before shutdown.
+        """
+
+        await Sessions.scheduler.spawn(
+            self.upload(),
+            "demo",
+            ("demo", {
+                "server_id": self.server.server_id,
+                "league_id": self.match.upper.league_id,
+                "match_id": self.match.match_id
+            })
+        )
+
     async def upload(self) -> None:
         """Compresses and uploads demo from dathost to b2.
         """
 
+        from dathost.exceptions import NotFound
+        from backblaze.settings import UploadSettings, PartSettings
+        from zipstream import AioZipStream
+
         await self.__update_value(demo_status=1)
 
         server_file = self.server.file(self.__file_name)
@@ -120,5 +139,14 @@ class Demo:
             self.match.upper.league_id
         )
 
-        await Sessions.scheduler.spawn(webhook.demo_uploaded())
-        await Sessions.scheduler.spawn(self.match.analyze_demo())
+        await webhook.spawn("demo.uploaded")
+        await Sessions.scheduler.spawn(self.match.analyze_demo(), "analysis")
+
+
+@resumable("demo")
+def resume_demo(upper: "OpenQueue", server_id: str, league_id: str,
+                match_id: str) -> Awaitable:
+    return Demo(
+        Sessions.game.server(server_id),
+        upper.league(league_id).match(match_id)
+    ).upload()
@@ -1,20 +1,35 @@
-import aiosmtplib
-
 from email.mime.text import MIMEText
-from jinja2 import Environment, FileSystemLoader, select_autoescape
 from os import path
+from typing import TYPE_CHECKING
+
+from ..resources import Config, Sessions
+
+if TYPE_CHECKING:
+    from jinja2 import Environment
+
 
-from ..resources import Config
+_environment = None
+
+
+def environment() -> "Environment":
+    """Jinja2 environment, created on first render.
+    """
 
+    global _environment
 
-jinja2 = Environment(
-    loader=FileSystemLoader(path.dirname(path.realpath(__file__))),
-    autoescape=select_autoescape(["html", "xml"])
-)
+    if _environment is None:
+        from jinja2 import Environment, FileSystemLoader, select_autoescape
+
+        _environment = Environment(
+            loader=FileSystemLoader(path.dirname(path.realpath(__file__))),
+            autoescape=select_autoescape(["html", "xml"])
+        )
+
+    return _environment
 
 
 def render_html(file: str, params: dict) -> str:
-    return (jinja2.get_template(file)).render(**params)
+    return (environment().get_template(file)).render(**params)
 
 
 async def send_email(to: str, subject: str, header: str, body: str,
@@ -31,6 +46,10 @@ async def send_email(to: str, subject: str, header: str, body: str,
         by default None
     url : str, optional
         by default None
+
+    Notes
+    -----
+    Sent over the pooled connections of Sessions.mail.
     """
 
     message = MIMEText(render_html(
@@ -46,11 +65,32 @@ async def send_email(to: str, subject: str, header: str, body: str,
     message["To"] = to
     message["Subject"] = subject
 
-    await aiosmtplib.send(
-        message,
-        hostname=Config.smtp.hostname,
-        port=Config.smtp.port,
-        use_tls=Config.smtp.use_tls,
-        password=Config.smtp.password,
-        username=Config.smtp.username
-    )
+    await Sessions.mail.send(message)
+
+
+async def send_template(to: str, name: str, **values: str) -> None:
+    """Used to send mail from a cached template.
+
+    Parameters
+    ----------
+    to : str
+    name : str
+        Name of the template in TEMPLATES.
+    values : str
+        Fields of the template, url for the button.
+
+    Notes
+    -----
+    Only the fields are rendered per recipient, see EmailTemplate.
+    """
+
+    from .templates import TEMPLATES
+
+    subject, html = TEMPLATES[name].render(**values)
+
+    message = MIMEText(html, "html", "utf-8")
+    message["From"] = Config.smtp.email
+    message["To"] = to
+    message["Subject"] = subject
+
+    await Sessions.mail.send(message)
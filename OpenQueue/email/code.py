@@ -0,0 +1,67 @@
+# -*- coding: utf-8 -*-
+
+import hmac
+
+from base64 import urlsafe_b64encode
+from datetime import datetime
+from hashlib import sha256
+from secrets import token_urlsafe
+from typing import Tuple
+
+from ..resources import Config
+
+
+def hash_email_code(code: str) -> str:
+    """Used to hash a email code with the configured key.
+
+    Parameters
+    ----------
+    code : str
+
+    Returns
+    -------
+    str
+        URL safe base64 of the HMAC-SHA256, 43 characters.
+    """
+
+    return urlsafe_b64encode(
+        hmac.new(Config.smtp.code_key, code.encode(), sha256).digest()
+    ).decode().rstrip("=")
+
+
+def create_email_code() -> Tuple[str, str, datetime]:
+    """Used to create a email code.
+
+    Returns
+    -------
+    str
+        Code to send to the user.
+    str
+        Hashed code to store.
+    datetime
+        When the code expires.
+    """
+
+    code = token_urlsafe(24)
+
+    return (
+        code,
+        hash_email_code(code),
+        datetime.now() + Config.smtp.code_expires
+    )
+
+
+def compare_email_code(code: str, hashed_code: str) -> bool:
+    """Used to compare a submitted code in constant time.
+
+    Parameters
+    ----------
+    code : str
+    hashed_code : str
+
+    Returns
+    -------
+    bool
+    """
+
+    return hmac.compare_digest(hash_email_code(code), hashed_code)
@@ -0,0 +1,301 @@
+# -*- coding: utf-8 -*-
+
+import asyncio
+import logging
+
+from email.message import Message
+from email.utils import parseaddr
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Set, Tuple
+
+from ..settings.smtp import SmtpSettings
+
+if TYPE_CHECKING:
+    from aiosmtplib import SMTP
+
+
+logger = logging.getLogger("OpenQueue.email")
+
+# Seconds queued messages are given to send on close.
+CLOSE_TIMEOUT = 10.0
+
+
+def is_transient(error: Exception) -> bool:
+    """If sending could succeed when retried, 4xx replies &
+    connection errors are, 5xx replies aren't.
+    """
+
+    from aiosmtplib import (
+        SMTPConnectError,
+        SMTPResponseException,
+        SMTPServerDisconnected,
+        SMTPTimeoutError
+    )
+
+    if isinstance(error, SMTPResponseException):
+        return 400 <= error.code < 500
+
+    return isinstance(error, (
+        SMTPConnectError,
+        SMTPServerDisconnected,
+        SMTPTimeoutError,
+        asyncio.TimeoutError,
+        OSError
+    ))
+
+
+def recipient_domain(message: Message) -> str:
+    return parseaddr(message["To"] or "")[1].rpartition("@")[2].lower()
+
+
+class MailSender:
+    def __init__(self, settings: SmtpSettings) -> None:
+        """Sends mail over a small pool of persistent SMTP
+        connections, one per worker.
+
+        Parameters
+        ----------
+        settings : SmtpSettings
+
+        Notes
+        -----
+        Workers are started on the first send. Mails over their
+        domain's rate wait before being queued, so a worker is
+        never held up by a throttled domain.
+        """
+
+        self.settings = settings
+
+        self.__queue: "asyncio.Queue[Tuple[Message, asyncio.Future]]" = \
+            asyncio.Queue(maxsize=settings.queue_size)
+        self.__workers: List[asyncio.Future] = []
+        self.__clients: List[Optional["SMTP"]] = []
+
+        # Domain -> when its next message may be sent.
+        self.__next_send: Dict[str, float] = {}
+        # Resolved once a mail waiting on its domain's rate is queued.
+        self.__delayed: Set[asyncio.Future] = set()
+
+        self.sent = 0
+        self.failed = 0
+        self.retried = 0
+        self.connects = 0
+
+    def __start(self) -> None:
+        self.__clients = [None] * self.settings.pool_size
+        self.__workers = [
+            asyncio.ensure_future(self.__work(index))
+            for index in range(self.settings.pool_size)
+        ]
+
+    async def send(self, message: Message) -> None:
+        """Used to queue a message & wait till it's sent.
+
+        Parameters
+        ----------
+        message : Message
+
+        Raises
+        ------
+        aiosmtplib.SMTPException
+            Raised when the message couldn't be sent after
+            retrying.
+
+        Notes
+        -----
+        Waits for its domain's rate, then for room when the
+        queue is full.
+        """
+
+        if not self.__workers:
+            self.__start()
+
+        loop = asyncio.get_event_loop()
+        future = loop.create_future()
+
+        delay = self.__delay(recipient_domain(message))
+        if delay > 0:
+            queued = loop.create_future()
+            self.__delayed.add(queued)
+            try:
+                await asyncio.sleep(delay)
+                await self.__queue.put((message, future))
+            finally:
+                self.__delayed.discard(queued)
+                queued.set_result(None)
+        else:
+            await self.__queue.put((message, future))
+
+        await future
+
+    def __delay(self, domain: str) -> float:
+        """Reserves the next send slot of a domain.
+
+        Returns
+        -------
+        float
+            Seconds to wait before queuing.
+        """
+
+        rate = self.settings.domain_rates.get(
+            domain, self.settings.domain_rate
+        )
+        if not rate:
+            return 0
+
+        # Slots are reserved before waiting, so mails to
+        # the same domain don't exceed its rate.
+        now = asyncio.get_event_loop().time()
+        send_at = max(now, self.__next_send.get(domain, now))
+        self.__next_send[domain] = send_at + 1 / rate
+
+        return send_at - now
+
+    async def __connect(self, index: int) -> "SMTP":
+        client = self.__clients[index]
+        if client is not None and client.is_connected:
+            return client
+
+        from aiosmtplib import SMTP
+
+        client = SMTP(
+            hostname=self.settings.hostname,
+            port=self.settings.port,
+            use_tls=self.settings.use_tls,
+            timeout=self.settings.timeout
+        )
+        await client.connect()
+
+        if self.settings.username:
+            await client.login(
+                self.settings.username, self.settings.password
+            )
+
+        self.__clients[index] = client
+        self.connects += 1
+
+        return client
+
+    async def __close_client(self, index: int) -> None:
+        client = self.__clients[index]
+        self.__clients[index] = None
+
+        if client is None or not client.is_connected:
+            return
+
+        try:
+            await client.quit()
+        except Exception:
+            client.close()
+
+    async def __deliver(self, index: int, message: Message) -> None:
+        from aiosmtplib import SMTPResponseException
+
+        attempt = 0
+        while True:
+            try:
+                client = await self.__connect(index)
+                await client.send_message(message)
+            except Exception as error:
+                if attempt >= self.settings.retries or \
+                        not is_transient(error):
+                    raise
+
+                logger.warning("Retrying mail to %s, %s",
+                               message["To"], error)
+
+                # After a reply the envelope was reset, the
+                # connection can still be used.
+                if not isinstance(error, SMTPResponseException):
+                    await self.__close_client(index)
+
+                await asyncio.sleep(
+                    self.settings.retry_backoff * 2 ** attempt
+                )
+
+                attempt += 1
+                self.retried += 1
+            else:
+                return
+
+    async def __work(self, index: int) -> None:
+        while True:
+            message, future = await self.__queue.get()
+
+            # Sender was cancelled while the mail was queued.
+            if future.cancelled():
+                self.__queue.task_done()
+                continue
+
+            try:
+                await self.__deliver(index, message)
+            except asyncio.CancelledError:
+                future.cancel()
+                raise
+            except Exception as error:
+                self.failed += 1
+                if not future.done():
+                    future.set_exception(error)
+            else:
+                self.sent += 1
+                if not future.done():
+                    future.set_result(None)
+            finally:
+                self.__queue.task_done()
+
+    async def __flush(self) -> None:
+        # Mails waiting on their domain's rate are queued first.
+        while self.__delayed:
+            await asyncio.wait(list(self.__delayed))
+
+        await self.__queue.join()
+
+    async def close(self, timeout: float = CLOSE_TIMEOUT) -> None:
+        """Sends queued messages, then closes connections.
+
+        Parameters
+        ----------
+        timeout : float, optional
+            Seconds given to send queued messages,
+            by default CLOSE_TIMEOUT
+        """
+
+        if not self.__workers:
+            return
+
+        try:
+            await asyncio.wait_for(self.__flush(), timeout)
+        except asyncio.TimeoutError:
+            logger.warning("Closing with %d mails unsent",
+                           self.__queue.qsize() + len(self.__delayed))
+
+        for worker in self.__workers:
+            worker.cancel()
+        await asyncio.gather(*self.__workers, return_exceptions=True)
+
+        for index in range(len(self.__clients)):
+            await self.__close_client(index)
+
+        self.__workers = []
+
+    def stats(self) -> Dict[str, Any]:
+        """Used to get mail stats.
+
+        Returns
+        -------
+        Dict[str, Any]
+            queued, delayed, connected, connects, sent, failed
+            & retried.
+        """
+
+        return {
+            "queued": self.__queue.qsize(),
+            "delayed": len(self.__delayed),
+            "connected": sum(
+                1 for client in self.__clients
+                if client is not None and client.is_connected
+            ),
+            "connects": self.connects,
+            "sent": self.sent,
+            "failed": self.failed,
+            "retried": self.retried
+        }
@@ -0,0 +1,158 @@
+# -*- coding: utf-8 -*-
+
+import re
+
+from string import Formatter
+from typing import Dict, List, Tuple
+
+
+# Rendered in place of per recipient fields, then split on.
+MARKER = "\x00{}\x00"
+MARKER_PATTERN = re.compile("\x00(\\w+)\x00")
+
+
+def fields(text: str) -> List[str]:
+    """Names of the {field} placeholders in text.
+    """
+
+    return [field for _, field, _, _ in Formatter().parse(text) if field]
+
+
+class EmailTemplate:
+    def __init__(self, subject: str, header: str, body: str,
+                 button: str = None, file: str = "template.html") -> None:
+        """Mail what's the same for every recipient apart from
+        the url & the {field} placeholders in subject, header & body.
+
+        Parameters
+        ----------
+        subject : str
+        header : str
+        body : str
+        button : str, optional
+            Text of the button linking to the url, by default None
+        file : str, optional
+            by default "template.html"
+
+        Notes
+        -----
+        The HTML is rendered once with markers in place of the
+        per recipient fields, sending only joins the static
+        fragments with the escaped fields.
+        """
+
+        self.subject = subject
+        self.header = header
+        self.body = body
+        self.button = button
+        self.file = file
+
+        self.fields = set(fields(header) + fields(body))
+        if button:
+            self.fields.add("url")
+
+        self.__fragments: List[str] = []
+
+    def compile(self) -> None:
+        """Renders the static fragments of the template.
+        """
+
+        from . import render_html
+
+        markers = {field: MARKER.format(field) for field in self.fields}
+
+        html = render_html(self.file, {
+            "header": self.header.format(**markers),
+            "body": self.body.format(**markers),
+            "button_text": self.button,
+            "url": markers.get("url")
+        })
+
+        # Even indexes are static HTML, odd ones field names.
+        self.__fragments = MARKER_PATTERN.split(html)
+
+    def render(self, **values: str) -> Tuple[str, str]:
+        """Used to render the subject & HTML for a recipient.
+
+        Parameters
+        ----------
+        values : str
+            Fields of the template.
+
+        Returns
+        -------
+        str
+            Subject
+        str
+            HTML
+        """
+
+        from markupsafe import escape
+
+        if not self.__fragments:
+            self.compile()
+
+        fragments = self.__fragments[:]
+        for index in range(1, len(fragments), 2):
+            fragments[index] = escape(values[fragments[index]])
+
+        return self.subject.format(**values), "".join(fragments)
+
+
+TEMPLATES: Dict[str, EmailTemplate] = {
+    "confirmation": EmailTemplate(
+        subject="Skrim.gg | Please confirm your email!",
+        header="Welcome to Skrim.gg, {name}!",
+        body="""Thanks for joining Skrim.gg!
+                    Please click the button to confirm your email.
+
+                    If you didn't sign up to Skrim.gg, please
+                    ignore this email.""",
+        button="Confirm my email"
+    ),
+    "email_update": EmailTemplate(
+        subject="OpenQueue | Please confirm your email!",
+        header="Welcome to OpenQueue, {name}!",
+        body="""Thanks for joining OpenQueue!
+                    Please click the button to confirm your email.
+
+                    If you didn't sign up to OpenQueue, please
+                    ignore this email.""",
+        button="Confirm my email"
+    ),
+    "password_reset": EmailTemplate(
+        subject="OpenQueue | Reset your password",
+        header="Hi {name},",
+        body="""Someone asked to reset the password of your account.
+
+                If it wasn't you, please ignore this email.""",
+        button="Reset my password"
+    ),
+    "ban_notice": EmailTemplate(
+        subject="OpenQueue | You've been banned",
+        header="Hi {name},",
+        body="""You've been banned until {expires}.
+
+                Reason: {reason}"""
+    )
+}
+
+
+def register_template(name: str, template: EmailTemplate) -> None:
+    """Used to add a template, compiled on startup with the others.
+
+    Parameters
+    ----------
+    name : str
+    template : EmailTemplate
+    """
+
+    TEMPLATES[name] = template
+
+
+def compile_templates() -> None:
+    """Renders the static fragments of every template.
+    """
+
+    for template in TEMPLATES.values():
+        template.compile()
@@ -0,0 +1,81 @@
+# -*- coding: utf-8 -*-
+
+import gzip
+import json
+
+from typing import Any, Dict, Tuple
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def dumps(obj: Any) -> bytes:
+    """Used to serialize to JSON, with orjson when installed.
+
+    Parameters
+    ----------
+    obj : Any
+
+    Returns
+    -------
+    bytes
+        UTF-8 JSON.
+    """
+
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+
+    return json.dumps(
+        obj, separators=(",", ":"), ensure_ascii=False
+    ).encode()
+
+
+def loads(data: bytes) -> Any:
+    """Used to parse JSON, with orjson when installed.
+
+    Parameters
+    ----------
+    data : bytes
+
+    Returns
+    -------
+    Any
+    """
+
+    if orjson is not None:
+        return orjson.loads(data)
+
+    return json.loads(data)
+
+
+def encode_payload(obj: Any, gzip_threshold: int = None,
+                   gzip_level: int = 6) -> Tuple[bytes, Dict[str, str]]:
+    """Used to build a JSON request body, compressed when large.
+
+    Parameters
+    ----------
+    obj : Any
+    gzip_threshold : int, optional
+        Bodies of at least this many bytes are gzipped,
+        None to never compress, by default None
+    gzip_level : int, optional
+        by default 6
+
+    Returns
+    -------
+    bytes
+        Body
+    Dict[str, str]
+        Content headers.
+    """
+
+    body = dumps(obj)
+    headers = {"Content-Type": "application/json"}
+
+    if gzip_threshold is not None and len(body) >= gzip_threshold:
+        body = gzip.compress(body, gzip_level)
+        headers["Content-Encoding"] = "gzip"
+
+    return body, headers
@@ -117,6 +117,15 @@ class QueueFull(OpenQueueException):
         super().__init__(msg=msg, status_code=status_code, *args)
 
 
+class NotInReadyCheck(OpenQueueException):
+    """Raised when a user isn't in a active ready check.
+    """
+
+    def __init__(self, msg: str = "User not in ready check",
+                 status_code: int = 400, *args: object) -> None:
+        super().__init__(msg=msg, status_code=status_code, *args)
+
+
 class MatchCancelled(OpenQueueException):
     """Base for match cancelled.
     """
@@ -0,0 +1,200 @@
+# -*- coding: utf-8 -*-
+
+from collections import OrderedDict
+from time import monotonic
+from typing import Dict, List, Set, Tuple, Union
+from sqlalchemy.sql import func, select, union_all
+
+from .resources import Sessions
+from .tables import user_table, league_table
+from .exceptions import InvalidUser
+
+from .models.user import UserModel
+
+
+class ExternalIdResolver:
+    def __init__(self, maxsize: int = 4096, ttl: float = 30.0) -> None:
+        """Resolves discord, steam & dathost IDs to users, recent
+        lookups are kept in a LRU cache.
+
+        Parameters
+        ----------
+        maxsize : int, optional
+            Max cached lookups, by default 4096
+        ttl : float, optional
+            Seconds a lookup is cached for, by default 30.0
+
+        Notes
+        -----
+        Only this process's updates invalidate lookups, IDs
+        changed by another process resolve to the old user
+        for up to ttl seconds.
+        """
+
+        self.maxsize = maxsize
+        self.ttl = ttl
+
+        # str(external_id) -> monotonic expiry & UserModel
+        self.__cache: "OrderedDict[str, Tuple[float, UserModel]]" = \
+            OrderedDict()
+        # user_id -> str(external_id)
+        self.__keys: Dict[str, Set[str]] = {}
+
+    def __len__(self) -> int:
+        return len(self.__cache)
+
+    @staticmethod
+    def __query(external_ids: List[Union[str, int]]) -> select:
+        """One probe per column, so each is matched on its own
+        index with the column's type.
+        """
+
+        league_ids = select([
+            func.group_concat(league_table.c.league_id)
+        ]).where(
+            league_table.c.user_id == user_table.c.user_id
+        ).label("league_ids")
+
+        strings = list({str(external_id) for external_id in external_ids})
+        integers = list({
+            int(external_id) for external_id in external_ids
+            if isinstance(external_id, int) or external_id.isdigit()
+        })
+
+        probes = [
+            select([user_table, league_ids]).where(
+                user_table.c.steam_id.in_(strings)
+            ),
+            select([user_table, league_ids]).where(
+                user_table.c.dathost_id.in_(strings)
+            )
+        ]
+
+        if integers:
+            probes.append(
+                select([user_table, league_ids]).where(
+                    user_table.c.discord_id.in_(integers)
+                )
+            )
+
+        return union_all(*probes)
+
+    def __get(self, key: str) -> Union[UserModel, None]:
+        cached = self.__cache.get(key)
+        if not cached:
+            return None
+
+        expires, model = cached
+        if expires <= monotonic():
+            self.__drop(key, model)
+            return None
+
+        self.__cache.move_to_end(key)
+
+        return model
+
+    def __set(self, key: str, model: UserModel) -> None:
+        old = self.__cache.get(key)
+        if old:
+            self.__drop(key, old[1])
+
+        self.__cache[key] = (monotonic() + self.ttl, model)
+        self.__keys.setdefault(model.user_id, set()).add(key)
+
+        while len(self.__cache) > self.maxsize:
+            old_key, (_, old_model) = self.__cache.popitem(last=False)
+            self.__drop(old_key, old_model)
+
+    def __drop(self, key: str, model: UserModel) -> None:
+        self.__cache.pop(key, None)
+
+        keys = self.__keys.get(model.user_id)
+        if keys:
+            keys.discard(key)
+            if not keys:
+                del self.__keys[model.user_id]
+
+    def invalidate(self, user_id: str) -> None:
+        """Used to drop cached lookups of a user.
+
+        Parameters
+        ----------
+        user_id : str
+        """
+
+        for key in self.__keys.pop(user_id, ()):
+            self.__cache.pop(key, None)
+
+    def clear(self) -> None:
+        self.__cache.clear()
+        self.__keys.clear()
+
+    async def resolve_many(self, external_ids: List[Union[str, int]]
+                           ) -> Dict[Union[str, int], UserModel]:
+        """Used to resolve many external IDs with one query.
+
+        Parameters
+        ----------
+        external_ids : List[Union[str, int]]
+
+        Returns
+        -------
+        Dict[Union[str, int], UserModel]
+            External IDs what didn't match a user are left out.
+        """
+
+        resolved = {}
+        missing = []
+
+        for external_id in external_ids:
+            model = self.__get(str(external_id))
+            if model:
+                resolved[external_id] = model
+            else:
+                missing.append(external_id)
+
+        if not missing:
+            return resolved
+
+        # str(external_id) -> external IDs as given, 1 & "1" share a key.
+        lookup: Dict[str, List[Union[str, int]]] = {}
+        for external_id in missing:
+            lookup.setdefault(str(external_id), []).append(external_id)
+
+        async for row in Sessions.database.iterate(self.__query(missing)):
+            model = UserModel(**row)
+
+            for value in (row["steam_id"], row["dathost_id"],
+                          row["discord_id"]):
+                if value is None:
+                    continue
+
+                key = str(value)
+                if key in lookup:
+                    self.__set(key, model)
+                    for external_id in lookup[key]:
+                        resolved[external_id] = model
+
+        return resolved
+
+    async def resolve(self, external_id: Union[str, int]) -> UserModel:
+        """Used to resolve a external ID.
+
+        Parameters
+        ----------
+        external_id : Union[str, int]
+
+        Returns
+        -------
+        UserModel
+
+        Raises
+        ------
+        InvalidUser
+        """
+
+        resolved = await self.resolve_many([external_id])
+        if external_id in resolved:
+            return resolved[external_id]
+        else:
+            raise InvalidUser()
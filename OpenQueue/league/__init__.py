@@ -1,10 +1,9 @@
 # -*- coding: utf-8 -*-
 
-from typing import AsyncGenerator, List, Tuple, Union
+from typing import TYPE_CHECKING, AsyncGenerator, Dict, List, Tuple, Union
 from datetime import datetime
-from dathost.server.awaiting import ServerAwaiting
-from dathost.settings import MatchSettings as DathostMatchSettings
-from sqlalchemy import select, func, or_, and_
+from sqlalchemy import bindparam, select, func, or_, and_
+from sqlalchemy.sql import Select
 
 from ..tables import (
     league_table,
@@ -18,7 +17,7 @@ from ..tables import (
 
 from ..decorators import validate_region, validate_tickrate
 
-from ..resources import Sessions
+from ..resources import Sessions, Cache
 
 from ..webhook import WebhookSender
 
@@ -29,12 +28,14 @@ from .match import Match
 from .user import User
 from .users import Users
 
-from .misc import matches
+from .misc import matches, matches_columnar
+from .transfer import Progress, export_league
 
 from ..models.league import LeagueModel
 from ..models.match import ScoreboardModel, MatchModel
 from ..models.user import UserOverviewModel
 from ..models.integration import IntegrationModel
+from ..models.columnar import ColumnarResult
 
 from ..settings.match import MatchSettings
 
@@ -42,6 +43,29 @@ from ..misc import str_uuid4
 
 from ..server import get_server
 
+from ..statements import Statement
+
+from ..search import needs_like, text_search
+
+if TYPE_CHECKING:
+    from dathost.server.awaiting import ServerAwaiting
+
+
+@Statement
+def league_statement() -> Select:
+    return select([
+        league_table,
+        user_table.c.email,
+        user_table.c.dathost_id,
+    ]).select_from(
+        league_table.join(
+            user_table,
+            user_table.c.user_id == league_table.c.user_id
+        )
+    ).where(
+        league_table.c.league_id == bindparam("league_id")
+    )
+
 
 class League:
     def __init__(self, league_id: str) -> None:
@@ -96,31 +120,12 @@ class League:
 
         return Users(self, users)
 
-    async def players(self, search: str = None, page: int = 1,
-                      limit: int = 20, desc: bool = True
-                      ) -> AsyncGenerator[
-                          Tuple[UserOverviewModel, User], None]:
-        """Used to list players
-
-        Parameters
-        ----------
-        search : str, optional
-            by default None
-        page : int, optional
-             by default 1
-        limit : int, optional
-            by default 10
-        desc : bool, optional
-            by default True
-
-        Yields
-        -------
-        UserOverviewModel
-        User
-        """
-
+    def __players_query(self, page: int = 1, limit: int = 20,
+                        desc: bool = True, user_ids: List[str] = None
+                        ) -> Select:
+        # Password hashes are never needed for listings.
         query = select([
-            user_table,
+            *[column for column in user_table.c if column.name != "password"],
             func.ifnull(statistic_table.c.elo, 0.0).label("elo"),
             func.ifnull(statistic_table.c.kills, 0).label("kills"),
             func.ifnull(statistic_table.c.headshots, 0).label("headshots"),
@@ -145,24 +150,117 @@ class League:
             )
         ).where(
             statistic_table.c.league_id == self.league_id
-        ).limit(limit).offset((page - 1) * limit if page > 1 else 0).order_by(
+        ).order_by(
             statistic_table.c.elo.desc() if desc else
             statistic_table.c.elo.asc()
         )
 
-        if search:
-            query = query.where(
-                or_(
-                    user_table.c.steam_id == search,
-                    user_table.c.discord_id == search,
-                    user_table.c.user_id == search,
-                    user_table.c.name.like("%{}%".format(search))
+        if user_ids is None:
+            return query.limit(limit).offset(
+                (page - 1) * limit if page > 1 else 0
+            )
+
+        return query.where(user_table.c.user_id.in_(user_ids))
+
+    async def __players(self, search: str = None, page: int = 1,
+                        limit: int = 20, desc: bool = True) -> Select:
+        """Searches get the IDs of a page of players first, only
+        they're hydrated.
+        """
+
+        if not search:
+            return self.__players_query(page, limit, desc)
+
+        def search_query(like: bool) -> Select:
+            return select([statistic_table.c.user_id]).select_from(
+                user_table.join(
+                    statistic_table,
+                    user_table.c.user_id == statistic_table.c.user_id
+                )
+            ).where(
+                and_(
+                    statistic_table.c.league_id == self.league_id,
+                    or_(
+                        user_table.c.steam_id == search,
+                        user_table.c.discord_id == search,
+                        user_table.c.user_id == search,
+                        text_search(
+                            [user_table.c.name],
+                            Cache.search.users if Cache.search else None,
+                            search,
+                            like
+                        )
+                    )
                 )
             )
 
-        async for player in Sessions.database.iterate(query):
+        query = search_query(
+            await needs_like(search_query(False))
+        ).order_by(
+            statistic_table.c.elo.desc() if desc else
+            statistic_table.c.elo.asc()
+        ).limit(limit).offset((page - 1) * limit if page > 1 else 0)
+
+        return self.__players_query(desc=desc, user_ids=[
+            row["user_id"] for row in
+            await Sessions.database.fetch_all(query, replica=True)
+        ])
+
+    async def players(self, search: str = None, page: int = 1,
+                      limit: int = 20, desc: bool = True
+                      ) -> AsyncGenerator[
+                          Tuple[UserOverviewModel, User], None]:
+        """Used to list players
+
+        Parameters
+        ----------
+        search : str, optional
+            by default None
+        page : int, optional
+             by default 1
+        limit : int, optional
+            by default 10
+        desc : bool, optional
+            by default True
+
+        Yields
+        -------
+        UserOverviewModel
+        User
+        """
+
+        query = await self.__players(search, page, limit, desc)
+
+        async for player in Sessions.database.iterate(query, replica=True):
             yield UserOverviewModel(**player), self.user(player["user_id"])
 
+    async def players_columnar(self, search: str = None, page: int = 1,
+                               limit: int = 20, desc: bool = True
+                               ) -> ColumnarResult[UserOverviewModel]:
+        """Used to list players without building a model per player.
+
+        Parameters
+        ----------
+        search : str, optional
+            by default None
+        page : int, optional
+             by default 1
+        limit : int, optional
+            by default 20
+        desc : bool, optional
+            by default True
+
+        Returns
+        -------
+        ColumnarResult[UserOverviewModel]
+        """
+
+        return await ColumnarResult.fetch(
+            UserOverviewModel,
+            await self.__players(search, page, limit, desc),
+            replica=True
+        )
+
     async def matches(self, search: str = None,
                       page: int = 1, limit: int = 10, desc: bool = True
                       ) -> AsyncGenerator[Tuple[MatchModel, Match], None]:
@@ -190,8 +288,35 @@ class League:
                                           limit=limit, desc=desc):
             yield model, match
 
+    async def matches_columnar(self, search: str = None, page: int = 1,
+                               limit: int = 10, desc: bool = True
+                               ) -> ColumnarResult[MatchModel]:
+        """Lists matches without building a model per match.
+
+        Parameters
+        ----------
+        search : str, optional
+            by default None
+        page : int, optional
+            by default 1
+        limit : int, optional
+            by default 10
+        desc : bool, optional
+            by default True
+
+        Returns
+        -------
+        ColumnarResult[MatchModel]
+        """
+
+        return await matches_columnar(
+            league_id=self.league_id, search=search, page=page,
+            limit=limit, desc=desc
+        )
+
     async def create_match(self, match_settings: MatchSettings,
-                           ) -> Tuple[ScoreboardModel, Match, ServerAwaiting]:
+                           ) -> Tuple[ScoreboardModel, Match,
+                                      "ServerAwaiting"]:
         """Used to create a match.
 
         Parameters
@@ -214,10 +339,9 @@ class League:
                           + match_settings.team_2_players)
 
         # Checking for active bans.
-        banned_users = [
-            banned_user async for banned_user in
-            self.users(teams_combined).active_ban_users()
-        ]
+        banned_users = await Cache.bans.active_bans(
+            teams_combined, self.league_id
+        )
 
         if banned_users:
             raise UsersBanned(banned_users)
@@ -253,6 +377,11 @@ class League:
             scoreboard_total_table.insert().values(**values)
         )
 
+        if Cache.search:
+            Cache.search.add_match(
+                values["map"], values["team_1_name"], values["team_2_name"]
+            )
+
         # Kinda hackie way, but elo must know the league ID.
         if match_settings._captains.elo_set:
             await match_settings._captains.elo_set(self.league_id)
@@ -303,6 +432,8 @@ class League:
 
         team_1_players, team_2_players = await match_settings.user_to_steam()
 
+        from dathost.settings import MatchSettings as DathostMatchSettings
+
         await server.create_match(
             DathostMatchSettings(
                 match_settings.connection_time,
@@ -333,9 +464,7 @@ class League:
         scoreboard = await match.scoreboard()
 
         # Spawn match start webhook with some magic.
-        await Sessions.scheduler.spawn(
-            WebhookSender(scoreboard, self.league_id).match_start()
-        )
+        await WebhookSender(scoreboard, self.league_id).spawn("match.start")
 
         return scoreboard, match, server
 
@@ -382,15 +511,8 @@ class League:
             )
         ) == 1
 
-    async def integrations(self) -> AsyncGenerator[IntegrationModel, None]:
-        """Lists all enabled integrations.
-
-        Yields
-        -------
-        IntegrationModel
-        """
-
-        query = select([integration_table]).select_from(
+    def __integrations_query(self) -> Select:
+        return select([integration_table]).select_from(
             integration_table.join(
                 league_integration_table,
                 league_integration_table.c.name ==
@@ -402,9 +524,57 @@ class League:
                 league_integration_table.c.league_id == self.league_id
             )
         )
+
+    async def integrations(self) -> AsyncGenerator[IntegrationModel, None]:
+        """Lists all enabled integrations.
+
+        Yields
+        -------
+        IntegrationModel
+        """
+
+        query = self.__integrations_query()
+
         async for row in Sessions.database.iterate(query):
             yield IntegrationModel(**row)
 
+    async def integrations_columnar(self
+                                    ) -> ColumnarResult[IntegrationModel]:
+        """Lists all enabled integrations without building
+        a model per integration.
+
+        Returns
+        -------
+        ColumnarResult[IntegrationModel]
+        """
+
+        return await ColumnarResult.fetch(
+            IntegrationModel, self.__integrations_query()
+        )
+
+    async def export(self, pathway: str, format: str = "ndjson",
+                     progress: Progress = None) -> Dict[str, int]:
+        """Used to stream the league, its statistics, matches,
+        bans & webhooks out.
+
+        Parameters
+        ----------
+        pathway : str
+            File for ndjson, directory for csv.
+        format : str, optional
+            ndjson or csv, by default "ndjson"
+        progress : Progress, optional
+            Called with the table & rows exported, by default None
+
+        Returns
+        -------
+        Dict[str, int]
+            Rows exported per table.
+        """
+
+        return await export_league(self.league_id, pathway, format,
+                                   progress)
+
     async def get(self) -> LeagueModel:
         """Used to get details on a league.
 
@@ -418,18 +588,7 @@ class League:
         """
 
         row = await Sessions.database.fetch_one(
-            select([
-                league_table,
-                user_table.c.email,
-                user_table.c.dathost_id,
-            ]).select_from(
-                league_table.join(
-                    user_table,
-                    user_table.c.user_id == league_table.c.user_id
-                )
-            ).where(
-                league_table.c.league_id == self.league_id
-            )
+            league_statement(league_id=self.league_id)
         )
         if row:
             return LeagueModel(**row)
@@ -452,7 +611,8 @@ class League:
                      round_lost: float = None, match_won: float = None,
                      match_lost: float = None, assist: float = None,
                      mate_blinded: float = None, headshot: float = None,
-                     mate_killed: float = None, score: float = None
+                     mate_killed: float = None, score: float = None,
+                     archive_horizon: int = None
                      ) -> Union[LeagueModel, None]:
         """Used to update details about a league.
 
@@ -502,6 +662,9 @@ class League:
             by default None
         mate_killed : float, optional
             by default None
+        archive_horizon : int, optional
+            Days before finished matches are archived,
+            by default None
 
         Returns
         -------
@@ -554,6 +717,8 @@ class League:
             values["tickrate"] = tickrate
         if demo_tickrate is not None:
             values["demo_tickrate"] = demo_tickrate
+        if archive_horizon is not None:
+            values["archive_horizon"] = archive_horizon
 
         if values:
             await Sessions.database.execute(
@@ -568,6 +733,6 @@ class League:
 
             await WebhookSender(
                 league_model, self.league_id
-            ).league_updated()
+            ).spawn("league.updated")
 
             return league_model
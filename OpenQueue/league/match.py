@@ -2,11 +2,12 @@
 
 from datetime import datetime
 from typing import List, TYPE_CHECKING, TypedDict
-from sqlalchemy.sql import and_, select, func
+from sqlalchemy.sql import (
+    Select, and_, bindparam, false, literal_column, select, true, func
+)
 
 from ..tables import (
     scoreboard_total_table,
-    scoreboard_table,
     server_table,
     user_table
 )
@@ -16,21 +17,143 @@ from ..exceptions import (
     NoDemoToAnalyze,
     LeagueInvalid
 )
-from ..resources import Config, Sessions
+from ..resources import Config, Sessions, Cache
 from ..webhook import WebhookSender
 from ..demo import Demo
 from ..on_conflict import on_scoreboard_conflict, on_statistic_conflict
+from ..statements import Statement
+
+from .misc import scoreboard_tables
 
 from ..models.match import (
     MatchModel,
     MatchFinished,
-    ScoreboardModel
+    ScoreboardModel,
+    STATUS_CODES
 )
 
 if TYPE_CHECKING:
     from . import League
 
 
+@Statement
+def match_statement(archive: bool = False) -> Select:
+    total, board = scoreboard_tables(archive)
+
+    capt_team_1 = user_table.alias("capt_team_1")
+    capt_team_2 = user_table.alias("capt_team_2")
+    team_1_scoreboard = board.alias("team_1_scoreboard")
+    team_2_scoreboard = board.alias("team_2_scoreboard")
+
+    return select([
+        total.c.match_id,
+        total.c.league_id,
+        total.c.raw_ip,
+        total.c.game_port,
+        total.c.server_id,
+        total.c.b2_id,
+        total.c.timestamp,
+        total.c.status,
+        total.c.demo_status,
+        total.c.map,
+        total.c.team_1_name,
+        total.c.team_2_name,
+        total.c.team_1_score,
+        total.c.team_2_score,
+        total.c.team_1_side,
+        total.c.team_2_side,
+        capt_team_1.c.user_id.label("capt_team_1_user_id"),
+        capt_team_2.c.user_id.label("capt_team_2_user_id"),
+        capt_team_1.c.pfp_extension.label("capt_team_1_pfp_extension"),
+        capt_team_2.c.pfp_extension.label("capt_team_2_pfp_extension"),
+        func.group_concat(user_table.c.user_id).label("user_ids"),
+        func.group_concat(
+            user_table.c.pfp_extension
+        ).label("user_pfp_extensions"),
+        func.group_concat(user_table.c.name).label("user_names"),
+        func.group_concat(board.c.team).label("user_teams")
+    ]).select_from(
+        total.join(
+            board,
+            board.c.match_id == total.c.match_id
+        ).join(
+            team_1_scoreboard.join(
+                capt_team_1,
+                and_(
+                    capt_team_1.c.user_id == team_1_scoreboard.c.user_id,
+                    team_1_scoreboard.c.team == literal_column("0"),
+                    team_1_scoreboard.c.captain == True  # noqa: E712
+                )
+            ),
+            team_1_scoreboard.c.match_id == total.c.match_id,
+            isouter=True
+        ).join(
+            team_2_scoreboard.join(
+                capt_team_2,
+                and_(
+                    capt_team_2.c.user_id == team_2_scoreboard.c.user_id,
+                    team_2_scoreboard.c.team == literal_column("1"),
+                    team_2_scoreboard.c.captain == True  # noqa: E712
+                )
+            ),
+            team_2_scoreboard.c.match_id == total.c.match_id,
+            isouter=True
+        ).join(
+            user_table,
+            user_table.c.user_id == board.c.user_id
+        )
+    ).where(
+        and_(
+            total.c.league_id == bindparam("league_id"),
+            total.c.match_id == bindparam("match_id")
+        )
+    )
+
+
+@Statement
+def scoreboard_statement(archive: bool = False) -> Select:
+    total, board = scoreboard_tables(archive)
+
+    zero = literal_column("0")
+
+    return select([
+        total,
+        user_table.c.name,
+        user_table.c.user_id,
+        user_table.c.steam_id,
+        user_table.c.discord_id,
+        user_table.c.pfp_extension,
+        user_table.c.timestamp.label("user_timestamp"),
+        board.c.team,
+        func.ifnull(board.c.alive, true()).label("alive"),
+        func.ifnull(board.c.ping, zero).label("ping"),
+        func.ifnull(board.c.kills, zero).label("kills"),
+        func.ifnull(board.c.headshots, zero).label("headshots"),
+        func.ifnull(board.c.assists, zero).label("assists"),
+        func.ifnull(board.c.deaths, zero).label("deaths"),
+        func.ifnull(board.c.shots_fired, zero).label("shots_fired"),
+        func.ifnull(board.c.shots_hit, zero).label("shots_hit"),
+        func.ifnull(board.c.mvps, zero).label("mvps"),
+        func.ifnull(board.c.score, zero).label("score"),
+        func.ifnull(
+            board.c.disconnected, false()
+        ).label("disconnected")
+    ]).select_from(
+        total.join(
+            board,
+            board.c.match_id == total.c.match_id
+        ).join(
+            user_table,
+            user_table.c.user_id == board.c.user_id
+        )
+    ).where(
+        and_(
+            total.c.match_id == bindparam("match_id"),
+            total.c.league_id == bindparam("league_id")
+        )
+    )
+
+
 class PlayerTypings(TypedDict):
     user_id: str
     team: int
@@ -64,6 +187,10 @@ class Match:
     async def get(self) -> MatchModel:
         """Used to get match model.
 
+        Notes
+        -----
+        Falls back to the archive for archived matches.
+
         Returns
         -------
         MatchModel
@@ -73,84 +200,18 @@ class Match:
         InvalidMatchID
         """
 
-        capt_team_1 = user_table.alias("capt_team_1")
-        capt_team_2 = user_table.alias("capt_team_2")
-        team_1_scoreboard = scoreboard_table.alias("team_1_scoreboard")
-        team_2_scoreboard = scoreboard_table.alias("team_2_scoreboard")
-
-        query = select([
-            scoreboard_total_table.c.match_id,
-            scoreboard_total_table.c.league_id,
-            scoreboard_total_table.c.raw_ip,
-            scoreboard_total_table.c.game_port,
-            scoreboard_total_table.c.server_id,
-            scoreboard_total_table.c.b2_id,
-            scoreboard_total_table.c.timestamp,
-            scoreboard_total_table.c.status,
-            scoreboard_total_table.c.demo_status,
-            scoreboard_total_table.c.map,
-            scoreboard_total_table.c.team_1_name,
-            scoreboard_total_table.c.team_2_name,
-            scoreboard_total_table.c.team_1_score,
-            scoreboard_total_table.c.team_2_score,
-            scoreboard_total_table.c.team_1_side,
-            scoreboard_total_table.c.team_2_side,
-            capt_team_1.c.user_id.label("capt_team_1_user_id"),
-            capt_team_2.c.user_id.label("capt_team_2_user_id"),
-            capt_team_1.c.pfp_extension.label("capt_team_1_pfp_extension"),
-            capt_team_2.c.pfp_extension.label("capt_team_2_pfp_extension"),
-            func.group_concat(user_table.c.user_id).label("user_ids"),
-            func.group_concat(
-                user_table.c.pfp_extension
-            ).label("user_pfp_extensions"),
-            func.group_concat(user_table.c.name).label("user_names"),
-            func.group_concat(scoreboard_table.c.team).label("user_teams")
-        ]).select_from(
-            scoreboard_total_table.join(
-                scoreboard_table,
-                scoreboard_table.c.
-                match_id == scoreboard_total_table.c.match_id
-            ).join(
-                team_1_scoreboard.join(
-                    capt_team_1,
-                    and_(
-                        capt_team_1.c.user_id == team_1_scoreboard.c.user_id,
-                        team_1_scoreboard.c.team == 0,
-                        team_1_scoreboard.c.captain == True  # noqa: E712
-                    )
-                ),
-                team_1_scoreboard.c.match_id ==
-                scoreboard_total_table.c.match_id,
-                isouter=True
-            ).join(
-                team_2_scoreboard.join(
-                    capt_team_2,
-                    and_(
-                        capt_team_2.c.user_id == team_2_scoreboard.c.user_id,
-                        team_2_scoreboard.c.team == 1,
-                        team_2_scoreboard.c.captain == True  # noqa: E712
-                    )
-                ),
-                team_2_scoreboard.c.match_id ==
-                scoreboard_total_table.c.match_id,
-                isouter=True
-            ).join(
-                user_table,
-                user_table.c.user_id == scoreboard_table.c.user_id
-            )
-        ).where(
-            and_(
-                scoreboard_total_table.c.league_id == self.upper.league_id,
-                scoreboard_total_table.c.match_id == self.match_id
-            )
-        )
-
-        row = await Sessions.database.fetch_one(query)
+        for archive in (False, True):
+            # Aggregated without grouping, so a row of
+            # NULLs is given back when the match isn't found.
+            row = await Sessions.database.fetch_one(match_statement(
+                archive,
+                league_id=self.upper.league_id,
+                match_id=self.match_id
+            ))
+            if row and row["match_id"] is not None:
+                return MatchModel(**row)
 
-        if row:
-            return MatchModel(**row)
-        else:
-            raise InvalidMatchID()
+        raise InvalidMatchID()
 
     async def analyze_demo(self) -> None:
         """Used to analyze demo with playwin.
@@ -183,46 +244,15 @@ class Match:
     async def scoreboard(self) -> ScoreboardModel:
         """Gets scoreboard.
 
+        Notes
+        -----
+        Falls back to the archive for archived matches.
+
         Returns
         ------
         ScoreboardModel
         """
 
-        query = select([
-            scoreboard_total_table,
-            user_table.c.name,
-            user_table.c.user_id,
-            user_table.c.steam_id,
-            user_table.c.discord_id,
-            user_table.c.pfp_extension,
-            user_table.c.timestamp.label("user_timestamp"),
-            scoreboard_table.c.team,
-            func.ifnull(scoreboard_table.c.alive, True).label("alive"),
-            func.ifnull(scoreboard_table.c.ping, 0).label("ping"),
-            func.ifnull(scoreboard_table.c.kills, 0).label("kills"),
-            func.ifnull(scoreboard_table.c.headshots, 0).label("headshots"),
-            func.ifnull(scoreboard_table.c.assists, 0).label("assists"),
-            func.ifnull(scoreboard_table.c.deaths, 0).label("deaths"),
-            func.ifnull(
-                scoreboard_table.c.shots_fired, 0
-            ).label("shots_fired"),
-            func.ifnull(scoreboard_table.c.shots_hit, 0).label("shots_hit"),
-            func.ifnull(scoreboard_table.c.mvps, 0).label("mvps"),
-            func.ifnull(scoreboard_table.c.score, 0).label("score"),
-            func.ifnull(
-                scoreboard_table.c.disconnected, False
-            ).label("disconnected")
-        ]).select_from(
-            scoreboard_total_table.join(
-                scoreboard_table,
-                scoreboard_table.c.match_id ==
-                scoreboard_total_table.c.match_id
-            ).join(
-                user_table,
-                user_table.c.user_id == scoreboard_table.c.user_id
-            )
-        ).where(self.__and_statement)
-
         scoreboard_data = {
             "match": None,
             "team_1": [],
@@ -232,49 +262,61 @@ class Match:
         team_1_append = scoreboard_data["team_1"].append
         team_2_append = scoreboard_data["team_2"].append
 
-        async for row in Sessions.database.iterate(query=query):
-            if not scoreboard_data["match"]:
-                scoreboard_data["match"] = {
-                    "match_id": self.match_id,
-                    "raw_ip": row["raw_ip"],
-                    "game_port": row["game_port"],
-                    "server_id": row["server_id"],
-                    "timestamp": row["timestamp"],
-                    "b2_id": row["b2_id"],
-                    "status": row["status"],
-                    "demo_status": row["demo_status"],
-                    "map": row["map"],
-                    "team_1_name": row["team_1_name"],
-                    "team_2_name": row["team_2_name"],
-                    "team_1_score": row["team_1_score"],
-                    "team_2_score": row["team_2_score"],
-                    "team_1_side": row["team_1_side"],
-                    "team_2_side": row["team_2_side"],
-                    "league_id": row["league_id"]
-                }
-
-            team_append = team_1_append if row["team"] == 0 else team_2_append
-
-            team_append({
-                "user_id": row["user_id"],
-                "steam_id": row["steam_id"],
-                "discord_id": row["discord_id"],
-                "pfp_extension": row["pfp_extension"],
-                "name": row["name"],
-                "timestamp": row["user_timestamp"],
-                "team": row["team"],
-                "alive": row["alive"],
-                "ping": row["ping"],
-                "kills": row["kills"],
-                "headshots": row["headshots"],
-                "assists": row["assists"],
-                "deaths": row["deaths"],
-                "shots_fired": row["shots_fired"],
-                "shots_hit": row["shots_hit"],
-                "mvps": row["mvps"],
-                "score": row["score"],
-                "disconnected": row["disconnected"]
-            })
+        for archive in (False, True):
+            query = scoreboard_statement(
+                archive,
+                match_id=self.match_id,
+                league_id=self.upper.league_id
+            )
+
+            async for row in Sessions.database.iterate(query=query):
+                if not scoreboard_data["match"]:
+                    scoreboard_data["match"] = {
+                        "match_id": self.match_id,
+                        "raw_ip": row["raw_ip"],
+                        "game_port": row["game_port"],
+                        "server_id": row["server_id"],
+                        "timestamp": row["timestamp"],
+                        "b2_id": row["b2_id"],
+                        "status": row["status"],
+                        "demo_status": row["demo_status"],
+                        "map": row["map"],
+                        "team_1_name": row["team_1_name"],
+                        "team_2_name": row["team_2_name"],
+                        "team_1_score": row["team_1_score"],
+                        "team_2_score": row["team_2_score"],
+                        "team_1_side": row["team_1_side"],
+                        "team_2_side": row["team_2_side"],
+                        "league_id": row["league_id"]
+                    }
+
+                team_append = (
+                    team_1_append if row["team"] == 0 else team_2_append
+                )
+
+                team_append({
+                    "user_id": row["user_id"],
+                    "steam_id": row["steam_id"],
+                    "discord_id": row["discord_id"],
+                    "pfp_extension": row["pfp_extension"],
+                    "name": row["name"],
+                    "timestamp": row["user_timestamp"],
+                    "team": row["team"],
+                    "alive": row["alive"],
+                    "ping": row["ping"],
+                    "kills": row["kills"],
+                    "headshots": row["headshots"],
+                    "assists": row["assists"],
+                    "deaths": row["deaths"],
+                    "shots_fired": row["shots_fired"],
+                    "shots_hit": row["shots_hit"],
+                    "mvps": row["mvps"],
+                    "score": row["score"],
+                    "disconnected": row["disconnected"]
+                })
+
+            if scoreboard_data["match"]:
+                break
 
         if scoreboard_data["match"]:
             return ScoreboardModel(**scoreboard_data)
@@ -368,6 +410,9 @@ class Match:
                 )
             )
 
+            if Cache.search:
+                Cache.search.add_match(map, team_1_name, team_2_name)
+
         if players:
             try:
                 league = await self.upper.get()
@@ -446,9 +491,7 @@ class Match:
 
         scoreboard = await self.scoreboard()
 
-        await Sessions.scheduler.spawn(
-            WebhookSender(scoreboard).match_update()
-        )
+        await WebhookSender(scoreboard).spawn("match.update")
 
         return scoreboard
 
@@ -491,13 +534,17 @@ class Match:
             )
         )
 
-        match.status = 0
-        await self.update(status=match.status)
+        match.status = MatchFinished
+        # Its schema may have been cached with the old status.
+        match.invalidate()
+        await self.update(status=STATUS_CODES.index(MatchFinished))
 
+        await WebhookSender(match, self.upper.league_id).spawn("match.end")
         await Sessions.scheduler.spawn(
-            WebhookSender(match, self.upper.league_id).match_end()
+            server.stop(),
+            "server",
+            ("server.stop", {"server_id": server.server_id})
         )
-        await Sessions.scheduler.spawn(server.stop())
-        await Sessions.scheduler.spawn(Demo(server, self).upload())
+        await Demo(server, self).spawn()
 
         return match
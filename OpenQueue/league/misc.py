@@ -1,14 +1,383 @@
-from typing import AsyncGenerator, Callable, Tuple, TYPE_CHECKING
-from sqlalchemy import select, and_, or_, func
+from typing import (
+    Any, AsyncGenerator, Callable, Mapping, Tuple, TYPE_CHECKING
+)
+from sqlalchemy import (
+    Integer, Table, bindparam, literal_column, select, and_, or_, func
+)
+from sqlalchemy.sql import Select
 
-from ..tables import scoreboard_table, scoreboard_total_table, user_table
+from ..tables import (
+    scoreboard_table,
+    scoreboard_total_table,
+    scoreboard_archive_table,
+    scoreboard_total_archive_table,
+    user_table
+)
 from ..models.match import MatchModel
-from ..resources import Sessions
+from ..models.columnar import ColumnarResult
+from ..resources import Sessions, Cache
+from ..statements import Statement
+from ..search import needs_like, text_search
 
 if TYPE_CHECKING:
     from .match import Match
 
 
+def scoreboard_tables(archive: bool) -> Tuple[Table, Table]:
+    """Used to get the scoreboard total & scoreboard tables,
+    or their archives.
+    """
+
+    if archive:
+        return scoreboard_total_archive_table, scoreboard_archive_table
+
+    return scoreboard_total_table, scoreboard_table
+
+
+def matches_select(archive: bool) -> Select:
+    total, board = scoreboard_tables(archive)
+
+    capt_team_1 = user_table.alias("capt_team_1")
+    capt_team_2 = user_table.alias("capt_team_2")
+    team_1_scoreboard = board.alias("team_1_scoreboard")
+    team_2_scoreboard = board.alias("team_2_scoreboard")
+
+    # Captains are left joined one table at a time, a nested join
+    # gets materialized by some engines, scanning every scoreboard.
+    team_1_joins = (
+        {
+            "right": team_1_scoreboard,
+            "onclause": and_(
+                team_1_scoreboard.c.match_id == total.c.match_id,
+                team_1_scoreboard.c.team == literal_column("0"),
+                team_1_scoreboard.c.captain == True  # noqa: E712
+            ),
+            "isouter": True
+        },
+        {
+            "right": capt_team_1,
+            "onclause": capt_team_1.c.user_id ==
+            team_1_scoreboard.c.user_id,
+            "isouter": True
+        }
+    )
+
+    team_2_joins = (
+        {
+            "right": team_2_scoreboard,
+            "onclause": and_(
+                team_2_scoreboard.c.match_id == total.c.match_id,
+                team_2_scoreboard.c.team == literal_column("1"),
+                team_2_scoreboard.c.captain == True  # noqa: E712
+            ),
+            "isouter": True
+        },
+        {
+            "right": capt_team_2,
+            "onclause": capt_team_2.c.user_id ==
+            team_2_scoreboard.c.user_id,
+            "isouter": True
+        }
+    )
+
+    query = select([
+        total.c.match_id,
+        total.c.league_id,
+        total.c.raw_ip,
+        total.c.game_port,
+        total.c.server_id,
+        total.c.b2_id,
+        total.c.timestamp,
+        total.c.status,
+        total.c.demo_status,
+        total.c.map,
+        total.c.team_1_name,
+        total.c.team_2_name,
+        total.c.team_1_score,
+        total.c.team_2_score,
+        total.c.team_1_side,
+        total.c.team_2_side,
+        capt_team_1.c.user_id.label("capt_team_1_user_id"),
+        capt_team_2.c.user_id.label("capt_team_2_user_id"),
+        capt_team_1.c.pfp_extension.label("capt_team_1_pfp_extension"),
+        capt_team_2.c.pfp_extension.label("capt_team_2_pfp_extension"),
+        func.group_concat(user_table.c.user_id).label("user_ids"),
+        func.group_concat(
+            user_table.c.pfp_extension
+        ).label("user_pfp_extensions"),
+        func.group_concat(user_table.c.name).label("user_names"),
+        func.group_concat(board.c.team).label("user_teams")
+    ])
+
+    joins = total.join(
+        board,
+        board.c.match_id == total.c.match_id
+    )
+    for join in team_1_joins + team_2_joins:
+        joins = joins.join(**join)
+
+    query = query.select_from(joins.join(
+        user_table,
+        user_table.c.user_id == board.c.user_id
+    ))
+    query = query.where(
+        total.c.league_id == bindparam("league_id")
+    )
+
+    return query.distinct().group_by(total.c.match_id)
+
+
+@Statement
+def matches_statement(desc: bool, archive: bool) -> Select:
+    """Hydrates a page of matches by their IDs, bound as
+    match_ids. Variants are picked by the order & if listing
+    archived matches.
+    """
+
+    total, _ = scoreboard_tables(archive)
+
+    return matches_select(archive).where(
+        total.c.match_id.in_(bindparam("match_ids", expanding=True))
+    ).order_by(
+        total.c.timestamp.desc() if desc
+        else total.c.timestamp.asc()
+    )
+
+
+@Statement
+def matches_ids_statement(user_id: bool, desc: bool,
+                          archive: bool) -> Select:
+    """Used to get the IDs of a page of matches, variants are
+    picked by if filtering by user, the order & if listing
+    archived matches.
+    """
+
+    total, board = scoreboard_tables(archive)
+
+    query = select([total.c.match_id]).where(
+        total.c.league_id == bindparam("league_id")
+    )
+
+    if user_id:
+        query = query.where(total.c.match_id.in_(
+            select([board.c.match_id]).where(
+                board.c.user_id == bindparam("user_id")
+            )
+        ))
+
+    return query.order_by(
+        total.c.timestamp.desc() if desc
+        else total.c.timestamp.asc()
+    ).limit(
+        bindparam("limit", type_=Integer)
+    ).offset(
+        bindparam("offset", type_=Integer)
+    )
+
+
+@Statement
+def matches_count_statement(user_id: bool, archive: bool) -> Select:
+    total, board = scoreboard_tables(archive)
+
+    query = select([func.count()]).select_from(total).where(
+        total.c.league_id == bindparam("league_id")
+    )
+
+    if user_id:
+        query = query.where(total.c.match_id.in_(
+            select([board.c.match_id]).where(
+                board.c.user_id == bindparam("user_id")
+            )
+        ))
+
+    return query
+
+
+def search_ids_query(league_id: str, search: str, user_id: str = None,
+                     archive: bool = False, like: bool = False) -> Select:
+    """Used to get the IDs of matches found by a search, only
+    the IDs of a page are hydrated.
+
+    Notes
+    -----
+    Matches what include a player found by the search are
+    picked up by the user IDs found, rather then joining
+    every player of every match.
+    """
+
+    total, board = scoreboard_tables(archive)
+
+    players = select([board.c.match_id]).where(board.c.user_id.in_(
+        select([user_table.c.user_id]).where(
+            or_(
+                user_table.c.user_id == search,
+                user_table.c.steam_id == search,
+                text_search(
+                    [user_table.c.name],
+                    Cache.search.users if Cache.search else None,
+                    search,
+                    like
+                )
+            )
+        )
+    ))
+
+    query = select([total.c.match_id]).where(
+        and_(
+            total.c.league_id == league_id,
+            or_(
+                total.c.match_id == search,
+                text_search(
+                    [total.c.map, total.c.team_1_name, total.c.team_2_name],
+                    Cache.search.matches if Cache.search else None,
+                    search,
+                    like
+                ),
+                total.c.match_id.in_(players)
+            )
+        )
+    )
+
+    if user_id:
+        query = query.where(total.c.match_id.in_(
+            select([board.c.match_id]).where(board.c.user_id == user_id)
+        ))
+
+    return query
+
+
+async def matches_page(league_id: str, user_id: str, search: str,
+                       desc: bool, archive: bool, limit: int, offset: int
+                       ) -> AsyncGenerator[Mapping[str, Any], None]:
+    """Used to get a page of matches, the IDs of the page are
+    found first then only those matches are joined with their
+    players.
+    """
+
+    if search:
+        total, _ = scoreboard_tables(archive)
+
+        like = await needs_like(
+            search_ids_query(league_id, search, user_id, archive)
+        )
+
+        query = search_ids_query(
+            league_id, search, user_id, archive, like
+        ).order_by(
+            total.c.timestamp.desc() if desc
+            else total.c.timestamp.asc()
+        ).limit(limit).offset(offset)
+    else:
+        values = {"league_id": league_id}
+        if user_id:
+            values["user_id"] = user_id
+
+        query = matches_ids_statement(
+            bool(user_id), desc, archive,
+            limit=limit, offset=offset, **values
+        )
+
+    match_ids = [
+        row["match_id"] for row in
+        await Sessions.database.fetch_all(query, replica=True)
+    ]
+
+    if not match_ids:
+        return
+
+    async for row in Sessions.database.iterate(
+        matches_statement(
+            desc, archive, league_id=league_id, match_ids=match_ids
+        ),
+        replica=True
+    ):
+        yield row
+
+
+async def matches_count(league_id: str, user_id: str, search: str,
+                        archive: bool) -> int:
+    if search:
+        like = await needs_like(
+            search_ids_query(league_id, search, user_id, archive)
+        )
+
+        return await Sessions.database.fetch_val(
+            select([func.count()]).select_from(
+                search_ids_query(
+                    league_id, search, user_id, archive, like
+                ).alias("matches")
+            ),
+            replica=True
+        )
+
+    values = {"league_id": league_id}
+    if user_id:
+        values["user_id"] = user_id
+
+    return await Sessions.database.fetch_val(
+        matches_count_statement(bool(user_id), archive, **values),
+        replica=True
+    )
+
+
+async def matches_rows(league_id: str, user_id: str = None,
+                       search: str = None, page: int = 1, limit: int = 10,
+                       desc: bool = True
+                       ) -> AsyncGenerator[Mapping[str, Any], None]:
+    """Used to list the rows of matches, archived matches follow
+    on from the rest.
+
+    Parameters
+    ----------
+    league_id : str
+    user_id : str, optional
+        by default None
+    search : str, optional
+        by default None
+    page : int, optional
+        by default 1
+    limit : int, optional
+        by default 10
+    desc : bool, optional
+        by default True
+
+    Yields
+    ------
+    Mapping[str, Any]
+
+    Notes
+    -----
+    Archived matches are older then the rest, so newest first
+    the archive is only read once a page goes past the last
+    match what isn't archived. Matches what aren't archived
+    are only counted if a page starts past them. Unfinished
+    matches are never archived, so one older then the horizon
+    is listed before the archive.
+    """
+
+    offset = (page - 1) * limit if page > 1 else 0
+
+    for archive in ((False, True) if desc else (True, False)):
+        rows = 0
+
+        async for row in matches_page(league_id, user_id, search, desc,
+                                      archive, limit, offset):
+            rows += 1
+            yield row
+
+        if rows == limit:
+            return
+
+        if rows:
+            offset = 0
+        elif offset:
+            offset = max(0, offset - await matches_count(
+                league_id, user_id, search, archive
+            ))
+
+        limit -= rows
+
+
 async def matches(match: Callable[[str], "Match"], league_id: str,
                   user_id: str = None, search: str = None,
                   page: int = 1, limit: int = 10, desc: bool = True
@@ -38,128 +407,40 @@ async def matches(match: Callable[[str], "Match"], league_id: str,
         Used for interacting with a match.
     """
 
-    capt_team_1 = user_table.alias("capt_team_1")
-    capt_team_2 = user_table.alias("capt_team_2")
-    team_1_scoreboard = scoreboard_table.alias("team_1_scoreboard")
-    team_2_scoreboard = scoreboard_table.alias("team_2_scoreboard")
-
-    team_1_join = {
-        "right": team_1_scoreboard.join(
-            capt_team_1,
-            and_(
-                capt_team_1.c.user_id == team_1_scoreboard.c.user_id,
-                team_1_scoreboard.c.team == 0,
-                team_1_scoreboard.c.captain == True  # noqa: E712
-            )
-        ),
-        "onclause": team_1_scoreboard.c.match_id ==
-        scoreboard_total_table.c.match_id,
-        "isouter": True
-    }
-
-    team_2_join = {
-        "right": team_2_scoreboard.join(
-            capt_team_2,
-            and_(
-                capt_team_2.c.user_id == team_2_scoreboard.c.user_id,
-                team_2_scoreboard.c.team == 1,
-                team_2_scoreboard.c.captain == True  # noqa: E712
-            )
-        ),
-        "onclause": team_2_scoreboard.c.match_id ==
-        scoreboard_total_table.c.match_id,
-        "isouter": True
-    }
+    async for row in matches_rows(league_id, user_id, search, page, limit,
+                                  desc):
+        yield MatchModel(**row), match(row["match_id"])
 
-    query = select([
-        scoreboard_total_table.c.match_id,
-        scoreboard_total_table.c.league_id,
-        scoreboard_total_table.c.raw_ip,
-        scoreboard_total_table.c.game_port,
-        scoreboard_total_table.c.server_id,
-        scoreboard_total_table.c.b2_id,
-        scoreboard_total_table.c.timestamp,
-        scoreboard_total_table.c.status,
-        scoreboard_total_table.c.demo_status,
-        scoreboard_total_table.c.map,
-        scoreboard_total_table.c.team_1_name,
-        scoreboard_total_table.c.team_2_name,
-        scoreboard_total_table.c.team_1_score,
-        scoreboard_total_table.c.team_2_score,
-        scoreboard_total_table.c.team_1_side,
-        scoreboard_total_table.c.team_2_side,
-        capt_team_1.c.user_id.label("capt_team_1_user_id"),
-        capt_team_2.c.user_id.label("capt_team_2_user_id"),
-        capt_team_1.c.pfp_extension.label("capt_team_1_pfp_extension"),
-        capt_team_2.c.pfp_extension.label("capt_team_2_pfp_extension"),
-        func.group_concat(user_table.c.user_id).label("user_ids"),
-        func.group_concat(
-            user_table.c.pfp_extension
-        ).label("user_pfp_extensions"),
-        func.group_concat(user_table.c.name).label("user_names"),
-        func.group_concat(scoreboard_table.c.team).label("user_teams")
-    ])
 
-    if search:
-        like_search = "%{}%".format(search)
-
-        query = query.select_from(
-            scoreboard_total_table.join(
-                scoreboard_table,
-                scoreboard_table.c.
-                match_id == scoreboard_total_table.c.match_id
-            ).join(
-                user_table,
-                user_table.c.user_id == scoreboard_table.c.user_id
-            ).join(**team_1_join).join(**team_2_join)
-        ).where(
-            and_(
-                scoreboard_total_table.c.league_id == league_id,
-                or_(
-                    scoreboard_total_table.c.match_id == search,
-                    scoreboard_total_table.c.map.like(like_search),
-                    scoreboard_total_table.c.team_1_name.like(like_search),
-                    scoreboard_total_table.c.team_2_name.like(like_search),
-                    user_table.c.name.like(like_search),
-                    user_table.c.user_id == search,
-                    user_table.c.steam_id == search
-                )
-            )
-        )
+async def matches_columnar(league_id: str, user_id: str = None,
+                           search: str = None, page: int = 1,
+                           limit: int = 10, desc: bool = True
+                           ) -> ColumnarResult[MatchModel]:
+    """Used to list matches without building a model per match.
 
-        if user_id:
-            query = query.where(
-                scoreboard_table.c.user_id == user_id
-            )
-    else:
-        query = query.select_from(
-            scoreboard_total_table.join(
-                scoreboard_table,
-                scoreboard_table.c.
-                match_id == scoreboard_total_table.c.match_id
-            ).join(**team_1_join).join(**team_2_join).join(
-                user_table,
-                user_table.c.user_id == scoreboard_table.c.user_id
-            )
-        )
-        if user_id:
-            query = query.where(
-                and_(
-                    scoreboard_total_table.c.league_id == league_id,
-                    scoreboard_table.c.user_id == user_id
-                )
-            )
-        else:
-            query = query.where(
-                scoreboard_total_table.c.league_id == league_id
-            )
+    Parameters
+    ----------
+    league_id : str
+    user_id : str, optional
+        by default None
+    search : str, optional
+        by default None
+    page : int, optional
+        by default 1
+    limit : int, optional
+        by default 10
+    desc : bool, optional
+        by default True
 
-    query = query.distinct().order_by(
-        scoreboard_total_table.c.timestamp.desc() if desc
-        else scoreboard_total_table.c.timestamp.asc()
-    ).limit(limit).offset((page - 1) * limit if page > 1 else 0).group_by(
-        scoreboard_total_table.c.match_id
-    )
+    Returns
+    -------
+    ColumnarResult[MatchModel]
+    """
 
-    async for row in Sessions.database.iterate(query=query):
-        yield MatchModel(**row), match(row["match_id"])
+    result = ColumnarResult(MatchModel)
+
+    async for row in matches_rows(league_id, user_id, search, page, limit,
+                                  desc):
+        result.append(row)
+
+    return result
@@ -0,0 +1,397 @@
+# -*- coding: utf-8 -*-
+
+import asyncio
+import csv
+import io
+import os
+
+from datetime import datetime
+from functools import partial
+from itertools import islice
+from typing import (
+    IO, Any, Callable, Dict, Iterator, List, Mapping, Optional, Tuple
+)
+from sqlalchemy import Boolean, Float, Integer, Table, TIMESTAMP, select
+from sqlalchemy.sql import Select
+
+from ..resources import Sessions
+from ..encoding import dumps, loads
+from ..tables import (
+    league_table,
+    statistic_table,
+    scoreboard_total_table,
+    scoreboard_table,
+    scoreboard_total_archive_table,
+    scoreboard_archive_table,
+    ban_table,
+    webhook_table
+)
+
+
+# In the order rows are imported, so foreign keys are met.
+# Users & events a league references must already exist.
+TABLES: Dict[str, Table] = {
+    table.name: table for table in (
+        league_table,
+        statistic_table,
+        scoreboard_total_table,
+        scoreboard_table,
+        scoreboard_total_archive_table,
+        scoreboard_archive_table,
+        ban_table,
+        webhook_table
+    )
+}
+
+FORMATS = ("ndjson", "csv")
+
+# Written in CSVs in place of NULL.
+CSV_NULL = "\\N"
+
+# Called with the table & amount of its rows done.
+Progress = Callable[[str, int], None]
+
+# Bytes or characters buffered before writing to a file.
+WRITE_SIZE = 1 << 16
+
+
+class ExportFile:
+    def __init__(self, file: IO, buffer: IO) -> None:
+        """Buffers an export, written to the file off the
+        event loop.
+
+        Parameters
+        ----------
+        file : IO
+        buffer : IO
+            StringIO or BytesIO, matching the file's mode.
+        """
+
+        self.file = file
+        self.buffer = buffer
+
+    async def written(self) -> None:
+        """Called after writing to the buffer, flushes it once
+        WRITE_SIZE is reached.
+        """
+
+        if self.buffer.tell() >= WRITE_SIZE:
+            await self.flush()
+
+    async def flush(self) -> None:
+        data = self.buffer.getvalue()
+        self.buffer.seek(0)
+        self.buffer.truncate()
+
+        if data:
+            await asyncio.get_event_loop().run_in_executor(
+                None, self.file.write, data
+            )
+
+    async def close(self) -> None:
+        try:
+            await self.flush()
+        finally:
+            await asyncio.get_event_loop().run_in_executor(
+                None, self.file.close
+            )
+
+
+# Tables without a league ID, joined to the table what has it.
+PLAYER_TABLES = {
+    scoreboard_table: scoreboard_total_table,
+    scoreboard_archive_table: scoreboard_total_archive_table
+}
+
+
+def league_query(table: Table, league_id: str) -> Select:
+    if table in PLAYER_TABLES:
+        total = PLAYER_TABLES[table]
+
+        return select([table]).select_from(
+            table.join(total, total.c.match_id == table.c.match_id)
+        ).where(total.c.league_id == league_id)
+
+    return table.select().where(table.c.league_id == league_id)
+
+
+def encode_value(column_type: Any, value: Any) -> Any:
+    if value is not None and isinstance(column_type, TIMESTAMP):
+        return value.isoformat()
+
+    return value
+
+
+def decode_value(column_type: Any, value: Any) -> Any:
+    if value is not None and isinstance(column_type, TIMESTAMP):
+        return datetime.fromisoformat(value)
+
+    return value
+
+
+def encode_csv(column_type: Any, value: Any) -> str:
+    if value is None:
+        return CSV_NULL
+    if isinstance(column_type, Boolean):
+        return "1" if value else "0"
+
+    return str(encode_value(column_type, value))
+
+
+def decode_csv(column_type: Any, value: str) -> Any:
+    if value == CSV_NULL:
+        return None
+    if isinstance(column_type, Boolean):
+        return value == "1"
+    if isinstance(column_type, Integer):
+        return int(value)
+    if isinstance(column_type, Float):
+        return float(value)
+
+    return decode_value(column_type, value)
+
+
+async def export_league(league_id: str, pathway: str,
+                        format: str = "ndjson",
+                        progress: Progress = None,
+                        progress_every: int = 10000) -> Dict[str, int]:
+    """Used to stream the rows of a league out.
+
+    Parameters
+    ----------
+    league_id : str
+    pathway : str
+        File for ndjson, directory for csv.
+    format : str, optional
+        ndjson or csv, by default "ndjson"
+    progress : Progress, optional
+        by default None
+    progress_every : int, optional
+        Rows between progress calls, by default 10000
+
+    Returns
+    -------
+    Dict[str, int]
+        Rows exported per table.
+
+    Notes
+    -----
+    Rows are written as they're read, so memory use doesn't
+    grow with the size of the league. Every table is read
+    within one repeatable read transaction & files are
+    written off the event loop. ndjson lines are
+    {"table": ..., "row": {...}}, csv writes a file per table
+    with a header & \\N for NULL.
+    """
+
+    assert format in FORMATS
+
+    loop = asyncio.get_event_loop()
+
+    if format == "csv":
+        await loop.run_in_executor(
+            None, partial(os.makedirs, pathway, exist_ok=True)
+        )
+        ndjson = None
+    else:
+        ndjson = ExportFile(
+            await loop.run_in_executor(None, open, pathway, "wb"),
+            io.BytesIO()
+        )
+
+    counts = {}
+    try:
+        # Held so MySQL's isolation level applies to the transaction.
+        async with Sessions.database.connection():
+            if Sessions.database.dialect.name == "mysql":
+                await Sessions.database.execute(
+                    "SET TRANSACTION ISOLATION LEVEL REPEATABLE READ"
+                )
+
+            # Every table is read as of the same moment, so rows
+            # never reference rows what aren't exported.
+            async with Sessions.database.transaction(
+                    isolation="repeatable_read", readonly=True):
+                for name, table in TABLES.items():
+                    counts[name] = await export_table(
+                        league_id, name, table, pathway, ndjson,
+                        progress, progress_every
+                    )
+    finally:
+        if ndjson is not None:
+            await ndjson.close()
+
+    return counts
+
+
+async def export_table(league_id: str, name: str, table: Table,
+                       pathway: str, ndjson: Optional["ExportFile"],
+                       progress: Optional[Progress],
+                       progress_every: int) -> int:
+    columns = [(column.name, column.type) for column in table.c]
+    count = 0
+
+    if ndjson is None:
+        file = ExportFile(
+            await asyncio.get_event_loop().run_in_executor(
+                None, partial(open, os.path.join(pathway, name + ".csv"),
+                              "w", newline="", encoding="utf-8")
+            ),
+            io.StringIO()
+        )
+        writer = csv.writer(file.buffer)
+        writer.writerow([column for column, _ in columns])
+
+    try:
+        async for row in Sessions.database.iterate(
+                league_query(table, league_id)):
+            if ndjson is None:
+                writer.writerow([
+                    encode_csv(column_type, row[column])
+                    for column, column_type in columns
+                ])
+                await file.written()
+            else:
+                ndjson.buffer.write(dumps({
+                    "table": name,
+                    "row": {
+                        column: encode_value(column_type, row[column])
+                        for column, column_type in columns
+                    }
+                }) + b"\n")
+                await ndjson.written()
+
+            count += 1
+            if progress and count % progress_every == 0:
+                progress(name, count)
+    finally:
+        if ndjson is None:
+            await file.close()
+
+    if progress:
+        progress(name, count)
+
+    return count
+
+
+def read_ndjson(pathway: str) -> Iterator[Tuple[str, Dict[str, Any]]]:
+    with open(pathway, "rb") as file:
+        for line in file:
+            if not line.strip():
+                continue
+
+            record = loads(line)
+            table = TABLES[record["table"]]
+
+            yield table.name, {
+                column: decode_value(table.c[column].type, value)
+                for column, value in record["row"].items()
+            }
+
+
+def read_csv(pathway: str) -> Iterator[Tuple[str, Dict[str, Any]]]:
+    for name, table in TABLES.items():
+        table_pathway = os.path.join(pathway, name + ".csv")
+        if not os.path.exists(table_pathway):
+            continue
+
+        with open(table_pathway, newline="", encoding="utf-8") as file:
+            reader = csv.reader(file)
+            header = next(reader, None)
+            if not header:
+                continue
+
+            types = [table.c[column].type for column in header]
+
+            for values in reader:
+                yield name, {
+                    column: decode_csv(column_type, value)
+                    for column, column_type, value in zip(header, types,
+                                                          values)
+                }
+
+
+async def import_league(pathway: str, format: str = "ndjson",
+                        chunk_size: int = 500,
+                        progress: Progress = None,
+                        atomic: bool = True) -> Dict[str, int]:
+    """Used to stream the rows of an exported league in.
+
+    Parameters
+    ----------
+    pathway : str
+        File for ndjson, directory for csv.
+    format : str, optional
+        ndjson or csv, by default "ndjson"
+    chunk_size : int, optional
+        Rows per insert, by default 500
+    progress : Progress, optional
+        Called after each chunk, by default None
+    atomic : bool, optional
+        Import in one transaction, so a failed import leaves
+        nothing behind, else each chunk is committed once
+        inserted, by default True
+
+    Returns
+    -------
+    Dict[str, int]
+        Rows imported per table.
+
+    Notes
+    -----
+    Files are read & decoded off the event loop a chunk at a
+    time, so only a couple chunks of rows are held at once.
+    """
+
+    assert format in FORMATS
+
+    loop = asyncio.get_event_loop()
+
+    rows = read_csv(pathway) if format == "csv" else read_ndjson(pathway)
+
+    counts: Dict[str, int] = {}
+    chunk: List[Mapping[str, Any]] = []
+    chunk_table: Optional[str] = None
+
+    async def flush() -> None:
+        await Sessions.database.execute(
+            TABLES[chunk_table].insert().values(chunk)
+        )
+
+        counts[chunk_table] = counts.get(chunk_table, 0) + len(chunk)
+        if progress:
+            progress(chunk_table, counts[chunk_table])
+
+        chunk.clear()
+
+    async def insert() -> None:
+        nonlocal chunk_table
+
+        while True:
+            batch = await loop.run_in_executor(
+                None, list, islice(rows, chunk_size)
+            )
+            if not batch:
+                break
+
+            for name, row in batch:
+                if chunk and (
+                        name != chunk_table or len(chunk) >= chunk_size):
+                    await flush()
+
+                chunk_table = name
+                chunk.append(row)
+
+        if chunk:
+            await flush()
+
+    try:
+        if atomic:
+            async with Sessions.database.transaction():
+                await insert()
+        else:
+            await insert()
+    finally:
+        rows.close()
+
+    return counts
@@ -13,7 +13,7 @@ from ..tables import (
     scoreboard_total_table
 )
 
-from ..resources import Sessions
+from ..resources import Sessions, Cache
 
 from ..ban import Ban
 
@@ -92,7 +92,8 @@ class User:
                 )
             ).where(
                 self.__and_statement
-            )
+            ),
+            replica=True
         )
 
         if row:
@@ -157,7 +158,8 @@ class User:
                     scoreboard_total_table.c.map
                 ).order_by(
                     wins.desc(), ties.desc()
-                )
+                ),
+                replica=True
             )
 
             return StatisticModel(
@@ -252,9 +254,10 @@ class User:
             raise InvalidUser()
         else:
             ban_model = BanModel(**values)
+            Cache.bans.add(ban_model)
 
-            await Sessions.scheduler.spawn(
-                WebhookSender(ban_model, self.upper.league_id).user_banned()
-            )
+            await WebhookSender(
+                ban_model, self.upper.league_id
+            ).spawn("user.banned")
 
             return ban_model, self.ban(values["ban_id"])
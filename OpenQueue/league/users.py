@@ -31,6 +31,11 @@ class Users:
     async def active_ban_users(self) -> AsyncGenerator[BanModel, None]:
         """Used to yield actively banned users.
 
+        Notes
+        -----
+        Queries the database, Cache.bans.active_bans
+        gives the same result from memory.
+
         Yields
         -------
         BanModel
@@ -38,13 +43,21 @@ class Users:
 
         query = ban_table.select().where(
             ban_table.c.user_id.in_(self.users)
+        ).where(
+            ban_table.c.revoked == False  # noqa: E712
+        ).where(
+            or_(
+                ban_table.c.global_ == True,  # noqa: E712
+                ban_table.c.league_id == None,  # noqa: E711
+                ban_table.c.league_id == self.upper.league_id
+            )
         ).where(
             or_(
                 ban_table.c.expires == None,  # noqa: E711
                 ban_table.c.expires > datetime.now()
             )
         ).where(
-            ban_table.c.user_id.notin_(
+            ban_table.c.ban_id.notin_(
                 select([ban_exception_table.c.ban_id]).select_from(
                     ban_exception_table
                 ).where(
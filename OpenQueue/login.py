@@ -1,5 +1,3 @@
-import bcrypt
-
 from typing import TYPE_CHECKING, Tuple
 from sqlalchemy import select, func
 
@@ -63,6 +61,8 @@ class Login:
         if not row:
             raise IncorrectLoginDetails()
 
+        import bcrypt
+
         if bcrypt.checkpw(self.password.encode(), row["password"]):
             return UserModel(**row), self.upper.user(row["user_id"])
         else:
@@ -86,6 +86,8 @@ class Login:
         except LoginException:
             raise
         else:
+            import bcrypt
+
             await Sessions.database.execute(
                 user_table.update().values(
                     password=bcrypt.hashpw(
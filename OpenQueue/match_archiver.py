@@ -0,0 +1,163 @@
+# -*- coding: utf-8 -*-
+
+from datetime import datetime, timedelta
+from sqlalchemy import literal, select
+from sqlalchemy.sql import and_
+
+from .resources import Sessions
+from .tables import (
+    league_table,
+    scoreboard_total_table,
+    scoreboard_table,
+    scoreboard_total_archive_table,
+    scoreboard_archive_table
+)
+from .scheduler import periodic
+from .settings.archive import MatchArchiveSettings
+
+from .models.match import MatchFinished, STATUS_CODES
+
+
+class MatchArchiver:
+    def __init__(self, settings: MatchArchiveSettings) -> None:
+        """Moves finished matches older then a league's archive
+        horizon into the archive tables.
+
+        Parameters
+        ----------
+        settings : MatchArchiveSettings
+        """
+
+        self.settings = settings
+
+    async def archive_league(self, league_id: str, before: datetime) -> int:
+        """Archives a league's finished matches in batches.
+
+        Parameters
+        ----------
+        league_id : str
+        before : datetime
+            Matches played before this are archived.
+
+        Returns
+        -------
+        int
+            Amount of matches archived.
+
+        Notes
+        -----
+        Rows are copied with INSERT ... SELECT, so never pass
+        through Python. Statistics aren't touched, they already
+        count archived matches. Batches are claimed with
+        SELECT ... FOR UPDATE SKIP LOCKED, so processes archiving
+        at once never move the same matches. SQLite has no row
+        locks, a process what loses the race fails its batch &
+        retries on its next run.
+        """
+
+        archived = 0
+
+        total_columns = [column.name for column in scoreboard_total_table.c]
+        board_columns = [column.name for column in scoreboard_table.c]
+
+        while True:
+            async with Sessions.database.transaction():
+                # Claims the batch, other processes archiving at
+                # the same time skip it.
+                match_ids = [
+                    row["match_id"] for row in
+                    await Sessions.database.fetch_all(
+                        select([scoreboard_total_table.c.match_id]).where(
+                            and_(
+                                scoreboard_total_table.c.league_id ==
+                                league_id,
+                                scoreboard_total_table.c.status ==
+                                STATUS_CODES.index(MatchFinished),
+                                scoreboard_total_table.c.timestamp < before
+                            )
+                        ).order_by(
+                            scoreboard_total_table.c.timestamp.asc()
+                        ).limit(
+                            self.settings.batch_size
+                        ).with_for_update(skip_locked=True)
+                    )
+                ]
+
+                if not match_ids:
+                    break
+
+                total_in = and_(
+                    scoreboard_total_table.c.league_id == league_id,
+                    scoreboard_total_table.c.match_id.in_(match_ids)
+                )
+                board_in = scoreboard_table.c.match_id.in_(match_ids)
+
+                await Sessions.database.execute(
+                    scoreboard_total_archive_table.insert().from_select(
+                        total_columns + ["archived"],
+                        select([
+                            *scoreboard_total_table.c,
+                            literal(datetime.now()).label("archived")
+                        ]).where(total_in)
+                    )
+                )
+                await Sessions.database.execute(
+                    scoreboard_archive_table.insert().from_select(
+                        board_columns,
+                        select(scoreboard_table.c).where(board_in)
+                    )
+                )
+                await Sessions.database.execute(
+                    scoreboard_table.delete().where(board_in)
+                )
+                await Sessions.database.execute(
+                    scoreboard_total_table.delete().where(total_in)
+                )
+
+            archived += len(match_ids)
+
+            if len(match_ids) < self.settings.batch_size:
+                break
+
+        return archived
+
+    async def archive(self) -> int:
+        """Archives old finished matches of every league.
+
+        Returns
+        -------
+        int
+            Amount of matches archived.
+        """
+
+        now = datetime.now()
+        archived = 0
+
+        # Fetched up front, archiving can't share the connection
+        # with a open cursor.
+        leagues = await Sessions.database.fetch_all(select([
+            league_table.c.league_id,
+            league_table.c.archive_horizon
+        ]))
+
+        for row in leagues:
+            horizon = (
+                timedelta(days=row["archive_horizon"])
+                if row["archive_horizon"] is not None
+                else self.settings.horizon
+            )
+
+            archived += await self.archive_league(
+                row["league_id"], now - horizon
+            )
+
+        return archived
+
+    async def run(self) -> None:
+        """Archives forever, sleeping for the configured interval.
+        """
+
+        await periodic(
+            self.archive, self.settings.interval.total_seconds(),
+            "Match archive"
+        )
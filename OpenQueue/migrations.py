@@ -0,0 +1,388 @@
+# -*- coding: utf-8 -*-
+
+import logging
+
+from contextlib import contextmanager
+from typing import Iterator, List, Tuple
+from sqlalchemy import (
+    Column, Table, create_engine, inspect, select, text
+)
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.engine.reflection import Inspector
+from sqlalchemy.schema import CreateColumn
+
+from .search import tsvector_sql
+from .tables import (
+    metadata,
+    update_table,
+    user_table,
+    league_table,
+    ban_table,
+    scoreboard_total_table,
+    scoreboard_total_archive_table,
+    scoreboard_table,
+    statistic_table,
+    webhook_table
+)
+
+
+logger = logging.getLogger("OpenQueue.migrations")
+
+# Name of the MySQL lock & key of the PostgreSQL advisory lock
+# held while migrating.
+LOCK_NAME = "OpenQueue.migrations"
+LOCK_KEY = 7265627273
+# Seconds MySQL waits for the lock.
+LOCK_TIMEOUT = 600
+
+
+def create_index(connection: Connection, table: Table, name: str,
+                 columns: List[str], unique: bool = False) -> None:
+    """Creates a index without locking the table where supported.
+    """
+
+    preparer = connection.dialect.identifier_preparer
+
+    unique_sql = "UNIQUE " if unique else ""
+    name = preparer.quote(name)
+    table_name = preparer.format_table(table)
+    columns_sql = ", ".join(preparer.quote(column) for column in columns)
+
+    if connection.dialect.name == "mysql":
+        connection.execute(
+            "ALTER TABLE {} ADD {}INDEX {} ({}), "
+            "ALGORITHM=INPLACE, LOCK=NONE".format(
+                table_name, unique_sql, name, columns_sql
+            )
+        )
+    elif connection.dialect.name == "postgresql":
+        # CONCURRENTLY can't be ran within a transaction.
+        connection.execution_options(isolation_level="AUTOCOMMIT").execute(
+            "CREATE {}INDEX CONCURRENTLY {} ON {} ({})".format(
+                unique_sql, name, table_name, columns_sql
+            )
+        )
+    else:
+        connection.execute("CREATE {}INDEX {} ON {} ({})".format(
+            unique_sql, name, table_name, columns_sql
+        ))
+
+
+class AddIndex:
+    def __init__(self, name: str, columns: List[Column],
+                 unique: bool = False) -> None:
+        """Adds a index, skipped if it exists.
+
+        Parameters
+        ----------
+        name : str
+        columns : List[Column]
+            Of the same table.
+        unique : bool, optional
+            by default False
+        """
+
+        self.name = name
+        self.columns = columns
+        self.unique = unique
+
+    def apply(self, connection: Connection, inspector: Inspector) -> None:
+        table = self.columns[0].table
+
+        if self.name in [
+                index["name"] for index in inspector.get_indexes(table.name)]:
+            return
+
+        create_index(
+            connection,
+            table,
+            self.name,
+            [column.name for column in self.columns],
+            self.unique
+        )
+
+
+class AddFullText:
+    def __init__(self, name: str, columns: List[Column]) -> None:
+        """Adds a full text index, skipped if it exists or the
+        engine uses the in memory SearchIndex.
+
+        Parameters
+        ----------
+        name : str
+        columns : List[Column]
+            Of the same table.
+        """
+
+        self.name = name
+        self.columns = columns
+
+    def apply(self, connection: Connection, inspector: Inspector) -> None:
+        table = self.columns[0].table
+        preparer = connection.dialect.identifier_preparer
+
+        name = preparer.quote(self.name)
+        table_name = preparer.format_table(table)
+        columns = [preparer.quote(column.name) for column in self.columns]
+
+        if connection.dialect.name == "mysql":
+            if self.name in [
+                    index["name"]
+                    for index in inspector.get_indexes(table.name)]:
+                return
+
+            # InnoDB can't add the first full text index without locking.
+            connection.execute(
+                "ALTER TABLE {} ADD FULLTEXT INDEX {} ({})".format(
+                    table_name, name, ", ".join(columns)
+                )
+            )
+        elif connection.dialect.name == "postgresql":
+            connection.execution_options(isolation_level="AUTOCOMMIT").execute(
+                "CREATE INDEX CONCURRENTLY IF NOT EXISTS {} ON {} "
+                "USING GIN (({}))".format(
+                    name, table_name, tsvector_sql(columns)
+                )
+            )
+
+
+class AddUnique:
+    def __init__(self, column: Column, name: str) -> None:
+        """Makes a column unique, skipped if a unique constraint
+        or index already covers it.
+
+        Parameters
+        ----------
+        column : Column
+        name : str
+            Name of the unique index.
+        """
+
+        self.column = column
+        self.name = name
+
+    def apply(self, connection: Connection, inspector: Inspector) -> None:
+        table = self.column.table
+        columns = [self.column.name]
+
+        for constraint in inspector.get_unique_constraints(table.name):
+            if constraint["column_names"] == columns:
+                return
+
+        for index in inspector.get_indexes(table.name):
+            if index["unique"] and index["column_names"] == columns:
+                return
+
+        create_index(connection, table, self.name, columns, unique=True)
+
+
+class AddColumn:
+    def __init__(self, column: Column) -> None:
+        """Adds a column defined in tables, skipped if it exists.
+
+        Parameters
+        ----------
+        column : Column
+        """
+
+        self.column = column
+
+    def apply(self, connection: Connection, inspector: Inspector) -> None:
+        table = self.column.table
+
+        if self.column.name in [
+                column["name"] for column in inspector.get_columns(table.name)
+        ]:
+            return
+
+        connection.execute("ALTER TABLE {} ADD COLUMN {}".format(
+            connection.dialect.identifier_preparer.format_table(table),
+            CreateColumn(self.column).compile(dialect=connection.dialect)
+        ))
+
+
+class Migration:
+    def __init__(self, major: int, minor: int, patch: int, message: str,
+                 *operations) -> None:
+        """Schema change, recorded in the update table once applied.
+
+        Parameters
+        ----------
+        major : int
+        minor : int
+        patch : int
+        message : str
+        *operations
+            AddIndex, AddUnique, AddColumn or AddFullText.
+        """
+
+        self.version = (major, minor, patch)
+        self.message = message
+        self.operations = operations
+
+
+# Schema versions, not package versions. Append new
+# migrations to the end, never edit a applied one.
+# Each migration lists its indexes, a index added to a existing
+# table in tables needs a new migration to reach existing databases.
+MIGRATIONS = [
+    Migration(
+        0, 1, 0, "Ban indexes",
+        AddIndex("ban_expires_revoked", [
+            ban_table.c.expires,
+            ban_table.c.revoked
+        ]),
+        AddIndex("ban_league_id_expires", [
+            ban_table.c.league_id,
+            ban_table.c.expires
+        ]),
+        AddIndex("ban_user_id_expires", [
+            ban_table.c.user_id,
+            ban_table.c.expires
+        ])
+    ),
+    Migration(
+        0, 1, 1, "Unique dathost IDs",
+        AddUnique(user_table.c.dathost_id, "user_dathost_id")
+    ),
+    Migration(
+        0, 1, 2, "Email code expiry",
+        AddColumn(user_table.c.email_code_expires)
+    ),
+    Migration(
+        0, 1, 3, "Indexes for match, leaderboard & webhook queries",
+        AddIndex("scoreboard_total_league_id_timestamp", [
+            scoreboard_total_table.c.league_id,
+            scoreboard_total_table.c.timestamp
+        ]),
+        AddIndex("scoreboard_total_server_id", [
+            scoreboard_total_table.c.server_id
+        ]),
+        AddIndex("scoreboard_total_status", [
+            scoreboard_total_table.c.status
+        ]),
+        AddIndex("statistic_league_id_elo", [
+            statistic_table.c.league_id,
+            statistic_table.c.elo
+        ]),
+        AddIndex("webhook_event_id_league_id", [
+            webhook_table.c.event_id,
+            webhook_table.c.league_id
+        ])
+    ),
+    Migration(
+        0, 1, 4, "Per league match archive horizon",
+        AddColumn(league_table.c.archive_horizon)
+    ),
+    Migration(
+        0, 1, 5, "Indexes for match & player search",
+        AddFullText("scoreboard_total_search", [
+            scoreboard_total_table.c.map,
+            scoreboard_total_table.c.team_1_name,
+            scoreboard_total_table.c.team_2_name
+        ]),
+        AddFullText("scoreboard_total_archive_search", [
+            scoreboard_total_archive_table.c.map,
+            scoreboard_total_archive_table.c.team_1_name,
+            scoreboard_total_archive_table.c.team_2_name
+        ]),
+        AddFullText("user_name_search", [user_table.c.name]),
+        AddIndex("scoreboard_match_id", [scoreboard_table.c.match_id])
+    )
+]
+
+
+@contextmanager
+def migration_lock(engine: Engine) -> Iterator[None]:
+    """Held while migrating, so processes starting at once
+    apply each migration once.
+
+    Notes
+    -----
+    Held by its own connection, migrations switching theirs
+    to autocommit don't release it. SQLite isn't locked.
+    """
+
+    with engine.connect() as connection:
+        if connection.dialect.name == "mysql":
+            if connection.execute(
+                    text("SELECT GET_LOCK(:name, :timeout)"),
+                    name=LOCK_NAME, timeout=LOCK_TIMEOUT).scalar() != 1:
+                raise TimeoutError("Migration lock not acquired")
+
+            try:
+                yield
+            finally:
+                connection.execute(
+                    text("SELECT RELEASE_LOCK(:name)"), name=LOCK_NAME
+                )
+        elif connection.dialect.name == "postgresql":
+            connection.execute(
+                text("SELECT pg_advisory_lock(:key)"), key=LOCK_KEY
+            )
+
+            try:
+                yield
+            finally:
+                connection.execute(
+                    text("SELECT pg_advisory_unlock(:key)"), key=LOCK_KEY
+                )
+        else:
+            yield
+
+
+def migrate(database_url: str) -> List[Tuple[int, int, int]]:
+    """Creates missing tables & applies pending migrations.
+
+    Parameters
+    ----------
+    database_url : str
+
+    Returns
+    -------
+    List[Tuple[int, int, int]]
+        Versions applied.
+    """
+
+    engine = create_engine(database_url)
+
+    applied = []
+
+    with migration_lock(engine), engine.connect() as connection:
+        metadata.create_all(connection)
+
+        # Read once locked, another process may have just migrated.
+        versions = {
+            (row["major"], row["minor"], row["patch"])
+            for row in connection.execute(select([
+                update_table.c.major,
+                update_table.c.minor,
+                update_table.c.patch
+            ]))
+        }
+
+        for migration in MIGRATIONS:
+            if migration.version in versions:
+                continue
+
+            logger.info("Migrating to %d.%d.%d, %s",
+                        *migration.version, migration.message)
+
+            # Reflected per migration as the last one changed the schema.
+            inspector = inspect(connection)
+            for operation in migration.operations:
+                operation.apply(connection, inspector)
+
+            major, minor, patch = migration.version
+            connection.execute(update_table.insert().values(
+                major=major,
+                minor=minor,
+                patch=patch,
+                message=migration.message
+            ))
+
+            applied.append(migration.version)
+
+    engine.dispose()
+
+    return applied
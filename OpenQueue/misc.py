@@ -35,23 +35,23 @@ async def cache_events() -> None:
     """Stores events into database.
     """
 
-    raw = await Sessions.database.fetch_all(event_table.select())
-    if raw:
-        event_ids = [
-            event["event_id"] for event in raw
-        ]
-    else:
-        event_ids = []
-
-    # Isn't coded to be optimal.
-    for event_type, event_id in WEBHOOK_EVENTS.items():
-        if event_id not in event_ids:
-            await Sessions.database.execute(
-                event_table.insert().values(
-                    event_id=event_id,
-                    event_type=event_type
-                )
-            )
+    event_ids = {
+        event["event_id"] for event in
+        await Sessions.database.fetch_all(
+            select([event_table.c.event_id]).select_from(event_table)
+        )
+    }
+
+    missing = [
+        {"event_id": event_id, "event_type": event_type}
+        for event_type, event_id in WEBHOOK_EVENTS.items()
+        if event_id not in event_ids
+    ]
+
+    if missing:
+        await Sessions.database.execute(
+            event_table.insert().values(missing)
+        )
 
 
 async def leagues(league: Type["League"], user_id: str = None,
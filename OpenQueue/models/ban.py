@@ -1,12 +1,16 @@
 # -*- coding: utf-8 -*-
 
 from datetime import datetime
-from typing import Dict, Union
+from typing import Dict, List, Union
 
-from .base import ApiSchema
+from .base import CachedApiSchema
 
 
-class BanModel(ApiSchema):
+class BanModel(CachedApiSchema):
+    __slots__ = ("ban_id", "user_id", "global_", "reason", "timestamp",
+                 "expires", "revoked", "banner_id", "is_expired",
+                 "league_id")
+
     def __init__(self, ban_id: str, user_id: str,
                  global_: bool, reason: str,
                  timestamp: datetime, expires: datetime,
@@ -20,7 +24,9 @@ class BanModel(ApiSchema):
         self.expires = expires
         self.revoked = revoked
         self.banner_id = banner_id
-        self.is_expired = datetime.now() >= self.expires or self.revoked
+        self.is_expired = (
+            self.expires is not None and datetime.now() >= self.expires
+        ) or self.revoked
         self.league_id = league_id
 
     def api_schema(self, public: bool = True
@@ -44,7 +50,7 @@ class BanModel(ApiSchema):
             "global": self.global_,
             "reason": self.reason,
             "timestamp": self.timestamp.timestamp(),
-            "expires": self.expires.timestamp(),
+            "expires": self.expires.timestamp() if self.expires else None,
             "revoked": self.revoked,
             "is_expired": self.is_expired
         }
@@ -55,7 +61,9 @@ class BanModel(ApiSchema):
         return schema
 
 
-class BanRevokedModel(ApiSchema):
+class BanRevokedModel(CachedApiSchema):
+    __slots__ = ("user_id", "ban_id", "revoked", "league_id")
+
     def __init__(self, user_id: str, ban_id: str, revoked: bool,
                  league_id: str = None) -> None:
         self.user_id = user_id
@@ -83,3 +91,36 @@ class BanRevokedModel(ApiSchema):
             "ban_id": self.ban_id,
             "revoked": self.revoked
         }
+
+
+class BansModel(CachedApiSchema):
+    __slots__ = ("bans",)
+
+    def __init__(self, bans: List[Union[BanModel, BanRevokedModel]]
+                 ) -> None:
+        """Holds a batch of bans.
+
+        Parameters
+        ----------
+        bans : List[Union[BanModel, BanRevokedModel]]
+        """
+
+        self.bans = bans
+
+    def api_schema(self, public: bool = True
+                   ) -> Dict[str, List[Dict[str, Union[str, int, None]]]]:
+        """Used to get API schema.
+
+        Parameters
+        ----------
+        public : bool, optional
+            by default True
+
+        Returns
+        -------
+        Dict[str, List[Dict[str, Union[str, int, None]]]]
+        """
+
+        return {
+            "bans": [ban.api_schema(public) for ban in self.bans]
+        }
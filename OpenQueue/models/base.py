@@ -2,42 +2,167 @@
 
 # Base objects to use for other modes.
 
+# Models are created per row, so every model declares __slots__.
+# Bases mixed with other slotted bases leave theirs empty &
+# the models using them declare the attributes.
 
-from typing import Callable, Dict, Union
+
+from functools import wraps
+from typing import Any, Callable, Dict, Mapping, Union
+
+from ..resources import Config
+
+
+Schema = Dict[str, Union[str, float, int, bool, list, dict, None]]
+
+
+def pfp_prefix() -> str:
+    """URL of the profile pictures, prefixes user_id + extension.
+    """
+
+    return "{}{}/".format(Config.b2.cdn_url, Config.pfp.pathway)
+
+
+def pfp_url(user_id: str, pfp_extension: Union[str, None]
+            ) -> Union[str, None]:
+    return pfp_prefix() + user_id + pfp_extension if pfp_extension else None
+
+
+def kill_death_ratio(kills: int, deaths: int) -> float:
+    return (
+        round(kills / deaths, 2)
+        if kills > 0 and deaths > 0 else 0.00
+    )
+
+
+def headshot_percentage(kills: int, headshots: int) -> float:
+    return (
+        round((headshots / kills) * 100, 2)
+        if kills > 0 and headshots > 0 else 0.00
+    )
+
+
+def cached_schema(func: Callable[[Any, bool], Schema]
+                  ) -> Callable[[Any, bool], Schema]:
+    """Memoizes the public & private schema of a model.
+
+    Parameters
+    ----------
+    func : Callable[[Any, bool], Schema]
+        api_schema of a model.
+
+    Returns
+    -------
+    Callable[[Any, bool], Schema]
+
+    Notes
+    -----
+    Only the model's own api_schema is cached, calls through
+    super() or a base build a new schema, as models add to
+    the schema of their bases.
+    """
+
+    @wraps(func)
+    def api_schema(self: "CachedApiSchema", public: bool = True
+                   ) -> Schema:
+        if type(self).api_schema is not api_schema:
+            return func(self, public)
+
+        try:
+            cache = self._schema_cache
+        except AttributeError:
+            # Set on first use, so building a model costs nothing.
+            cache = self._schema_cache = {}
+        else:
+            if public in cache:
+                return cache[public]
+
+        schema = cache[public] = func(self, public)
+
+        return schema
+
+    return api_schema
 
 
 class ApiSchema:
-    api_schema: Callable[
-        [bool],
-        Dict[str, Union[str, float, int, bool, list, dict, None]]
-    ]
+    __slots__ = ()
+
+    api_schema: Callable[[bool], Schema]
+
+    @classmethod
+    def row_schema(cls, row: Mapping[str, Any], public: bool = True
+                   ) -> Schema:
+        """Used to get the API schema of a row, models listed
+        through ColumnarResult build it from the row without
+        building the model.
+
+        Parameters
+        ----------
+        row : Mapping[str, Any]
+        public : bool, optional
+            If public safe data should only be shown, by default True
+
+        Returns
+        -------
+        Schema
+        """
+
+        return cls(**row).api_schema(public)
+
+
+class CachedApiSchema(ApiSchema):
+    """Models are treated as immutable, api_schema is computed once
+    per public & private and the same dict is returned after.
+    Code changing a model after building it must call invalidate,
+    schemas returned must not be changed in place.
+
+    Models only built while getting the schema of another model
+    use ApiSchema.
+    """
+
+    __slots__ = ("_schema_cache",)
+
+    def __init_subclass__(cls, **kwargs) -> None:
+        super().__init_subclass__(**kwargs)
+
+        if "api_schema" in cls.__dict__:
+            cls.api_schema = cached_schema(cls.__dict__["api_schema"])
+
+    def invalidate(self) -> None:
+        """Used to clear the cached schemas after changing the model.
+        """
+
+        try:
+            del self._schema_cache
+        except AttributeError:
+            pass
 
 
 class KdrMethod:
+    __slots__ = ()
+
     kills: int
     deaths: int
 
     @property
     def kdr(self) -> float:
-        return (
-            round(self.kills / self.deaths, 2)
-            if self.kills > 0 and self.deaths > 0 else 0.00
-        )
+        return kill_death_ratio(self.kills, self.deaths)
 
 
 class HsPercentageMethod:
+    __slots__ = ()
+
     kills: int
     headshots: int
 
     @property
     def hs_percentage(self) -> float:
-        return (
-            round((self.headshots / self.kills) * 100, 2)
-            if self.kills > 0 and self.headshots > 0 else 0.00
-        )
+        return headshot_percentage(self.kills, self.headshots)
 
 
 class HitPercentageMethod:
+    __slots__ = ()
+
     shots_hit: int
     shots_fired: int
 
@@ -51,6 +176,11 @@ class HitPercentageMethod:
 
 class _DepthStatsModel(KdrMethod, HsPercentageMethod,
                        HitPercentageMethod, ApiSchema):
+    __slots__ = ()
+
+    # Declared by the models using it.
+    DEPTH_STATS = ("kills", "deaths", "headshots", "shots_hit", "shots_fired")
+
     def __init__(self, kills: int, deaths: int,
                  headshots: int, shots_hit: int,
                  shots_fired: int,
@@ -0,0 +1,178 @@
+# -*- coding: utf-8 -*-
+
+from typing import (
+    Any, Dict, Generic, Iterator, List, Mapping, Type, TypeVar
+)
+from sqlalchemy.sql import Select
+
+from ..resources import Sessions
+
+from .base import ApiSchema, Schema
+
+
+Model = TypeVar("Model", bound=ApiSchema)
+
+
+class RowView(Mapping, Generic[Model]):
+    __slots__ = ("result", "index")
+
+    def __init__(self, result: "ColumnarResult[Model]", index: int) -> None:
+        """A row of a ColumnarResult, read from its columns
+        when accessed.
+
+        Parameters
+        ----------
+        result : ColumnarResult
+        index : int
+        """
+
+        self.result = result
+        self.index = index
+
+    def __getitem__(self, key: str) -> Any:
+        return self.result.columns[key][self.index]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.result.columns)
+
+    def __len__(self) -> int:
+        return len(self.result.columns)
+
+    def model(self) -> Model:
+        """Used to build the model of the row.
+
+        Returns
+        -------
+        Model
+        """
+
+        return self.result.model(**self)
+
+
+class ColumnarResult(Generic[Model]):
+    __slots__ = ("model", "columns", "__length")
+
+    def __init__(self, model: Type[Model],
+                 columns: Dict[str, List[Any]] = None) -> None:
+        """Rows of a listing stored as a list per column, models
+        are only built for rows what are accessed.
+
+        Parameters
+        ----------
+        model : Type[Model]
+            Model a row is passed to.
+        columns : Dict[str, List[Any]], optional
+            Lists of the same length, by default None
+        """
+
+        self.model = model
+        self.columns = columns or {}
+        self.__length = len(next(iter(self.columns.values()), ()))
+
+    @classmethod
+    async def fetch(cls, model: Type[Model], query: Select,
+                    replica: bool = False) -> "ColumnarResult[Model]":
+        """Used to read the rows of a query into columns.
+
+        Parameters
+        ----------
+        model : Type[Model]
+        query : Select
+        replica : bool, optional
+            If the query can be read from a replica, by default False
+
+        Returns
+        -------
+        ColumnarResult[Model]
+        """
+
+        result = cls(model)
+
+        async for row in Sessions.database.iterate(query, replica=replica):
+            result.append(row)
+
+        return result
+
+    def append(self, row: Mapping[str, Any]) -> None:
+        """Used to add a row.
+
+        Parameters
+        ----------
+        row : Mapping[str, Any]
+        """
+
+        if not self.columns:
+            self.columns = {key: [] for key in row.keys()}
+
+        for key, column in self.columns.items():
+            column.append(row[key])
+
+        self.__length += 1
+
+    def __len__(self) -> int:
+        return self.__length
+
+    def __getitem__(self, index: int) -> RowView[Model]:
+        if index < 0:
+            index += self.__length
+        if not 0 <= index < self.__length:
+            raise IndexError("Row out of range")
+
+        return RowView(self, index)
+
+    def __iter__(self) -> Iterator[RowView[Model]]:
+        for index in range(self.__length):
+            yield RowView(self, index)
+
+    def column(self, name: str) -> List[Any]:
+        """Used to get every value of a column.
+
+        Parameters
+        ----------
+        name : str
+
+        Returns
+        -------
+        List[Any]
+        """
+
+        return self.columns[name]
+
+    def schemas(self, public: bool = True) -> Iterator[Schema]:
+        """Used to get the API schema of each row in turn.
+
+        Parameters
+        ----------
+        public : bool, optional
+            If public safe data should only be shown, by default True
+
+        Yields
+        ------
+        Schema
+
+        Notes
+        -----
+        Built from the columns by the model's row_schema, so no
+        model is built per row.
+        """
+
+        row_schema = self.model.row_schema
+        names = list(self.columns)
+
+        for values in zip(*self.columns.values()):
+            yield row_schema(dict(zip(names, values)), public)
+
+    def api_schema(self, public: bool = True) -> List[Schema]:
+        """Used to get the API schema of every row.
+
+        Parameters
+        ----------
+        public : bool, optional
+            If public safe data should only be shown, by default True
+
+        Returns
+        -------
+        List[Schema]
+        """
+
+        return list(self.schemas(public))
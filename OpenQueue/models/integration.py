@@ -1,8 +1,10 @@
-from typing import Dict, Union
-from .base import ApiSchema
+from typing import Any, Dict, Mapping, Union
+from .base import CachedApiSchema
 
 
-class IntegrationModel(ApiSchema):
+class IntegrationModel(CachedApiSchema):
+    __slots__ = ("name", "logo", "auth_url", "globally_required")
+
     def __init__(self, name: str, logo: str, auth_url: Union[str, None],
                  globally_required: bool) -> None:
         self.name = name
@@ -18,3 +20,13 @@ class IntegrationModel(ApiSchema):
             "auth_url": self.auth_url,
             "globally_required": self.globally_required
         }
+
+    @classmethod
+    def row_schema(cls, row: Mapping[str, Any], public: bool = True
+                   ) -> Dict[str, Union[str, bool, None]]:
+        return {
+            "name": row["name"],
+            "logo": row["logo"],
+            "auth_url": row["auth_url"],
+            "globally_required": row["globally_required"]
+        }
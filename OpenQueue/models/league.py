@@ -3,10 +3,18 @@
 from typing import Dict, Union
 from datetime import datetime
 
-from .base import ApiSchema
+from .base import CachedApiSchema
 
 
-class LeagueModel(ApiSchema):
+class LeagueModel(CachedApiSchema):
+    __slots__ = ("league_id", "league_name", "user_id", "kill", "death",
+                 "round_won", "round_lost", "match_won", "match_lost",
+                 "assist", "headshot", "score", "mate_blinded",
+                 "mate_killed", "timestamp", "disabled", "banned",
+                 "allow_api_access", "dathost_id", "email", "region",
+                 "webhooks", "tickrate", "demo_tickrate",
+                 "archive_horizon")
+
     def __init__(self, league_id: str, league_name: str,
                  kill: float,
                  death: float, round_won: float,
@@ -22,7 +30,8 @@ class LeagueModel(ApiSchema):
                  email: str,
                  region: str,
                  tickrate: int, demo_tickrate: int,
-                 webhooks: Dict[str, str] = None) -> None:
+                 webhooks: Dict[str, str] = None,
+                 archive_horizon: int = None) -> None:
 
         self.league_id = league_id
         self.league_name = league_name
@@ -48,6 +57,7 @@ class LeagueModel(ApiSchema):
         self.webhooks = webhooks
         self.tickrate = tickrate
         self.demo_tickrate = demo_tickrate
+        self.archive_horizon = archive_horizon
 
     def api_schema(self, public: bool = True
                    ) -> Dict[str, Union[str, int, float, dict, list, None]]:
@@ -88,6 +98,7 @@ class LeagueModel(ApiSchema):
 
         return {
             "webhooks": self.webhooks,
+            "archive_horizon": self.archive_horizon,
             "elo": {
                 "kill": self.kill,
                 "death": self.death,
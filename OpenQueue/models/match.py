@@ -2,11 +2,15 @@
 
 
 from datetime import datetime
-from typing import Dict, Generator, List, Union, cast, TypedDict
+from typing import (
+    Any, Dict, Generator, List, Mapping, Union, cast, TypedDict
+)
 
 from ..resources import Config
 
-from .base import _DepthStatsModel, ApiSchema
+from .base import (
+    _DepthStatsModel, ApiSchema, CachedApiSchema, pfp_prefix, pfp_url
+)
 
 
 class MatchLive:
@@ -120,7 +124,9 @@ class MatchTyping(TypedDict):
     league_id: str
 
 
-class DemoModel(ApiSchema):
+class DemoModel(CachedApiSchema):
+    __slots__ = ("match_id", "league_id", "demo_status", "demo_url")
+
     def __init__(self, match_id: str, league_id: str,
                  demo_status: Union[
                      int, DemoNo, DemoReady, DemoTooLarge,
@@ -164,14 +170,14 @@ class DemoModel(ApiSchema):
 
 
 class _MatchPlayerModel(ApiSchema):
+    __slots__ = ("name", "user_id", "team", "pfp")
+
     def __init__(self, name: str, user_id: str,
                  team: int, pfp_extension: str = None) -> None:
         self.name = name
         self.user_id = user_id
         self.team = TEAMS[team] if isinstance(team, int) else team
-        self.pfp = "{}{}/{}{}".format(
-            Config.b2.cdn_url, Config.pfp.pathway, user_id, pfp_extension
-        ) if pfp_extension else None
+        self.pfp = pfp_url(user_id, pfp_extension)
 
     def api_schema(self, public: bool = True
                    ) -> Dict[str, Union[str, dict, int, None]]:
@@ -186,6 +192,11 @@ class _MatchPlayerModel(ApiSchema):
 
 
 class _MatchBaseModel(DemoModel, ApiSchema):
+    __slots__ = ("b2_id", "timestamp", "status", "server_id", "map",
+                 "team_1_name", "team_2_name", "team_1_score",
+                 "team_2_score", "team_1_side", "team_2_side",
+                 "raw_ip", "game_port")
+
     def __init__(self, timestamp: datetime,
                  status: Union[int, MatchLive, MatchFinished, MatchProcessing],
                  server_id: str, map: str, team_1_name: str, team_2_name: str,
@@ -269,6 +280,10 @@ class _MatchBaseModel(DemoModel, ApiSchema):
 
 
 class MatchModel(_MatchBaseModel, ApiSchema):
+    __slots__ = ("capt_team_1_user_id", "capt_team_1_pfp",
+                 "capt_team_2_user_id", "capt_team_2_pfp", "__user_ids",
+                 "__user_pfp_extensions", "__user_names", "__user_teams")
+
     def __init__(self, capt_team_1_user_id: str,
                  capt_team_1_pfp_extension: str,
                  capt_team_2_user_id: str,
@@ -278,14 +293,12 @@ class MatchModel(_MatchBaseModel, ApiSchema):
         super().__init__(*args, **kwargs)
 
         self.capt_team_1_user_id = capt_team_1_user_id
-        self.capt_team_1_pfp = "{}{}/{}{}".format(
-            Config.b2.cdn_url, Config.pfp.pathway,
+        self.capt_team_1_pfp = pfp_url(
             capt_team_1_user_id, capt_team_1_pfp_extension
-        ) if capt_team_1_pfp_extension else None
-        self.capt_team_2_pfp = "{}{}/{}{}".format(
-            Config.b2.cdn_url, Config.pfp.pathway,
+        )
+        self.capt_team_2_pfp = pfp_url(
             capt_team_2_user_id, capt_team_2_pfp_extension
-        ) if capt_team_2_pfp_extension else None
+        )
         self.capt_team_2_user_id = capt_team_2_user_id
         self.__user_ids = user_ids
         self.__user_pfp_extensions = user_pfp_extensions
@@ -347,8 +360,104 @@ class MatchModel(_MatchBaseModel, ApiSchema):
 
         return schema
 
+    @classmethod
+    def row_schema(cls, row: Mapping[str, Any], public: bool = True
+                   ) -> Dict[str, Union[dict, str, int, None]]:
+        """Used to get the API schema of a match listing row
+        without building the model.
+
+        Parameters
+        ----------
+        row : Mapping[str, Any]
+        public : bool, optional
+            If public safe data should only be shown, by default True
+
+        Returns
+        -------
+        Dict[str, Union[dict, str, int, None]]
+        """
+
+        match_id = row["match_id"]
+        ip_port = "{}:{}".format(row["raw_ip"], row["game_port"])
+        pfp = pfp_prefix()
+        team_one = TEAMS.index(TeamOne)
+
+        team_1_players = []
+        team_2_players = []
+        for user_id, name, team, pfp_extension in zip(
+                row["user_ids"].split(","), row["user_names"].split(","),
+                row["user_teams"].split(","),
+                row["user_pfp_extensions"].split(",")):
+            team = int(team)
+
+            (team_1_players if team == team_one
+             else team_2_players).append({
+                 "name": name,
+                 "identifiers": {
+                     "user": user_id
+                 },
+                 "team": team,
+                 "pfp": pfp + user_id + pfp_extension
+                 if pfp_extension else None
+             })
+
+        schema = {
+            "match_id": match_id,
+            "league_id": row["league_id"],
+            "demo": {
+                "status": row["demo_status"],
+                "url": "{}/{}".format(
+                    Config.demo.pathway,
+                    match_id + Config.demo.compressed_extension
+                ) if DEMO_STATUS_CODE[row["demo_status"]] == DemoReady
+                else None
+            },
+            "timestamp": row["timestamp"].timestamp(),
+            "status": row["status"],
+            "map": row["map"],
+            "connect": {
+                "ip": row["raw_ip"],
+                "port": row["game_port"],
+                "ip_port": ip_port,
+                "console": "connect " + ip_port,
+                "browser_protocol": "steam://connect/" + ip_port
+            },
+            "team_1": {
+                "name": row["team_1_name"],
+                "score": row["team_1_score"],
+                "side": row["team_1_side"],
+                "players": team_1_players,
+                "captain_id": row["capt_team_1_user_id"],
+                "pfp": pfp_url(
+                    row["capt_team_1_user_id"],
+                    row["capt_team_1_pfp_extension"]
+                )
+            },
+            "team_2": {
+                "name": row["team_2_name"],
+                "score": row["team_2_score"],
+                "side": row["team_2_side"],
+                "players": team_2_players,
+                "captain_id": row["capt_team_2_user_id"],
+                "pfp": pfp_url(
+                    row["capt_team_2_user_id"],
+                    row["capt_team_2_pfp_extension"]
+                )
+            }
+        }
+
+        if not public:
+            schema["b2_id"] = row["b2_id"]
+            schema["server_id"] = row["server_id"]
+
+        return schema
+
 
 class _ScoreboardPlayerModel(_DepthStatsModel, _MatchPlayerModel, ApiSchema):
+    __slots__ = ("steam_id", "discord_id", "alive", "ping", "assists",
+                 "mvps", "score", "disconnected", "timestamp",
+                 *_DepthStatsModel.DEPTH_STATS)
+
     def __init__(self, discord_id: int, steam_id: str,
                  alive: bool, ping: int,
                  kills: int, headshots: int,
@@ -403,6 +512,8 @@ class _ScoreboardPlayerModel(_DepthStatsModel, _MatchPlayerModel, ApiSchema):
 
 
 class ScoreboardModel(_MatchBaseModel, ApiSchema):
+    __slots__ = ("__team_1", "__team_2")
+
     def __init__(self, team_1: List[TeamTyping],
                  team_2: List[TeamTyping], match: MatchTyping) -> None:
         super().__init__(**match)
@@ -1,13 +1,19 @@
 # -*- coding: utf-8 -*-
 
 from typing import Dict, List, Union
+from datetime import datetime
 
-from .base import ApiSchema
+from .base import CachedApiSchema
 
 
-class QueueModel(ApiSchema):
+class QueueModel(CachedApiSchema):
+    __slots__ = ("queue_id", "waiting", "map", "ready", "backfill",
+                 "ready_deadline")
+
     def __init__(self, queue_id: str, waiting: List[str],
-                 map: Union[str, None]) -> None:
+                 map: Union[str, None], ready: List[str] = None,
+                 backfill: List[str] = None,
+                 ready_deadline: Union[datetime, None] = None) -> None:
         """Queue Model.
 
         Parameters
@@ -17,14 +23,25 @@ class QueueModel(ApiSchema):
         waiting : List[str]
             List of user IDs.
         map : Union[str, None]
+        ready : List[str], optional
+            List of user IDs what accepted the ready check,
+            by default None
+        backfill : List[str], optional
+            List of user IDs waiting for a free slot,
+            by default None
+        ready_deadline : Union[datetime, None], optional
+            by default None
         """
 
         self.queue_id = queue_id
         self.waiting = waiting
         self.map = map
+        self.ready = ready if ready is not None else []
+        self.backfill = backfill if backfill is not None else []
+        self.ready_deadline = ready_deadline
 
     def api_schema(self, public: bool = True
-                   ) -> Dict[str, Union[str, List[str], None]]:
+                   ) -> Dict[str, Union[str, float, List[str], None]]:
         """Used to get a model's API schema.
 
         Parameters
@@ -34,11 +51,17 @@ class QueueModel(ApiSchema):
 
         Returns
         -------
-        Dict[str, Union[str, List[str]]]
+        Dict[str, Union[str, float, List[str], None]]
         """
 
         return {
             "queue_id": self.queue_id,
             "waiting": self.waiting,
-            "map": self.map
+            "map": self.map,
+            "ready": self.ready,
+            "backfill": self.backfill,
+            "ready_deadline": (
+                self.ready_deadline.timestamp()
+                if self.ready_deadline else None
+            )
         }
@@ -1,11 +1,12 @@
 # -*- coding: utf-8 -*-
 
-from typing import Dict, Generator, TypedDict, Union, List, cast
+from typing import Any, Dict, Generator, Mapping, TypedDict, Union, List, cast
 from datetime import datetime
 
-from ..resources import Config
-
-from .base import HsPercentageMethod, KdrMethod, _DepthStatsModel, ApiSchema
+from .base import (
+    HsPercentageMethod, KdrMethod, _DepthStatsModel, ApiSchema,
+    CachedApiSchema, pfp_url, kill_death_ratio, headshot_percentage
+)
 
 
 class UserMapTying(TypedDict):
@@ -18,6 +19,8 @@ class UserMapTying(TypedDict):
 
 
 class UserMapModel(ApiSchema):
+    __slots__ = ("map", "wins", "losses", "ties", "kills", "deaths")
+
     def __init__(self, map: str, wins: int, losses: int, ties: int,
                  kills: int, deaths: int) -> None:
 
@@ -70,7 +73,10 @@ class UserMapModel(ApiSchema):
         }
 
 
-class UserBaseModel(ApiSchema):
+class UserBaseModel(CachedApiSchema):
+    __slots__ = ("steam_id", "user_id", "discord_id", "timestamp", "name",
+                 "pfp")
+
     def __init__(self, name: str, user_id: str,
                  timestamp: datetime,
                  pfp_extension: Union[str, None] = None,
@@ -88,9 +94,7 @@ class UserBaseModel(ApiSchema):
         self.discord_id = discord_id
         self.timestamp = timestamp
         self.name = name
-        self.pfp = "{}{}/{}{}".format(
-            Config.b2.cdn_url, Config.pfp.pathway, user_id, pfp_extension
-        ) if pfp_extension else None
+        self.pfp = pfp_url(user_id, pfp_extension)
 
     def api_schema(self, public: bool = True
                    ) -> Dict[str, Union[str, float, dict]]:
@@ -121,6 +125,8 @@ class UserBaseModel(ApiSchema):
 
 
 class UserModel(UserBaseModel, ApiSchema):
+    __slots__ = ("dathost_id", "email", "email_confirmed", "league_ids")
+
     def __init__(self, email: str, email_confirmed: bool,
                  league_ids: Union[str, List[str]] = [],
                  dathost_id: Union[str, None] = None,
@@ -167,6 +173,8 @@ class UserModel(UserBaseModel, ApiSchema):
 
 class UserOverviewModel(UserBaseModel, KdrMethod,
                         HsPercentageMethod, ApiSchema):
+    __slots__ = ("kills", "deaths", "headshots", "matches", "elo")
+
     def __init__(self, kills: int, deaths: int,
                  headshots: int, matches: int, elo: int,
                  *args, **kwargs) -> None:
@@ -193,8 +201,51 @@ class UserOverviewModel(UserBaseModel, KdrMethod,
             }
         }
 
+    @classmethod
+    def row_schema(cls, row: Mapping[str, Any], public: bool = True
+                   ) -> Dict[str, Union[str, float, dict, list]]:
+        """Used to get the API schema of a player listing row
+        without building the model.
+
+        Parameters
+        ----------
+        row : Mapping[str, Any]
+        public : bool, optional
+            by default True
+
+        Returns
+        -------
+        Dict[str, Union[str, float, dict, list]]
+        """
+
+        kills = row["kills"]
+
+        return {
+            "name": row["name"],
+            "pfp": pfp_url(row["user_id"], row["pfp_extension"]),
+            "identifiers": {
+                "discord": str(row["discord_id"])
+                if row["discord_id"] else None,
+                "steam": row["steam_id"],
+                "user": row["user_id"]
+            },
+            "timestamp": row["timestamp"].timestamp(),
+            "matches": row["matches"],
+            "statistics": {
+                "kills": kills,
+                "deaths": row["deaths"],
+                "headshots": row["headshots"],
+                "elo": row["elo"],
+                "kdr": kill_death_ratio(kills, row["deaths"]),
+                "hs_percentage": headshot_percentage(kills, row["headshots"])
+            }
+        }
+
 
 class StatisticModel(UserBaseModel, _DepthStatsModel, ApiSchema):
+    __slots__ = ("league_id", "elo", "assists", "mvps", "__maps",
+                 *_DepthStatsModel.DEPTH_STATS)
+
     def __init__(self, league_id: str, elo: float,
                  assists: int, mvps: int,
                  maps: List[UserMapTying],
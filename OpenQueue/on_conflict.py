@@ -1,8 +1,6 @@
 # -*- coding: utf-8 -*-
 
 from typing import Any
-from sqlalchemy.dialects.mysql import insert as mysql_insert
-from sqlalchemy.dialects.postgresql import insert as postgresql_insert
 
 from .tables import scoreboard_table, statistic_table
 from .resources import Config
@@ -12,7 +10,10 @@ def on_scoreboard_conflict() -> Any:
     """Used for updating a player on a scoreboard on conflict.
     """
 
+    # Only the configured engine's dialect is imported.
     if Config.database.engine == "mysql":
+        from sqlalchemy.dialects.mysql import insert as mysql_insert
+
         query_insert = mysql_insert(scoreboard_table)
         return query_insert.on_duplicate_key_update(
             captain=scoreboard_table.c.captain,
@@ -33,6 +34,8 @@ def on_scoreboard_conflict() -> Any:
             disconnected=query_insert.inserted.disconnected
         )
     elif Config.database.engine == "psycopg2":
+        from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+
         query_insert = postgresql_insert(scoreboard_table)
         return query_insert.on_conflict_do_update(
             set_=dict(
@@ -64,7 +67,10 @@ def on_statistic_conflict() -> Any:
     """Used for updating a statistics on conflict.
     """
 
+    # Only the configured engine's dialect is imported.
     if Config.database.engine == "mysql":
+        from sqlalchemy.dialects.mysql import insert as mysql_insert
+
         query_insert = mysql_insert(statistic_table)
         return query_insert.on_duplicate_key_update(
             kills=statistic_table.c.kills + query_insert.inserted.kills,
@@ -80,6 +86,8 @@ def on_statistic_conflict() -> Any:
             elo=statistic_table.c.elo + query_insert.inserted.elo
         )
     elif Config.database.engine == "psycopg2":
+        from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+
         query_insert = postgresql_insert(statistic_table)
         return query_insert.on_conflict_do_update(
             set_=dict(
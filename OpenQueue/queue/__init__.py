@@ -1,13 +1,15 @@
 # -*- coding: utf-8 -*-
 
 from asyncio import iscoroutinefunction
+from datetime import datetime, timedelta
 
 from ..misc import str_uuid4
 from ..user import User
 from ..exceptions import (
     InvalidUser,
     UserAlreadyInQueue,
-    QueueFull
+    QueueFull,
+    NotInReadyCheck
 )
 from ..resources import QueueGlobal, Sessions
 
@@ -17,17 +19,35 @@ from ..models.queue import QueueModel
 class Queue:
     """Used to handle the queue of a match, does NOT
        handle match creation.
+
+    Notes
+    -----
+    Once the queue is full a ready check is started, on_queue_full
+    is only called after every player has accepted. Players who
+    don't accept before the deadline are dropped & replaced
+    with players from the backfill.
     """
 
-    def __init__(self, capacity: int = 10) -> None:
+    def __init__(self, capacity: int = 10, ready_timeout: float = 30.0,
+                 backfill_capacity: int = None) -> None:
         self.queue_id = str_uuid4()
         self.waiting = []
+        self.ready = []
+        self.backfill = []
         self.map = None
+        self.ready_deadline = None
 
         self.capacity = capacity
+        self.ready_timeout = ready_timeout
+        self.backfill_capacity = (
+            backfill_capacity if backfill_capacity is not None else capacity
+        )
+
+        self.__timer = None
 
     def get(self) -> QueueModel:
-        return QueueModel(self.queue_id, self.waiting, self.map)
+        return QueueModel(self.queue_id, self.waiting, self.map,
+                          self.ready, self.backfill, self.ready_deadline)
 
     async def select_map(self, map: str) -> None:
         """Used to set map
@@ -40,10 +60,11 @@ class Queue:
         self.map = map
 
         await Sessions.scheduler.spawn(
-            self._call_events(QueueGlobal.on_map_select)
+            self._call_events(QueueGlobal.on_map_select),
+            "queue"
         )
 
-    async def _call_events(self, list_: list) -> None:
+    async def _call_events(self, list_: list, **kwargs) -> None:
         """Used to call on queue full events.
         """
 
@@ -51,13 +72,17 @@ class Queue:
 
         for func in list_:
             if iscoroutinefunction(func):
-                await func(queue=get)
+                await func(queue=get, **kwargs)
             else:
-                func(queue=get)
+                func(queue=get, **kwargs)
 
     async def join(self, user: User) -> None:
         """Used to enter a user into a queue.
 
+        Notes
+        -----
+        If the queue is full the user is placed into the backfill.
+
         Parameters
         ----------
         user : User
@@ -69,31 +94,133 @@ class Queue:
         InvalidUser
         """
 
-        if user.user_id in self.waiting:
+        if user.user_id in self.waiting or user.user_id in self.backfill:
             raise UserAlreadyInQueue()
 
-        waiting_len = len(self.waiting)
-
-        if waiting_len == self.capacity:
+        if (len(self.waiting) == self.capacity and
+                len(self.backfill) == self.backfill_capacity):
             raise QueueFull()
 
         if not await user.exists():
             raise InvalidUser()
 
-        self.waiting.append(user.user_id)
+        if len(self.waiting) == self.capacity:
+            self.backfill.append(user.user_id)
+        else:
+            self.waiting.append(user.user_id)
+
+            if len(self.waiting) == self.capacity:
+                await self.__start_ready_check()
+
+    async def accept(self, user: User) -> None:
+        """Used to accept the ready check.
+
+        Parameters
+        ----------
+        user : User
+
+        Raises
+        ------
+        NotInReadyCheck
+        """
+
+        if not self.ready_deadline or user.user_id not in self.waiting:
+            raise NotInReadyCheck()
+
+        if user.user_id in self.ready:
+            return
+
+        self.ready.append(user.user_id)
+
+        if len(self.ready) == self.capacity:
+            self.__cancel_timer()
+            self.ready_deadline = None
 
-        if waiting_len + 1 == self.capacity:
             await Sessions.scheduler.spawn(
-                self._call_events(QueueGlobal.on_queue_full)
+                self._call_events(QueueGlobal.on_queue_full),
+                "queue"
             )
 
-    def leave(self, user: User) -> None:
+    async def leave(self, user: User) -> None:
         """Used to remove a player in queue.
 
+        Notes
+        -----
+        If a ready check is active the dropped slot is backfilled.
+
         Parameters
         ----------
         user : User
         """
 
-        if user.user_id in self.waiting:
+        if user.user_id in self.backfill:
+            self.backfill.remove(user.user_id)
+        elif user.user_id in self.waiting:
             self.waiting.remove(user.user_id)
+
+            if user.user_id in self.ready:
+                self.ready.remove(user.user_id)
+
+            if self.ready_deadline:
+                await self.__refill()
+
+    def __cancel_timer(self) -> None:
+        if self.__timer:
+            self.__timer.cancel()
+            self.__timer = None
+
+    async def __start_ready_check(self) -> None:
+        """Starts a ready check with a fresh deadline, players who
+        already accepted stay accepted.
+        """
+
+        self.__cancel_timer()
+
+        self.ready_deadline = datetime.now() + timedelta(
+            seconds=self.ready_timeout
+        )
+        self.__timer = QueueGlobal.timer_wheel.schedule(
+            self.ready_timeout, self.__ready_timeout
+        )
+
+        await Sessions.scheduler.spawn(
+            self._call_events(QueueGlobal.on_ready_check),
+            "queue"
+        )
+
+    async def __refill(self) -> None:
+        """Moves players from the backfill into free slots.
+        """
+
+        while self.backfill and len(self.waiting) < self.capacity:
+            self.waiting.append(self.backfill.pop(0))
+
+        if len(self.waiting) == self.capacity:
+            await self.__start_ready_check()
+        else:
+            self.__cancel_timer()
+            self.ready_deadline = None
+            self.ready = []
+
+    async def __ready_timeout(self) -> None:
+        """Called by the timer wheel once the deadline passes.
+        """
+
+        self.__timer = None
+
+        dropped = [
+            user_id for user_id in self.waiting
+            if user_id not in self.ready
+        ]
+
+        # Ready players are put back into the queue.
+        self.waiting = list(self.ready)
+        self.ready = []
+        self.ready_deadline = None
+
+        await Sessions.scheduler.spawn(
+            self._call_events(QueueGlobal.on_ready_timeout, dropped=dropped),
+            "queue"
+        )
+
+        await self.__refill()
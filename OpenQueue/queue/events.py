@@ -4,7 +4,7 @@ from ..resources import QueueGlobal
 
 
 def on_queue_full():
-    """Called when queue is full.
+    """Called when queue is full & every player accepted.
     """
 
     def decorator(func):
@@ -21,3 +21,24 @@ def on_map_select():
         QueueGlobal.on_map_select.append(func)
 
     return decorator
+
+
+def on_ready_check():
+    """Called when queue is full & the ready check starts.
+    """
+
+    def decorator(func):
+        QueueGlobal.on_ready_check.append(func)
+
+    return decorator
+
+
+def on_ready_timeout():
+    """Called when players didn't accept the ready check in time,
+    dropped user IDs are passed as dropped.
+    """
+
+    def decorator(func):
+        QueueGlobal.on_ready_timeout.append(func)
+
+    return decorator
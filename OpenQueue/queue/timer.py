@@ -0,0 +1,183 @@
+# -*- coding: utf-8 -*-
+
+import asyncio
+
+from inspect import isawaitable
+from math import ceil
+from typing import Any, Callable, Dict, List, Set
+
+
+class TimerHandle:
+    def __init__(self, wheel: "TimerWheel", slot: int, rounds: int,
+                 callback: Callable[[], Any]) -> None:
+        """Handle of a scheduled timer.
+
+        Parameters
+        ----------
+        wheel : TimerWheel
+        slot : int
+        rounds : int
+            Full rotations left before the timer fires.
+        callback : Callable[[], Any]
+        """
+
+        self.wheel = wheel
+        self.slot = slot
+        self.rounds = rounds
+        self.callback = callback
+        self.cancelled = False
+
+    def cancel(self) -> None:
+        """Used to cancel the timer.
+        """
+
+        self.wheel.cancel(self)
+
+
+class TimerWheel:
+    def __init__(self, resolution: float = 1.0, slots: int = 60) -> None:
+        """Hashed timer wheel, one asyncio task drives every timer.
+
+        Parameters
+        ----------
+        resolution : float, optional
+            Seconds per tick, by default 1.0
+        slots : int, optional
+            by default 60
+        """
+
+        self.resolution = resolution
+
+        self.__buckets: List[Dict[int, TimerHandle]] = [
+            {} for _ in range(slots)
+        ]
+        self.__position = 0
+        self.__pending = 0
+        self.__task = None
+        # Awaitables returned by callbacks.
+        self.__callbacks: Set[asyncio.Future] = set()
+
+    def __len__(self) -> int:
+        return self.__pending
+
+    def schedule(self, delay: float, callback: Callable[[], Any]
+                 ) -> TimerHandle:
+        """Used to schedule a callback.
+
+        Notes
+        -----
+        If the callback returns a awaitable it's ran as a task,
+        so can't hold up other timers. Never fires before the
+        delay, but can fire up to one resolution after it.
+
+        Parameters
+        ----------
+        delay : float
+            Seconds until the callback is called.
+        callback : Callable[[], Any]
+
+        Returns
+        -------
+        TimerHandle
+        """
+
+        # The tick in progress is partly over, so isn't counted.
+        ticks = max(0, ceil(delay / self.resolution)) + 1
+        slots_len = len(self.__buckets)
+
+        handle = TimerHandle(
+            self,
+            (self.__position + ticks) % slots_len,
+            (ticks - 1) // slots_len,
+            callback
+        )
+
+        self.__buckets[handle.slot][id(handle)] = handle
+        self.__pending += 1
+
+        if not self.__task or self.__task.done():
+            self.__task = asyncio.ensure_future(self.__run())
+
+        return handle
+
+    def cancel(self, handle: TimerHandle) -> None:
+        """Used to cancel a timer.
+
+        Parameters
+        ----------
+        handle : TimerHandle
+        """
+
+        if handle.cancelled:
+            return
+
+        handle.cancelled = True
+
+        if self.__buckets[handle.slot].pop(id(handle), None):
+            self.__pending -= 1
+
+    def __tick(self) -> None:
+        self.__position = (self.__position + 1) % len(self.__buckets)
+        slot = self.__buckets[self.__position]
+
+        expired = []
+        for handle in slot.values():
+            if handle.rounds > 0:
+                handle.rounds -= 1
+            else:
+                expired.append(handle)
+
+        for handle in expired:
+            del slot[id(handle)]
+            self.__pending -= 1
+            handle.cancelled = True
+
+        for handle in expired:
+            try:
+                result = handle.callback()
+                if isawaitable(result):
+                    task = asyncio.ensure_future(result)
+                    self.__callbacks.add(task)
+                    task.add_done_callback(self.__callback_done)
+            except Exception as error:
+                self.__failed(error)
+
+    def __callback_done(self, task: asyncio.Future) -> None:
+        self.__callbacks.discard(task)
+
+        if not task.cancelled() and task.exception() is not None:
+            self.__failed(task.exception())
+
+    def __failed(self, error: BaseException) -> None:
+        asyncio.get_event_loop().call_exception_handler({
+            "message": "Timer wheel callback failed",
+            "exception": error
+        })
+
+    async def __run(self) -> None:
+        # Stops once nothing is pending, restarted by schedule.
+        while self.__pending:
+            await asyncio.sleep(self.resolution)
+            self.__tick()
+
+    async def close(self) -> None:
+        """Cancels all timers & running callbacks, then stops
+        the wheel.
+        """
+
+        for slot in self.__buckets:
+            for handle in slot.values():
+                handle.cancelled = True
+            slot.clear()
+
+        self.__pending = 0
+
+        tasks = list(self.__callbacks)
+        if self.__task and not self.__task.done():
+            tasks.append(self.__task)
+
+        for task in tasks:
+            task.cancel()
+
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
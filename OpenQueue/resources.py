@@ -1,12 +1,6 @@
 # -*- coding: utf-8 -*-
 
-import dathost
-import aiohttp
-import aiojobs
-
-from databases import Database
-from backblaze.bucket.awaiting import AwaitingBucket
-from typing import Union
+from typing import TYPE_CHECKING, Union
 
 from .settings.webhook import WebhookSettings
 from .settings.upload import DemoSettings
@@ -17,6 +11,22 @@ from .settings.playwin import PlaywinSettings
 from .settings.gametick import GameTickSettings
 from .settings.database import DatabaseSettings
 from .settings.smtp import SmtpSettings
+from .settings.scheduler import SchedulerSettings
+from .database import InstrumentedDatabase
+
+if TYPE_CHECKING:
+    # Optional subsystems are imported on first use.
+    import dathost
+    import aiohttp
+
+    from backblaze.bucket.awaiting import AwaitingBucket
+
+    from .queue.timer import TimerWheel
+    from .ban_index import ActiveBanIndex
+    from .external_ids import ExternalIdResolver
+    from .search import SearchIndex
+    from .scheduler import JobScheduler
+    from .email.sender import MailSender
 
 
 class Config:
@@ -36,19 +46,35 @@ class Config:
     game_tick: GameTickSettings
     database: DatabaseSettings
     smtp: SmtpSettings
+    scheduler: SchedulerSettings
 
 
 class Sessions:
     """Session singleton.
     """
 
-    database: Database
-    bucket: AwaitingBucket
-    game: dathost.Awaiting
-    requests: aiohttp.ClientSession
-    scheduler: aiojobs.Scheduler
+    database: InstrumentedDatabase
+    bucket: "AwaitingBucket"
+    game: "dathost.Awaiting"
+    requests: "aiohttp.ClientSession"
+    scheduler: "JobScheduler"
+    mail: "MailSender"
+
+
+class Cache:
+    """Cache singleton.
+    """
+
+    bans: "ActiveBanIndex"
+    external_ids: "ExternalIdResolver"
+    # Only used by engines without full text search.
+    search: Union["SearchIndex", None] = None
 
 
 class QueueGlobal:
     on_queue_full: list = []
     on_map_select: list = []
+    on_ready_check: list = []
+    on_ready_timeout: list = []
+
+    timer_wheel: "TimerWheel"
@@ -0,0 +1,524 @@
+# -*- coding: utf-8 -*-
+
+import asyncio
+import json
+import logging
+
+from collections import deque
+from contextvars import Context
+from datetime import datetime
+from heapq import heapify, heappop, heappush
+from itertools import count
+from time import perf_counter
+from typing import (
+    TYPE_CHECKING, Any, Awaitable, Callable, Deque, Dict, List, Optional,
+    Set, Tuple
+)
+from sqlalchemy import select
+
+from .resources import Sessions
+from .tables import pending_job_table
+from .database import QueryTimings, last_write
+from .misc import str_uuid4
+from .settings.scheduler import SchedulerSettings, JobClassSettings
+
+if TYPE_CHECKING:
+    from . import OpenQueue
+
+
+logger = logging.getLogger("OpenQueue.scheduler")
+
+# Name of the resumer & its keyword arguments.
+Resume = Tuple[str, Dict[str, Any]]
+
+RESUMERS: Dict[str, Callable[..., Awaitable]] = {}
+
+# Seconds cancelled jobs are given to unwind.
+CANCEL_TIMEOUT = 1.0
+
+# Seconds a periodic job waits after failing, doubled for each
+# failure in a row up to its interval.
+RETRY_BACKOFF = 5.0
+
+
+def resumable(name: str) -> Callable:
+    """Registers a function what rebuilds a persisted job,
+    called with OpenQueue & the payload the job was spawned with.
+
+    Parameters
+    ----------
+    name : str
+    """
+
+    def decorator(func: Callable[..., Awaitable]
+                  ) -> Callable[..., Awaitable]:
+        RESUMERS[name] = func
+        return func
+
+    return decorator
+
+
+async def periodic(step: Callable[[], Awaitable], interval: float,
+                   name: str) -> None:
+    """Runs step forever, sleeping for interval between runs.
+
+    Parameters
+    ----------
+    step : Callable[[], Awaitable]
+    interval : float
+        Seconds between runs.
+    name : str
+        Used when logging failures.
+
+    Notes
+    -----
+    Failures are logged & retried with backoff, only
+    cancelling stops it.
+    """
+
+    backoff = RETRY_BACKOFF
+
+    while True:
+        try:
+            await step()
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            delay = min(backoff, interval)
+            logger.exception("%s failed, retrying in %.0fs", name, delay)
+
+            await asyncio.sleep(delay)
+            backoff *= 2
+        else:
+            backoff = RETRY_BACKOFF
+            await asyncio.sleep(interval)
+
+
+class Job:
+    __slots__ = ("coro", "task", "job_class", "resume", "priority",
+                 "written", "spawned", "started")
+
+    def __init__(self, coro: Awaitable, job_class: str,
+                 resume: Resume = None, priority: int = 0) -> None:
+        self.coro = coro
+        self.task: Optional[asyncio.Future] = None
+        self.job_class = job_class
+        self.resume = resume
+        self.priority = priority
+        self.written = last_write.get()
+        self.spawned = perf_counter()
+        self.started = 0.0
+
+
+class JobQueue:
+    def __init__(self, settings: JobClassSettings) -> None:
+        """Jobs of one class, ran up to the limit of the class
+        at once, waiting jobs are started by priority.
+
+        Parameters
+        ----------
+        settings : JobClassSettings
+        """
+
+        self.settings = settings
+
+        self.running: Set[Job] = set()
+        self.pending: List[Tuple[int, int, Job]] = []
+        self.waiters: Deque[asyncio.Future] = deque()
+
+        self.waited = QueryTimings()
+        self.ran = QueryTimings()
+
+        self.spawned = 0
+        self.failed = 0
+        self.cancelled = 0
+        self.peak_pending = 0
+
+        self.__order = count()
+
+    @property
+    def free(self) -> bool:
+        return self.settings.limit is None or \
+            len(self.running) < self.settings.limit
+
+    @property
+    def full(self) -> bool:
+        return len(self.pending) >= self.settings.pending_limit
+
+    def push(self, job: Job) -> None:
+        # Equal priorities start in the order they were spawned.
+        heappush(self.pending, (-job.priority, next(self.__order), job))
+
+        if len(self.pending) > self.peak_pending:
+            self.peak_pending = len(self.pending)
+
+    def pop(self) -> Job:
+        job = heappop(self.pending)[2]
+        self.wake()
+
+        return job
+
+    def remove(self, job: Job) -> None:
+        self.pending = [item for item in self.pending if item[2] is not job]
+        heapify(self.pending)
+        self.wake()
+
+    def wake(self, every: bool = False) -> None:
+        """Wakes spawners waiting for a pending slot.
+        """
+
+        while self.waiters:
+            waiter = self.waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                if not every:
+                    break
+
+    def snapshot(self) -> Dict[str, Any]:
+        waited = self.waited.snapshot()
+        ran = self.ran.snapshot()
+        del waited["rows"], ran["rows"]
+
+        return {
+            "limit": self.settings.limit,
+            "pending_limit": self.settings.pending_limit,
+            "running": len(self.running),
+            "pending": len(self.pending),
+            "peak_pending": self.peak_pending,
+            "spawners_waiting": len(self.waiters),
+            "spawned": self.spawned,
+            "failed": self.failed,
+            "cancelled": self.cancelled,
+            "wait": waited,
+            "run": ran
+        }
+
+
+class JobScheduler:
+    def __init__(self, settings: SchedulerSettings = SchedulerSettings()
+                 ) -> None:
+        """Runs background jobs by class, drained on shutdown.
+
+        Parameters
+        ----------
+        settings : SchedulerSettings, optional
+            by default SchedulerSettings()
+        """
+
+        self.settings = settings
+
+        self.__queues: Dict[str, JobQueue] = {}
+        self.__jobs: Set[Job] = set()
+        self.__draining = False
+        self.__closed = False
+        self.__drained = 0
+        self.__persisted = 0
+
+    def __len__(self) -> int:
+        return len(self.__jobs)
+
+    @property
+    def closed(self) -> bool:
+        return self.__closed
+
+    def __queue(self, job_class: str) -> JobQueue:
+        queue = self.__queues.get(job_class)
+        if queue is None:
+            queue = self.__queues[job_class] = JobQueue(
+                self.settings.job_class(job_class)
+            )
+
+        return queue
+
+    async def spawn(self, coro: Awaitable, job_class: str = "default",
+                    resume: Resume = None, priority: int = 0) -> None:
+        """Used to run a coroutine in the background.
+
+        Parameters
+        ----------
+        coro : Awaitable
+        job_class : str, optional
+            Picks the limits & deadline from SchedulerSettings,
+            by default "default"
+        resume : Resume, optional
+            Name of a resumer & its payload, if given the job
+            is persisted when it can't finish before shutdown,
+            by default None
+        priority : int, optional
+            Waiting jobs of a class with a higher priority are
+            started first, by default 0
+
+        Raises
+        ------
+        RuntimeError
+            Raised when spawning after the scheduler was drained.
+
+        Notes
+        -----
+        Waits while the class is at its limit & pending limit.
+        While draining resumable jobs are persisted without
+        being ran, others still run within their deadline.
+        """
+
+        queue = self.__queue(job_class)
+
+        while not self.__closed and not self.__draining \
+                and not queue.free and queue.full:
+            waiter = asyncio.get_event_loop().create_future()
+            queue.waiters.append(waiter)
+
+            try:
+                await waiter
+            except asyncio.CancelledError:
+                if waiter in queue.waiters:
+                    queue.waiters.remove(waiter)
+                coro.close()
+                raise
+
+        if self.__closed:
+            coro.close()
+            raise RuntimeError("Scheduling a new job after closing")
+
+        if self.__draining and resume:
+            coro.close()
+            await self.__persist([(job_class, resume)])
+            self.__persisted += 1
+            return
+
+        job = Job(coro, job_class, resume, priority)
+        self.__jobs.add(job)
+        queue.spawned += 1
+
+        if queue.free:
+            self.__start(queue, job)
+        else:
+            queue.push(job)
+
+    def __start(self, queue: JobQueue, job: Job) -> None:
+        job.started = perf_counter()
+        queue.waited.record((job.started - job.spawned) * 1000, 0)
+        queue.running.add(job)
+
+        def create_task() -> asyncio.Future:
+            # Jobs must not share the spawner's database connection,
+            # reads after the spawner's write still use the primary.
+            last_write.set(job.written)
+            return asyncio.ensure_future(job.coro)
+
+        job.task = Context().run(create_task)
+        job.task.add_done_callback(lambda _: self.__done(queue, job))
+
+    def __done(self, queue: JobQueue, job: Job) -> None:
+        queue.running.discard(job)
+
+        # Overdue jobs cancelled by drain are already removed.
+        if job in self.__jobs:
+            self.__jobs.discard(job)
+
+            if self.__draining:
+                self.__drained += 1
+
+            queue.ran.record((perf_counter() - job.started) * 1000, 0)
+
+            if job.task.cancelled():
+                queue.cancelled += 1
+            elif job.task.exception() is not None:
+                queue.failed += 1
+                logger.error("%s job failed", job.job_class,
+                             exc_info=job.task.exception())
+
+        while queue.pending and queue.free:
+            self.__start(queue, queue.pop())
+
+    async def __persist(self, jobs: List[Tuple[str, Resume]]) -> None:
+        try:
+            await Sessions.database.execute(
+                pending_job_table.insert().values([
+                    {
+                        "job_id": str_uuid4(),
+                        "job_class": job_class,
+                        "name": name,
+                        "payload": json.dumps(payload),
+                        "timestamp": datetime.now()
+                    } for job_class, (name, payload) in jobs
+                ])
+            )
+        except Exception:
+            logger.exception("Couldn't persist jobs %r", jobs)
+
+    async def drain(self) -> Dict[str, int]:
+        """Waits for jobs to finish within the deadline of their
+        class, then closes the scheduler.
+
+        Returns
+        -------
+        Dict[str, int]
+            finished, cancelled & persisted.
+
+        Notes
+        -----
+        Jobs past their deadline are cancelled, resumable ones
+        are persisted & spawned again by JobScheduler.resume.
+        Resumable jobs what haven't started are persisted
+        straight away.
+        """
+
+        self.__draining = True
+
+        loop = asyncio.get_event_loop()
+        start = loop.time()
+
+        def deadline(job: Job) -> float:
+            return start + self.settings.job_class(job.job_class).deadline
+
+        persist: List[Tuple[str, Resume]] = []
+        for queue in self.__queues.values():
+            # Spawners stop waiting, resumable jobs get persisted.
+            queue.wake(every=True)
+
+            for _, _, job in list(queue.pending):
+                if job.resume:
+                    queue.remove(job)
+                    self.__jobs.discard(job)
+                    job.coro.close()
+                    persist.append((job.job_class, job.resume))
+
+        cancelled: List[Job] = []
+        while self.__jobs:
+            now = loop.time()
+
+            overdue = [job for job in self.__jobs if deadline(job) <= now]
+            if overdue:
+                for job in overdue:
+                    self.__jobs.discard(job)
+                    self.__queue(job.job_class).cancelled += 1
+
+                    if job.task:
+                        job.task.cancel()
+                    else:
+                        self.__queue(job.job_class).remove(job)
+                        job.coro.close()
+
+                tasks = [job.task for job in overdue if job.task]
+                if tasks:
+                    await asyncio.wait(tasks, timeout=CANCEL_TIMEOUT)
+
+                cancelled += [
+                    job for job in overdue if not job.task
+                    or job.task.cancelled() or not job.task.done()
+                ]
+
+                continue
+
+            timeout = min(deadline(job) for job in self.__jobs) - now
+            tasks = [job.task for job in self.__jobs if job.task]
+            if tasks:
+                # Jobs spawned while waiting are picked up next loop.
+                await asyncio.wait(
+                    tasks, timeout=timeout,
+                    return_when=asyncio.FIRST_COMPLETED
+                )
+            else:
+                # Pending jobs behind jobs what ignored cancellation.
+                await asyncio.sleep(timeout)
+
+        persist += [(job.job_class, job.resume) for job in cancelled
+                    if job.resume]
+        if persist:
+            await self.__persist(persist)
+            self.__persisted += len(persist)
+
+        self.__closed = True
+
+        for queue in self.__queues.values():
+            queue.wake(every=True)
+
+        summary = {
+            "finished": self.__drained,
+            "cancelled": len(cancelled),
+            "persisted": self.__persisted
+        }
+
+        logger.info(
+            "Drained jobs, %(finished)d finished, %(cancelled)d cancelled "
+            "& %(persisted)d persisted", summary
+        )
+
+        return summary
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Used to get stats per job class.
+
+        Returns
+        -------
+        Dict[str, Dict[str, Any]]
+            limit, pending_limit, running, pending, peak_pending,
+            spawners_waiting, spawned, failed, cancelled & timings
+            of waiting for a slot & running in milliseconds.
+        """
+
+        return {
+            job_class: queue.snapshot()
+            for job_class, queue in self.__queues.items()
+        }
+
+    async def resume(self, upper: "OpenQueue") -> int:
+        """Spawns jobs persisted by the last drain.
+
+        Notes
+        -----
+        A job's row is only deleted once it's been spawned, in the
+        same transaction, so it's kept if the process stops between.
+
+        Parameters
+        ----------
+        upper : OpenQueue
+
+        Returns
+        -------
+        int
+            Amount of jobs spawned.
+        """
+
+        rows = await Sessions.database.fetch_all(
+            select([
+                pending_job_table.c.job_id,
+                pending_job_table.c.job_class,
+                pending_job_table.c.name,
+                pending_job_table.c.payload
+            ]).order_by(pending_job_table.c.timestamp)
+        )
+
+        spawned = 0
+        for row in rows:
+            if row["name"] not in RESUMERS:
+                logger.warning("No resumer for %s job, dropped", row["name"])
+                await Sessions.database.execute(
+                    pending_job_table.delete().where(
+                        pending_job_table.c.job_id == row["job_id"]
+                    )
+                )
+                continue
+
+            payload = json.loads(row["payload"])
+
+            async with Sessions.database.transaction():
+                # Claims the job, other processes resuming at the
+                # same time delete nothing & skip it.
+                claimed = await Sessions.database.execute_rowcount(
+                    pending_job_table.delete().where(
+                        pending_job_table.c.job_id == row["job_id"]
+                    )
+                )
+                if not claimed:
+                    continue
+
+                await self.spawn(
+                    RESUMERS[row["name"]](upper, **payload),
+                    row["job_class"],
+                    (row["name"], payload)
+                )
+
+            spawned += 1
+
+        return spawned
@@ -0,0 +1,289 @@
+# -*- coding: utf-8 -*-
+
+import re
+
+from typing import Any, Dict, List, Set, Union
+from sqlalchemy import Column, literal, or_, select
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql import Select
+from sqlalchemy.sql.elements import ColumnElement
+
+from .resources import Sessions
+from .tables import (
+    scoreboard_total_table,
+    scoreboard_total_archive_table,
+    user_table
+)
+
+
+# Engines what have full text search of their own,
+# the rest use SearchIndex.
+FULL_TEXT_ENGINES = ("mysql", "postgresql")
+
+WORD_PATTERN = re.compile(r"\w+")
+
+
+def trigrams(text: str) -> Set[str]:
+    return {text[index:index + 3] for index in range(len(text) - 2)}
+
+
+def tsvector_sql(columns: List[str]) -> str:
+    """Used to get the PostgreSQL tsvector of columns, the same
+    expression must be used by the index & queries.
+    """
+
+    return "to_tsvector('simple', {})".format(" || ' ' || ".join(
+        "coalesce({}, '')".format(column) for column in columns
+    ))
+
+
+class FullText(ColumnElement):
+    # Not Boolean, MySQL would compare it to 1
+    # & MATCH gives back a relevance.
+    def __init__(self, columns: List[Column], words: List[str]) -> None:
+        """Full text match of columns, compiled for the engine.
+
+        Parameters
+        ----------
+        columns : List[Column]
+            Must be the columns of a full text index.
+        words : List[str]
+            Matched as word prefixes.
+        """
+
+        self.columns = columns
+        self.words = words
+
+
+@compiles(FullText, "mysql")
+def compile_mysql(element: FullText, compiler: Any, **kwargs) -> str:
+    return "MATCH ({}) AGAINST ({} IN BOOLEAN MODE)".format(
+        ", ".join(
+            compiler.process(column, **kwargs) for column in element.columns
+        ),
+        compiler.process(literal(" ".join(
+            "+{}*".format(word) for word in element.words
+        )), **kwargs)
+    )
+
+
+@compiles(FullText, "postgresql")
+def compile_postgresql(element: FullText, compiler: Any, **kwargs) -> str:
+    return "{} @@ to_tsquery('simple', {})".format(
+        tsvector_sql([
+            compiler.process(column, **kwargs) for column in element.columns
+        ]),
+        compiler.process(literal(" & ".join(
+            "{}:*".format(word) for word in element.words
+        )), **kwargs)
+    )
+
+
+class TrigramIndex:
+    def __init__(self, max_terms: int = 500) -> None:
+        """In memory index of distinct terms by their trigrams,
+        used to find every term containing some text.
+
+        Parameters
+        ----------
+        max_terms : int, optional
+            Searches matching more terms give None, by default 500
+        """
+
+        self.max_terms = max_terms
+
+        # term -> lowercase term
+        self.__terms: Dict[str, str] = {}
+        # trigram -> terms
+        self.__trigrams: Dict[str, Set[str]] = {}
+
+    def __len__(self) -> int:
+        return len(self.__terms)
+
+    def add(self, term: str) -> None:
+        """Used to index a term.
+
+        Parameters
+        ----------
+        term : str
+        """
+
+        if not term or term in self.__terms:
+            return
+
+        lowered = self.__terms[term] = term.lower()
+
+        for trigram in trigrams(lowered):
+            self.__trigrams.setdefault(trigram, set()).add(term)
+
+    def search(self, text: str) -> Union[List[str], None]:
+        """Used to find terms containing text, ignoring case.
+
+        Parameters
+        ----------
+        text : str
+
+        Returns
+        -------
+        Union[List[str], None]
+            None if more then max_terms match.
+
+        Notes
+        -----
+        Text shorter then a trigram is checked against every term.
+        """
+
+        text = text.lower()
+
+        postings = sorted(
+            (self.__trigrams.get(trigram, set())
+             for trigram in trigrams(text)),
+            key=len
+        )
+
+        candidates = (
+            postings[0].intersection(*postings[1:]) if postings
+            else self.__terms
+        )
+
+        terms = []
+        for term in candidates:
+            if text in self.__terms[term]:
+                terms.append(term)
+
+                if len(terms) > self.max_terms:
+                    return None
+
+        return terms
+
+
+class SearchIndex:
+    def __init__(self, max_terms: int = 500) -> None:
+        """In memory search of maps, team & user names, for engines
+        without full text search. Searches become equality checks
+        against the names found, rather then a LIKE scan.
+
+        Parameters
+        ----------
+        max_terms : int, optional
+            Searches matching more names fall back to LIKE,
+            by default 500
+
+        Notes
+        -----
+        Only names given to this process after SearchIndex.load
+        are picked up, searches it finds nothing for fall back to
+        LIKE but ones it finds other names for miss names given
+        to other processes, reload the index to pick them up.
+        Names are never removed, one what's no longer
+        used only costs a extra equality check.
+        """
+
+        self.max_terms = max_terms
+
+        # Maps & team names
+        self.matches = TrigramIndex(max_terms)
+        # User names
+        self.users = TrigramIndex(max_terms)
+
+    async def load(self) -> None:
+        """Loads the names in use from the database.
+        """
+
+        self.__init__(self.max_terms)
+
+        for table in (scoreboard_total_table, scoreboard_total_archive_table):
+            for column in (table.c.map, table.c.team_1_name,
+                           table.c.team_2_name):
+                async for row in Sessions.database.iterate(
+                        select([column]).distinct()):
+                    self.matches.add(row[0])
+
+        async for row in Sessions.database.iterate(
+                select([user_table.c.name]).distinct()):
+            self.users.add(row[0])
+
+    def add_match(self, *names: str) -> None:
+        """Used to index the map & team names of a match.
+
+        Parameters
+        ----------
+        *names : str
+        """
+
+        for name in names:
+            self.matches.add(name)
+
+    def add_user(self, name: str) -> None:
+        """Used to index the name of a user.
+
+        Parameters
+        ----------
+        name : str
+        """
+
+        self.users.add(name)
+
+
+def text_search(columns: List[Column], index: Union[TrigramIndex, None],
+                search: str, like: bool = False) -> ColumnElement:
+    """Used to match columns containing the search.
+
+    Parameters
+    ----------
+    columns : List[Column]
+    index : Union[TrigramIndex, None]
+        Names of the columns, None to fall back to LIKE.
+    search : str
+    like : bool, optional
+        Match any part of the columns with LIKE, by default False
+
+    Returns
+    -------
+    ColumnElement
+
+    Notes
+    -----
+    MySQL & PostgreSQL use their full text indexes, what match
+    word prefixes rather then any part of a name & skip
+    stopwords & short words, see needs_like. A search the index
+    finds nothing for falls back to LIKE, as names given to
+    other processes aren't in it.
+    """
+
+    if not like:
+        if Sessions.database.dialect.name in FULL_TEXT_ENGINES:
+            words = WORD_PATTERN.findall(search)
+            if words:
+                return FullText(columns, words)
+        elif index:
+            terms = index.search(search)
+            if terms:
+                return or_(*[column.in_(terms) for column in columns])
+
+    like_search = "%{}%".format(search)
+
+    return or_(*[column.like(like_search) for column in columns])
+
+
+async def needs_like(query: Select) -> bool:
+    """Used to check if a full text search found nothing, so
+    should be ran again with LIKE, e.g. "dust" doesn't match
+    the word "de_dust2".
+
+    Parameters
+    ----------
+    query : Select
+        Of the search, without a limit or offset.
+
+    Returns
+    -------
+    bool
+    """
+
+    if Sessions.database.dialect.name not in FULL_TEXT_ENGINES:
+        return False
+
+    return await Sessions.database.fetch_one(
+        query.limit(1), replica=True
+    ) is None
@@ -1,20 +1,23 @@
 # -*- coding: utf-8 -*-
 
 from datetime import datetime
-from typing import Dict, Tuple, Union
+from typing import TYPE_CHECKING, Awaitable, Dict, Tuple, Union
 from sqlalchemy import select
 
-from dathost.server.awaiting import ServerAwaiting
-from dathost.settings import ServerSettings as DathostServerSettings
-from dathost.models.server import ServerModel
-
 from .resources import Sessions, Config
+from .scheduler import resumable
 
 from .tables import (
     server_table,
     scoreboard_total_table,
 )
 
+if TYPE_CHECKING:
+    from dathost.server.awaiting import ServerAwaiting
+    from dathost.models.server import ServerModel
+
+    from . import OpenQueue
+
 
 async def generate_game_token(memo: str, app_id: int = 730) -> Tuple[str, str]:
     """Used to generate a API key.
@@ -74,7 +77,7 @@ async def delete_game_token(game_token_id: str) -> None:
 
 
 async def get_server(server_name: str, region: str, tickrate: int
-                     ) -> Tuple[ServerModel, ServerAwaiting]:
+                     ) -> Tuple["ServerModel", "ServerAwaiting"]:
     """Used to get a server for a match.
     If no servers are free, it just clones a new one.
 
@@ -162,6 +165,8 @@ async def get_server(server_name: str, region: str, tickrate: int
             )
         )
 
+    from dathost.settings import ServerSettings as DathostServerSettings
+
     await server.update(
         DathostServerSettings(
             server_name, region
@@ -172,3 +177,8 @@ async def get_server(server_name: str, region: str, tickrate: int
     )
 
     return model, server
+
+
+@resumable("server.stop")
+def resume_server_stop(upper: "OpenQueue", server_id: str) -> Awaitable:
+    return Sessions.game.server(server_id).stop()
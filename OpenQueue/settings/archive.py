@@ -0,0 +1,28 @@
+# -*- coding: utf-8 -*-
+
+from datetime import timedelta
+
+
+class MatchArchiveSettings:
+    def __init__(self, horizon: timedelta = timedelta(days=180),
+                 interval: timedelta = timedelta(hours=1),
+                 batch_size: int = 500) -> None:
+        """Used to configure the match archiver what moves old
+        finished matches into the archive tables.
+
+        Parameters
+        ----------
+        horizon : timedelta, optional
+            Age of matches archived for leagues without their own
+            archive horizon, by default timedelta(days=180)
+        interval : timedelta, optional
+            Time between runs, by default timedelta(hours=1)
+        batch_size : int, optional
+            Matches moved per transaction, by default 500
+        """
+
+        assert batch_size > 0
+
+        self.horizon = horizon
+        self.interval = interval
+        self.batch_size = batch_size
@@ -18,3 +18,21 @@ class BanSettings:
         self.reason = reason
         self.expires = expires
         self.banner_id = banner_id
+
+
+class BanSweepSettings:
+    def __init__(self, interval: timedelta = timedelta(minutes=5),
+                 batch_size: int = 500) -> None:
+        """Used to configure the ban sweeper what moves expired &
+        revoked bans into the ban history.
+
+        Parameters
+        ----------
+        interval : timedelta, optional
+            Time between sweeps, by default timedelta(minutes=5)
+        batch_size : int, optional
+            Bans moved per transaction, by default 500
+        """
+
+        self.interval = interval
+        self.batch_size = batch_size
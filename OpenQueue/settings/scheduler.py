@@ -0,0 +1,79 @@
+# -*- coding: utf-8 -*-
+
+from typing import Dict
+
+
+class JobClassSettings:
+    def __init__(self, deadline: float = 10.0, limit: int = 10,
+                 pending_limit: int = 1000) -> None:
+        """Settings for a class of background jobs.
+
+        Parameters
+        ----------
+        deadline : float, optional
+            Seconds jobs of this class are given to finish on
+            shutdown, after that they're cancelled & persisted
+            if resumable, by default 10.0
+        limit : int, optional
+            Jobs of this class ran at once, None for no limit,
+            by default 10
+        pending_limit : int, optional
+            Jobs waiting for a free slot, once reached spawning
+            waits till one is started, by default 1000
+        """
+
+        assert limit is None or limit > 0
+
+        self.deadline = deadline
+        self.limit = limit
+        self.pending_limit = pending_limit
+
+
+# Deadlines fit how long each job usually takes,
+# demos are streamed from dathost to b2 so only
+# a couple run at once.
+JOB_CLASSES = {
+    "webhook": JobClassSettings(deadline=10.0, limit=20, pending_limit=5000),
+    "email": JobClassSettings(deadline=10.0, limit=5),
+    "demo": JobClassSettings(deadline=60.0, limit=2, pending_limit=100),
+    "server": JobClassSettings(deadline=15.0, limit=10),
+    "analysis": JobClassSettings(deadline=30.0, limit=2, pending_limit=100),
+    "queue": JobClassSettings(deadline=5.0, limit=20),
+    "sweeper": JobClassSettings(deadline=0.0, limit=1),
+    "archiver": JobClassSettings(deadline=0.0, limit=1)
+}
+
+
+class SchedulerSettings:
+    def __init__(self, job_classes: Dict[str, JobClassSettings] = None,
+                 default: JobClassSettings = JobClassSettings()
+                 ) -> None:
+        """Background job settings, every job class runs
+        independently so a backlog in one doesn't hold
+        up the others.
+
+        Parameters
+        ----------
+        job_classes : Dict[str, JobClassSettings], optional
+            Merged over the defaults, by default None
+        default : JobClassSettings, optional
+            Used for job classes not configured,
+            by default JobClassSettings()
+        """
+
+        self.job_classes = {**JOB_CLASSES, **(job_classes or {})}
+        self.default = default
+
+    def job_class(self, name: str) -> JobClassSettings:
+        """Used to get the settings of a job class.
+
+        Parameters
+        ----------
+        name : str
+
+        Returns
+        -------
+        JobClassSettings
+        """
+
+        return self.job_classes.get(name, self.default)
@@ -1,11 +1,23 @@
 import validators
 
+from datetime import timedelta
+from typing import Dict
+
 
 class SmtpSettings:
     def __init__(self, hostname: str, port: int, email: str,
                  use_tls: bool = False, username: str = None,
                  password: str = None,
-                 confirmation: str = "https://skrim.gg/api/auth/site/confirmation/"  # noqa: E501
+                 confirmation: str = "https://skrim.gg/api/auth/site/confirmation/",  # noqa: E501
+                 code_key: bytes = None,
+                 code_expires: timedelta = timedelta(days=1),
+                 pool_size: int = 2,
+                 queue_size: int = 1000,
+                 domain_rate: float = None,
+                 domain_rates: Dict[str, float] = None,
+                 retries: int = 3,
+                 retry_backoff: float = 1.0,
+                 timeout: float = 30.0
                  ) -> None:
         """SMTP Connection settings.
 
@@ -19,6 +31,44 @@ class SmtpSettings:
         password : str, optional
         confirmation : str, optional
             URL for confirmation
+        code_key : bytes
+            Key email codes are hashed with, required. Must be the
+            same for every process & kept between restarts, else
+            codes given out by another process never validate.
+        code_expires : timedelta, optional
+            by default 1 day
+        pool_size : int, optional
+            Persistent connections mail is sent over, by default 2
+        queue_size : int, optional
+            Mails waiting for a connection, once reached sending
+            waits for room, by default 1000
+        domain_rate : float, optional
+            Mails per second sent to a recipient domain,
+            by default None what doesn't limit
+        domain_rates : Dict[str, float], optional
+            Mails per second for specific domains,
+            e.g. {"gmail.com": 10.0}, by default None
+        retries : int, optional
+            Times a mail is retried after a 4xx reply or
+            connection error, by default 3
+        retry_backoff : float, optional
+            Seconds before the first retry, doubled for
+            each retry after, by default 1.0
+        timeout : float, optional
+            SMTP timeout in seconds, by default 30.0
+
+        Raises
+        ------
+        ValueError
+            code_key wasn't given.
+
+        Notes
+        -----
+        Upgrading from versions what stored codes in plaintext,
+        code_key must now be passed, e.g. ``secrets.token_bytes(32)``
+        kept in your config. Codes sent before the upgrade are
+        stored unhashed so never validate, users need to request
+        a new code.
         """
 
         self.hostname = hostname
@@ -26,12 +76,24 @@ class SmtpSettings:
         self.use_tls = use_tls
         self.username = username
         self.password = password
+        self.code_key = code_key
+        self.code_expires = code_expires
+        self.pool_size = pool_size
+        self.queue_size = queue_size
+        self.domain_rate = domain_rate
+        self.domain_rates = domain_rates if domain_rates else {}
+        self.retries = retries
+        self.retry_backoff = retry_backoff
+        self.timeout = timeout
 
         if validators.email(email):
             self.email = email
         else:
             raise Exception("Invalid email!")
 
+        if not code_key:
+            raise ValueError("Missing code key!")
+
         if not validators.url(confirmation):
             raise Exception("Invalid confirmation url!")
 
@@ -1,7 +1,6 @@
 # -*- coding: utf-8 -*-
 
 from typing import Dict
-from aiohttp import ClientTimeout
 
 from ..constants import WEBHOOK_EVENTS
 
@@ -10,7 +9,9 @@ class WebhookSettings:
     def __init__(self, key: str = None,
                  global_webhooks: Dict[int, str] = None,
                  global_webhook_url: str = "https://skrim.gg/api/caching/",
-                 timeout: float = 3.0
+                 timeout: float = 3.0,
+                 gzip_threshold: int = None,
+                 gzip_level: int = 6
                  ) -> None:
         """Master webhook settings.
 
@@ -23,9 +24,18 @@ class WebhookSettings:
         global_webhook_url: str, optional
             by default "https://skrim.gg/api/caching/"
         timeout : float, optional
+            Total seconds per request, by default 3.0
+        gzip_threshold : int, optional
+            Payloads of at least this many bytes are sent gzipped,
+            receivers must accept Content-Encoding gzip,
+            None to never compress, by default None
+        gzip_level : int, optional
+            by default 6
         """
 
-        self.timeout = ClientTimeout(total=timeout)  # type: ignore
+        self.timeout = timeout
+        self.gzip_threshold = gzip_threshold
+        self.gzip_level = gzip_level
         self.key = key
         if global_webhooks:
             self.global_webhooks = global_webhooks
@@ -0,0 +1,178 @@
+# -*- coding: utf-8 -*-
+
+from typing import Any, Callable, Dict, Hashable, List, Tuple
+from sqlalchemy import bindparam, column, text
+from sqlalchemy.engine.interfaces import Dialect
+from sqlalchemy.sql import Select
+from sqlalchemy.sql.elements import BindParameter, ColumnClause, TextClause
+
+from .resources import Sessions
+
+
+class Compiled:
+    __slots__ = ("statement", "string", "binds", "columns", "names",
+                 "expanding")
+
+    def __init__(self, string: str, binds: List[BindParameter],
+                 columns: List[ColumnClause], names: Dict[str, List[str]],
+                 expanding: Dict[str, Tuple[str, Any]]) -> None:
+        """A compiled variant of a Statement.
+
+        Parameters
+        ----------
+        string : str
+        binds : List[BindParameter]
+        columns : List[ColumnClause]
+        names : Dict[str, List[str]]
+            Bind names per value.
+        expanding : Dict[str, Tuple[str, Any]]
+            Bind name & type per expanding value.
+        """
+
+        self.string = string
+        self.binds = binds
+        self.columns = columns
+        self.names = names
+        self.expanding = expanding
+
+        # Expanding binds are rendered per call.
+        self.statement = None if expanding else self.text(string, binds)
+
+    def text(self, string: str, binds: List[BindParameter]) -> TextClause:
+        return text(string).bindparams(*binds).columns(*self.columns)
+
+    def expand(self, values: Dict[str, Any]) -> TextClause:
+        """Renders a bind per item of each expanding value.
+        """
+
+        string = self.string
+        binds = list(self.binds)
+
+        for key, (name, type_) in self.expanding.items():
+            items = list(values.pop(key))
+            item_names = [
+                "{}_{}".format(name, index) for index in range(len(items))
+            ]
+
+            # Never matches, like SQLAlchemy's empty IN.
+            string = string.replace(
+                "([EXPANDING_{}])".format(name),
+                "({})".format(", ".join(
+                    ":" + item_name for item_name in item_names
+                ) or "NULL")
+            )
+
+            binds += [
+                bindparam(item_name, value=item, type_=type_)
+                for item_name, item in zip(item_names, items)
+            ]
+
+        return self.text(string, binds)
+
+
+class Statement:
+    def __init__(self, build: Callable[..., Select]) -> None:
+        """Select built & compiled once per dialect & variant,
+        SQLAlchemy 1.3 compiles every select on every call.
+
+        Parameters
+        ----------
+        build : Callable[..., Select]
+            Builds the select, values what change per call must
+            be bindparam's & constants literals. Arguments given
+            when the statement is called are passed to build & pick
+            the variant. A bindparam used more then once must be
+            unique, some backends can't repeat a bind. Lists are
+            bound with an expanding bindparam, so one variant
+            serves lists of any length.
+
+        Notes
+        -----
+        The select is compiled with the named paramstyle & executed
+        as text with typed columns, so result processing stays the
+        same as running the select.
+        """
+
+        self.build = build
+
+        # (dialect name, variant) -> Compiled
+        self.__compiled: Dict[Tuple[str, Tuple], Compiled] = {}
+
+    def __compile(self, dialect: Dialect, variant: Tuple) -> Compiled:
+        query = self.build(*variant)
+
+        compiled = query.compile(dialect=named_dialect(dialect))
+
+        binds = []
+        names: Dict[str, List[str]] = {}
+        expanding: Dict[str, Tuple[str, Any]] = {}
+        for bind, name in compiled.bind_names.items():
+            if not bind.required:
+                # Its value would be frozen into the cached statement.
+                raise ValueError(
+                    "{} has a value bound to {}, use a literal or a "
+                    "bindparam".format(self.build.__name__, name)
+                )
+
+            if bind.expanding:
+                expanding[bind._orig_key] = (name, bind.type)
+            else:
+                binds.append(
+                    bindparam(name, type_=bind.type, required=True)
+                )
+                # Unique bindparam's render as e.g. search_1.
+                names.setdefault(bind._orig_key, []).append(name)
+
+        return Compiled(compiled.string, binds, [
+            column(name, type_) for name, _, _, type_ in
+            compiled._result_columns
+        ], names, expanding)
+
+    def __call__(self, *variant: Hashable, **values: Any) -> TextClause:
+        """Used to get the statement with values bound.
+
+        Parameters
+        ----------
+        *variant : Hashable
+            Passed to build.
+        **values : Any
+            Values of bindparam's.
+
+        Returns
+        -------
+        TextClause
+        """
+
+        dialect = Sessions.database.dialect
+        key = (dialect.name, variant)
+
+        compiled = self.__compiled.get(key)
+        if compiled is None:
+            compiled = self.__compiled[key] = self.__compile(
+                dialect, variant
+            )
+
+        statement = compiled.statement
+        if statement is None:
+            statement = compiled.expand(values)
+
+        return statement.bindparams(**{
+            name: value
+            for key, value in values.items()
+            for name in compiled.names[key]
+        })
+
+
+_named_dialects: Dict[type, Dialect] = {}
+
+
+def named_dialect(dialect: Dialect) -> Dialect:
+    """Copy of the dialect using the named paramstyle, what
+    text understands.
+    """
+
+    dialect_type = type(dialect)
+    if dialect_type not in _named_dialects:
+        _named_dialects[dialect_type] = dialect_type(paramstyle="named")
+
+    return _named_dialects[dialect_type]
@@ -16,7 +16,8 @@ from sqlalchemy import (
     TEXT,
     LargeBinary,
     create_engine,
-    UniqueConstraint
+    UniqueConstraint,
+    Index
 )
 
 from datetime import datetime
@@ -118,7 +119,8 @@ user_table = Table(
     Column(
         "dathost_id",
         String(length=36),
-        nullable=True
+        nullable=True,
+        unique=True
     ),
     Column(
         "pfp_extension",
@@ -138,6 +140,11 @@ user_table = Table(
         "email_code",
         String(length=48)
     ),
+    Column(
+        "email_code_expires",
+        TIMESTAMP,
+        nullable=True
+    ),
     Column(
         "password",
         LargeBinary()
@@ -271,6 +278,13 @@ league_table = Table(
         "mate_killed",
         Float
     ),
+    # Days before finished matches are archived,
+    # NULL for MatchArchiveSettings.horizon.
+    Column(
+        "archive_horizon",
+        Integer,
+        nullable=True
+    ),
     mysql_engine="InnoDB",
     mysql_charset="utf8mb4"
 )
@@ -345,6 +359,79 @@ ban_table = Table(
         String(length=36),
         ForeignKey("user.user_id")
     ),
+    Index(
+        "ban_user_id_expires",
+        "user_id",
+        "expires"
+    ),
+    Index(
+        "ban_league_id_expires",
+        "league_id",
+        "expires"
+    ),
+    Index(
+        "ban_expires_revoked",
+        "expires",
+        "revoked"
+    ),
+    mysql_engine="InnoDB",
+    mysql_charset="utf8mb4"
+)
+
+
+# Ban history table
+# Expired & revoked bans are moved here by the ban sweeper.
+ban_history_table = Table(
+    "ban_history",
+    metadata,
+    Column(
+        "ban_id",
+        String(length=36),
+        primary_key=True
+    ),
+    Column(
+        "user_id",
+        String(length=36),
+        ForeignKey("user.user_id")
+    ),
+    Column(
+        "league_id",
+        String(length=6),
+        nullable=True
+    ),
+    Column(
+        "global_",
+        Boolean
+    ),
+    Column(
+        "revoked",
+        Boolean
+    ),
+    Column(
+        "reason",
+        TEXT
+    ),
+    Column(
+        "timestamp",
+        TIMESTAMP
+    ),
+    Column(
+        "expires",
+        TIMESTAMP,
+        nullable=True
+    ),
+    Column(
+        "banner_id",
+        String(length=36)
+    ),
+    Column(
+        "archived",
+        TIMESTAMP
+    ),
+    Index(
+        "ban_history_user_id",
+        "user_id"
+    ),
     mysql_engine="InnoDB",
     mysql_charset="utf8mb4"
 )
@@ -412,6 +499,11 @@ webhook_table = Table(
         String(length=6),
         ForeignKey("league.league_id")
     ),
+    Index(
+        "webhook_event_id_league_id",
+        "event_id",
+        "league_id"
+    ),
     mysql_engine="InnoDB",
     mysql_charset="utf8mb4"
 )
@@ -503,6 +595,11 @@ statistic_table = Table(
         "league_id",
         sqlite_on_conflict="REPLACE"
     ),
+    Index(
+        "statistic_league_id_elo",
+        "league_id",
+        "elo"
+    ),
     mysql_engine="InnoDB",
     mysql_charset="utf8mb4"
 )
@@ -609,6 +706,19 @@ scoreboard_total_table = Table(
         "match_id",
         "league_id"
     ),
+    Index(
+        "scoreboard_total_status",
+        "status"
+    ),
+    Index(
+        "scoreboard_total_server_id",
+        "server_id"
+    ),
+    Index(
+        "scoreboard_total_league_id_timestamp",
+        "league_id",
+        "timestamp"
+    ),
     mysql_engine="InnoDB",
     mysql_charset="utf8mb4"
 )
@@ -700,6 +810,212 @@ scoreboard_table = Table(
         "match_id",
         sqlite_on_conflict="REPLACE"
     ),
+    Index(
+        "scoreboard_match_id",
+        "match_id"
+    ),
+    mysql_engine="InnoDB",
+    mysql_charset="utf8mb4"
+)
+
+
+# Scoreboard total archive table
+# Finished matches older then a league's archive horizon
+# are moved here by the match archiver.
+scoreboard_total_archive_table = Table(
+    "scoreboard_total_archive",
+    metadata,
+    Column(
+        "match_id",
+        String(length=36),
+        primary_key=True
+    ),
+    Column(
+        "league_id",
+        String(length=6),
+        primary_key=True
+    ),
+    Column(
+        "raw_ip",
+        String(length=15)
+    ),
+    Column(
+        "game_port",
+        Integer
+    ),
+    Column(
+        "server_id",
+        String(length=36)
+    ),
+    Column(
+        "b2_id",
+        String(length=200),
+        nullable=True
+    ),
+    Column(
+        "timestamp",
+        TIMESTAMP
+    ),
+    Column(
+        "status",
+        Integer
+    ),
+    Column(
+        "demo_status",
+        Integer
+    ),
+    Column(
+        "map",
+        String(length=24)
+    ),
+    Column(
+        "team_1_name",
+        String(length=64)
+    ),
+    Column(
+        "team_2_name",
+        String(length=64)
+    ),
+    Column(
+        "team_1_score",
+        Integer
+    ),
+    Column(
+        "team_2_score",
+        Integer
+    ),
+    Column(
+        "team_1_side",
+        Integer
+    ),
+    Column(
+        "team_2_side",
+        Integer
+    ),
+    Column(
+        "archived",
+        TIMESTAMP
+    ),
+    PrimaryKeyConstraint(
+        "match_id",
+        "league_id"
+    ),
+    Index(
+        "scoreboard_total_archive_league_id_timestamp",
+        "league_id",
+        "timestamp"
+    ),
+    mysql_engine="InnoDB",
+    mysql_charset="utf8mb4"
+)
+
+
+# Scoreboard archive table
+# Players of archived matches.
+scoreboard_archive_table = Table(
+    "scoreboard_archive",
+    metadata,
+    Column(
+        "match_id",
+        String(length=36),
+        primary_key=True
+    ),
+    Column(
+        "user_id",
+        String(length=36),
+        primary_key=True
+    ),
+    Column(
+        "captain",
+        Boolean
+    ),
+    Column(
+        "team",
+        Integer
+    ),
+    Column(
+        "alive",
+        Boolean
+    ),
+    Column(
+        "ping",
+        Integer
+    ),
+    Column(
+        "kills",
+        Integer
+    ),
+    Column(
+        "headshots",
+        Integer
+    ),
+    Column(
+        "assists",
+        Integer
+    ),
+    Column(
+        "deaths",
+        Integer
+    ),
+    Column(
+        "shots_fired",
+        Integer
+    ),
+    Column(
+        "shots_hit",
+        Integer
+    ),
+    Column(
+        "mvps",
+        Integer
+    ),
+    Column(
+        "score",
+        Integer
+    ),
+    Column(
+        "disconnected",
+        Boolean
+    ),
+    PrimaryKeyConstraint(
+        "user_id",
+        "match_id"
+    ),
+    Index(
+        "scoreboard_archive_match_id",
+        "match_id"
+    ),
+    mysql_engine="InnoDB",
+    mysql_charset="utf8mb4"
+)
+
+
+# Pending job table
+# Resumable jobs what didn't finish before shutdown.
+pending_job_table = Table(
+    "pending_job",
+    metadata,
+    Column(
+        "job_id",
+        String(length=36),
+        primary_key=True
+    ),
+    Column(
+        "job_class",
+        String(length=32)
+    ),
+    Column(
+        "name",
+        String(length=32)
+    ),
+    Column(
+        "payload",
+        TEXT
+    ),
+    Column(
+        "timestamp",
+        TIMESTAMP
+    ),
     mysql_engine="InnoDB",
     mysql_charset="utf8mb4"
 )
@@ -1,7 +1,21 @@
 from .user import TestUser
 from .email import TestEmail
+from .queue import TestQueue
+from .database import TestDatabase
+from .imports import TestImports
+from .scheduler import TestScheduler
+from .models import TestModels
+from .search import TestSearch
+from .league import TestTransfer
 
 __all__ = [
     "TestUser",
-    "TestEmail"
+    "TestEmail",
+    "TestQueue",
+    "TestDatabase",
+    "TestImports",
+    "TestScheduler",
+    "TestModels",
+    "TestSearch",
+    "TestTransfer"
 ]
@@ -0,0 +1,284 @@
+import asyncio
+import os
+import sqlite3
+
+from tempfile import TemporaryDirectory
+from sqlalchemy.sql import column, table
+
+from .base_test import TestBase
+
+from ..resources import Config, Sessions
+from ..database import InstrumentedDatabase, last_write
+
+
+def sqlite_file(directory: str, name: str, value: str = None) -> str:
+    path = os.path.join(directory, name + ".db")
+
+    connection = sqlite3.connect(path)
+    if value is not None:
+        connection.execute("CREATE TABLE source (name TEXT)")
+        connection.execute("INSERT INTO source VALUES (?)", (value,))
+        connection.commit()
+    connection.close()
+
+    return "sqlite:///" + path
+
+
+class TestDatabase(TestBase):
+    async def test_query_stats(self) -> None:
+        Sessions.database.stats.reset()
+
+        await self.skrim.create_user(
+            name="Stats",
+            email="stats@pp.com",
+            password="epicpassword123"
+        )
+
+        stats = self.skrim.query_stats()
+
+        self.assertIn("OpenQueue.create_user", stats)
+        self.assertEqual(stats["OpenQueue.create_user"]["count"], 1)
+        self.assertEqual(
+            sum(stats["OpenQueue.create_user"]["buckets"].values()), 1
+        )
+
+    async def test_indexes(self) -> None:
+        """Tests
+            1. Hot query paths can use their index
+        """
+
+        if Config.database.engine != "mysql":
+            self.skipTest("EXPLAIN output is MySQL specific")
+
+        explains = [
+            ("SELECT * FROM scoreboard_total WHERE status = 1",
+             "scoreboard_total_status"),
+            ("SELECT * FROM scoreboard_total WHERE server_id = 'a'",
+             "scoreboard_total_server_id"),
+            ("SELECT * FROM scoreboard_total WHERE league_id = 'a' "
+             "ORDER BY timestamp DESC",
+             "scoreboard_total_league_id_timestamp"),
+            ("SELECT * FROM statistic WHERE league_id = 'a' "
+             "ORDER BY elo DESC",
+             "statistic_league_id_elo"),
+            ("SELECT * FROM webhook WHERE event_id = 1 AND league_id = 'a'",
+             "webhook_event_id_league_id"),
+            ("SELECT * FROM ban WHERE user_id = 'a' AND expires > NOW()",
+             "ban_user_id_expires")
+        ]
+
+        for query, index in explains:
+            row = await Sessions.database.fetch_one("EXPLAIN " + query)
+
+            self.assertIn(index, (row["possible_keys"] or "").split(","))
+
+    async def test_replica_sticky(self) -> None:
+        """Tests
+            1. Reads go to the primary unless replica=True
+            2. Replica reads go to the primary after a write
+               & within transactions
+        """
+
+        with TemporaryDirectory() as directory:
+            database = InstrumentedDatabase(
+                sqlite_file(directory, "primary", "primary"),
+                replicas=[sqlite_file(directory, "replica", "replica")],
+                replica_sticky=0.1
+            )
+            await database.connect()
+
+            query = "SELECT name FROM source"
+
+            last_write.set(None)
+
+            self.assertEqual(await database.fetch_val(query), "primary")
+            self.assertEqual(
+                await database.fetch_val(query, replica=True), "replica"
+            )
+            self.assertEqual(
+                [row["name"] async for row in
+                 database.iterate(query, replica=True)],
+                ["replica"]
+            )
+
+            await database.execute(
+                "UPDATE source SET name = 'written'"
+            )
+
+            self.assertEqual(
+                await database.fetch_val(query, replica=True), "written"
+            )
+
+            await asyncio.sleep(0.1)
+
+            self.assertEqual(
+                await database.fetch_val(query, replica=True), "replica"
+            )
+
+            async with database.transaction():
+                self.assertEqual(
+                    await database.fetch_val(query, replica=True),
+                    "written"
+                )
+
+            self.assertEqual(database.replica_stats()[0]["reads"], 3)
+
+            await database.disconnect()
+
+    async def test_replica_failover(self) -> None:
+        """Tests
+            1. A failing replica read is retried on the primary
+            2. A failed replica is skipped until replica_retry passes
+        """
+
+        with TemporaryDirectory() as directory:
+            database = InstrumentedDatabase(
+                sqlite_file(directory, "primary", "primary"),
+                # Missing the table, so every read fails.
+                replicas=[sqlite_file(directory, "replica")],
+                replica_retry=0.1
+            )
+            await database.connect()
+
+            query = "SELECT name FROM source"
+
+            last_write.set(None)
+
+            self.assertEqual(
+                await database.fetch_val(query, replica=True), "primary"
+            )
+
+            stats = database.replica_stats()[0]
+            self.assertFalse(stats["healthy"])
+            self.assertEqual(stats["failures"], 1)
+
+            self.assertEqual(
+                [row["name"] async for row in
+                 database.iterate(query, replica=True)],
+                ["primary"]
+            )
+            self.assertEqual(database.replica_stats()[0]["failures"], 1)
+
+            await asyncio.sleep(0.1)
+
+            self.assertTrue(database.replica_stats()[0]["healthy"])
+            self.assertEqual(
+                [row["name"] async for row in
+                 database.iterate(query, replica=True)],
+                ["primary"]
+            )
+            self.assertEqual(database.replica_stats()[0]["failures"], 2)
+
+            with self.assertRaises(sqlite3.OperationalError):
+                await database.fetch_val("SELECT * FROM missing", replica=True)
+
+            await database.disconnect()
+
+    async def test_execute_rowcount(self) -> None:
+        """Tests
+            1. Only one of racing conditional updates changes the row
+            2. Rows changed by a update & delete are counted
+        """
+
+        source = table("source", column("name"))
+
+        with TemporaryDirectory() as directory:
+            database = InstrumentedDatabase(
+                sqlite_file(directory, "primary", "unclaimed")
+            )
+            await database.connect()
+
+            # Shares the connection with the tasks it gathers.
+            await database.fetch_val("SELECT name FROM source")
+
+            claims = await asyncio.gather(*[
+                database.execute_rowcount(
+                    source.update().values(name="claimed").where(
+                        source.c.name == "unclaimed"
+                    )
+                ) for _ in range(5)
+            ])
+            self.assertEqual(sorted(claims), [0, 0, 0, 0, 1])
+
+            await database.execute(source.insert().values(name="second"))
+
+            self.assertEqual(
+                await database.execute_rowcount(
+                    source.update().values(name="renamed")
+                ), 2
+            )
+            self.assertEqual(
+                await database.execute_rowcount(source.delete()), 2
+            )
+
+            await database.disconnect()
+
+    async def test_pool_stats(self) -> None:
+        """Tests
+            1. Connections held at once are counted in use & as
+               the pool's size
+            2. Acquisitions & their waits are counted
+            3. Acquisitions over pool_timeout are counted
+        """
+
+        with TemporaryDirectory() as directory:
+            database = InstrumentedDatabase(
+                sqlite_file(directory, "primary", "primary")
+            )
+            await database.connect()
+
+            held = asyncio.Event()
+            release = asyncio.Event()
+            holding = 0
+
+            async def hold() -> None:
+                nonlocal holding
+
+                # Ran in its own task, so gets its own connection.
+                async with database.connection() as connection:
+                    await connection.fetch_val("SELECT name FROM source")
+
+                    holding += 1
+                    if holding == 5:
+                        held.set()
+
+                    await release.wait()
+
+            tasks = [asyncio.ensure_future(hold()) for _ in range(5)]
+
+            await held.wait()
+
+            stats = database.pool_stats()
+            self.assertEqual(stats["size"], 5)
+            self.assertEqual(stats["in_use"], 5)
+            self.assertEqual(stats["acquired"], 5)
+
+            release.set()
+            await asyncio.gather(*tasks)
+
+            stats = database.pool_stats()
+            self.assertEqual(stats["in_use"], 0)
+            self.assertEqual(stats["peak_in_use"], 5)
+            self.assertEqual(stats["acquired"], 5)
+            self.assertEqual(stats["timeouts"], 0)
+            self.assertGreaterEqual(stats["wait_total_ms"],
+                                    stats["wait_max_ms"])
+            self.assertAlmostEqual(stats["wait_mean_ms"],
+                                   stats["wait_total_ms"] / 5, places=2)
+
+            await database.disconnect()
+
+            database = InstrumentedDatabase(
+                sqlite_file(directory, "primary"), pool_timeout=0
+            )
+            await database.connect()
+
+            with self.assertRaises(asyncio.TimeoutError):
+                await database.fetch_val("SELECT name FROM source")
+
+            stats = database.pool_stats()
+            self.assertEqual(stats["timeouts"], 1)
+            self.assertEqual(stats["acquired"], 0)
+            self.assertEqual(stats["in_use"], 0)
+
+            await database.disconnect()
@@ -1,7 +1,36 @@
+import asyncio
+
+from email.mime.text import MIMEText
+from aiosmtpd.controller import Controller
+
 from .base_test import TestBase
 from ..resources import Config
 
-from ..email import send_email
+from ..email import send_email, render_html
+from ..email.code import create_email_code, compare_email_code
+from ..email.sender import MailSender
+from ..email.templates import TEMPLATES
+from ..settings.smtp import SmtpSettings
+
+
+class Recorder:
+    """aiosmtpd handler what fails the first mails with a 451.
+    """
+
+    def __init__(self, fail: int = 0) -> None:
+        self.fail = fail
+        self.received = []
+        self.sessions = set()
+
+    async def handle_DATA(self, server, session, envelope) -> str:
+        self.sessions.add(id(session))
+
+        if self.fail:
+            self.fail -= 1
+            return "451 Try again later"
+
+        self.received.append(envelope.rcpt_tos[0])
+        return "250 OK"
 
 
 class TestEmail(TestBase):
@@ -18,3 +47,109 @@ class TestEmail(TestBase):
             button="Confirm my email",
             url=Config.smtp.confirmation + "someRadom_codawd"
         )
+
+    def test_templates(self) -> None:
+        template = TEMPLATES["confirmation"]
+
+        subject, html = template.render(
+            name="<Ward & co>", url="https://skrim.gg/confirm?c=a&b=\"c"
+        )
+
+        self.assertEqual(subject, template.subject)
+        self.assertEqual(html, render_html("template.html", {
+            "header": template.header.format(name="<Ward & co>"),
+            "body": template.body,
+            "button_text": template.button,
+            "url": "https://skrim.gg/confirm?c=a&b=\"c"
+        }))
+
+    def test_email_code(self) -> None:
+        code, hashed_code, _ = create_email_code()
+
+        self.assertNotEqual(code, hashed_code)
+        self.assertLessEqual(len(hashed_code), 48)
+        self.assertTrue(compare_email_code(code, hashed_code))
+        self.assertFalse(compare_email_code(code + "a", hashed_code))
+
+    async def test_mail_sender(self) -> None:
+        """Tests
+            1. Mails are sent over the pooled connections
+            2. 4xx replies are retried
+        """
+
+        recorder = Recorder(fail=2)
+        controller = Controller(recorder, hostname="127.0.0.1", port=8026)
+        controller.start()
+
+        sender = MailSender(SmtpSettings(
+            hostname="127.0.0.1",
+            port=8026,
+            email="test@pp.com",
+            code_key=b"test-code-key",
+            pool_size=2,
+            retry_backoff=0.01
+        ))
+
+        messages = []
+        for index in range(10):
+            message = MIMEText("Test")
+            message["From"] = "test@pp.com"
+            message["To"] = "user{}@pp.com".format(index)
+            messages.append(message)
+
+        try:
+            await asyncio.gather(*[
+                sender.send(message) for message in messages
+            ])
+            await sender.close()
+        finally:
+            controller.stop()
+
+        self.assertEqual(len(recorder.received), 10)
+        self.assertLessEqual(len(recorder.sessions), 2)
+        self.assertEqual(sender.stats()["retried"], 2)
+
+    async def test_domain_rate(self) -> None:
+        """Tests
+            1. Mails to a throttled domain are spaced by its rate
+            2. A throttled domain doesn't hold up other domains
+        """
+
+        recorder = Recorder()
+        controller = Controller(recorder, hostname="127.0.0.1", port=8027)
+        controller.start()
+
+        sender = MailSender(SmtpSettings(
+            hostname="127.0.0.1",
+            port=8027,
+            email="test@pp.com",
+            code_key=b"test-code-key",
+            pool_size=1,
+            domain_rates={"slow.com": 5.0}
+        ))
+
+        messages = []
+        for to in ("1@slow.com", "2@slow.com", "3@slow.com", "1@pp.com"):
+            message = MIMEText("Test")
+            message["From"] = "test@pp.com"
+            message["To"] = to
+            messages.append(message)
+
+        loop = asyncio.get_event_loop()
+        start = loop.time()
+
+        try:
+            await asyncio.gather(*[
+                sender.send(message) for message in messages
+            ])
+            await sender.close()
+        finally:
+            controller.stop()
+
+        self.assertGreaterEqual(loop.time() - start, 0.4)
+        self.assertEqual(len(recorder.received), 4)
+        self.assertLess(
+            recorder.received.index("1@pp.com"),
+            recorder.received.index("3@slow.com")
+        )
+        self.assertEqual(sender.stats()["delayed"], 0)
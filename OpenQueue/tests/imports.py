@@ -0,0 +1,40 @@
+import asynctest
+import subprocess
+import sys
+
+from os import path
+
+
+LAZY = (
+    "aiohttp",
+    "aiosmtplib",
+    "backblaze",
+    "bcrypt",
+    "dathost",
+    "jinja2",
+    "zipstream",
+    "sqlalchemy.dialects.postgresql"
+)
+
+
+class TestImports(asynctest.TestCase):
+    def test_lazy_imports(self) -> None:
+        """Tests
+            1. Optional subsystems aren't imported with OpenQueue
+        """
+
+        result = subprocess.run(
+            [
+                sys.executable, "-c",
+                "import sys, OpenQueue; print(' '.join("
+                "name for name in {!r} if name in sys.modules))".format(LAZY)
+            ],
+            cwd=path.dirname(path.dirname(path.dirname(
+                path.realpath(__file__)
+            ))),
+            stdout=subprocess.PIPE,
+            universal_newlines=True,
+            check=True
+        )
+
+        self.assertEqual(result.stdout.split(), [])
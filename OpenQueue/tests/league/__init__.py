@@ -0,0 +1,5 @@
+from .transfer import TestTransfer
+
+__all__ = [
+    "TestTransfer"
+]
@@ -0,0 +1,168 @@
+import asynctest
+import os
+
+from datetime import datetime
+from tempfile import TemporaryDirectory
+from sqlalchemy import Boolean, TIMESTAMP
+
+from ...resources import Sessions
+from ...database import InstrumentedDatabase
+from ...tables import (
+    create_tables,
+    league_table,
+    statistic_table,
+    scoreboard_total_table,
+    scoreboard_table,
+    ban_table
+)
+from ...league.transfer import (
+    TABLES, CSV_NULL, encode_csv, decode_csv, export_league, import_league
+)
+
+
+class TestTransfer(asynctest.TestCase):
+    def test_csv_codecs(self) -> None:
+        """Tests
+            1. NULL, bools & timestamps survive a CSV round trip
+        """
+
+        now = datetime.now()
+
+        for column_type, value in ((Boolean(), True), (Boolean(), False),
+                                   (TIMESTAMP(), now), (TIMESTAMP(), None)):
+            self.assertEqual(
+                decode_csv(column_type, encode_csv(column_type, value)),
+                value
+            )
+
+        self.assertEqual(encode_csv(Boolean(), None), CSV_NULL)
+        self.assertEqual(encode_csv(Boolean(), False), "0")
+        self.assertEqual(encode_csv(TIMESTAMP(), now), now.isoformat())
+
+    async def connect(self, pathway: str) -> InstrumentedDatabase:
+        url = "sqlite:///" + pathway
+        create_tables(url)
+
+        database = InstrumentedDatabase(url)
+        await database.connect()
+
+        return database
+
+    async def test_round_trip(self) -> None:
+        """Tests
+            1. Only rows of the league are exported
+            2. Importing a ndjson or csv export gives the same rows
+            3. Progress is called with the rows done per table
+        """
+
+        now = datetime.now()
+
+        previous = getattr(Sessions, "database", None)
+
+        with TemporaryDirectory() as directory:
+            source = await self.connect(os.path.join(directory, "source.db"))
+            Sessions.database = source
+
+            try:
+                for league_id in ("league", "other"):
+                    await source.execute(league_table.insert().values(
+                        league_id=league_id,
+                        league_name="Test",
+                        user_id="owner",
+                        disabled=False,
+                        banned=False,
+                        allow_api_access=True,
+                        timestamp=now
+                    ))
+                await source.execute(statistic_table.insert().values(
+                    user_id="player", league_id="league", elo=1.5
+                ))
+                await source.execute(scoreboard_total_table.insert().values(
+                    match_id="match",
+                    league_id="league",
+                    timestamp=now,
+                    status=0,
+                    map="de_dust2"
+                ))
+                await source.execute_many(scoreboard_table.insert(), [
+                    {"match_id": "match", "user_id": "player",
+                     "captain": True, "team": 0},
+                    {"match_id": "match", "user_id": "owner",
+                     "captain": False, "team": 1}
+                ])
+                await source.execute(ban_table.insert().values(
+                    ban_id="ban",
+                    user_id="player",
+                    league_id="league",
+                    global_=False,
+                    revoked=False,
+                    reason=None,
+                    timestamp=now,
+                    expires=None
+                ))
+
+                expected = {
+                    name: [dict(row) for row in await source.fetch_all(
+                        table.select().where(
+                            table.c.match_id == "match"
+                            if "league_id" not in table.c
+                            else table.c.league_id == "league"
+                        )
+                    )] for name, table in TABLES.items()
+                }
+
+                for format, atomic in (("ndjson", False), ("csv", True)):
+                    Sessions.database = source
+
+                    pathway = os.path.join(directory, format)
+                    exported = []
+                    counts = await export_league(
+                        "league", pathway, format,
+                        lambda name, count: exported.append((name, count)),
+                        progress_every=1
+                    )
+
+                    self.assertEqual(counts, {
+                        name: len(rows) for name, rows in expected.items()
+                    })
+                    self.assertIn(("scoreboard", 1), exported)
+                    self.assertEqual(dict(exported), counts)
+
+                    target = await self.connect(
+                        os.path.join(directory, format + ".db")
+                    )
+                    Sessions.database = target
+
+                    try:
+                        imported = []
+                        self.assertEqual(
+                            await import_league(
+                                pathway, format, chunk_size=1,
+                                progress=lambda name, count: imported.append(
+                                    (name, count)
+                                ),
+                                atomic=atomic
+                            ),
+                            {name: count for name, count in counts.items()
+                             if count}
+                        )
+                        self.assertEqual(imported, [
+                            ("league", 1),
+                            ("statistic", 1),
+                            ("scoreboard_total", 1),
+                            ("scoreboard", 1),
+                            ("scoreboard", 2),
+                            ("ban", 1)
+                        ])
+
+                        for name, table in TABLES.items():
+                            self.assertEqual(
+                                [dict(row) for row in
+                                 await target.fetch_all(table.select())],
+                                expected[name]
+                            )
+                    finally:
+                        await target.disconnect()
+            finally:
+                await source.disconnect()
+                Sessions.database = previous
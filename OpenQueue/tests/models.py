@@ -0,0 +1,153 @@
+import asynctest
+
+from datetime import datetime
+
+from ..resources import Config
+from ..settings.upload import B2Settings, PfpSettings
+
+from ..models.match import MatchModel, MatchFinished, MatchLive
+from ..models.user import UserOverviewModel
+from ..models.integration import IntegrationModel
+from ..models.columnar import ColumnarResult
+
+
+class TestModels(asynctest.TestCase):
+    def test_schema_cache(self) -> None:
+        """Tests
+            1. Models don't have a __dict__
+            2. api_schema is cached per public & private
+            3. Changing the status like Match.end & invalidating
+               clears the cache
+        """
+
+        match = MatchModel(
+            match_id="match",
+            raw_ip="127.0.0.1",
+            game_port=27015,
+            server_id="server",
+            timestamp=datetime.now(),
+            b2_id=None,
+            status=1,
+            demo_status=0,
+            map="de_mirage",
+            team_1_name="Team 1",
+            team_2_name="Team 2",
+            team_1_score=16,
+            team_2_score=12,
+            team_1_side=0,
+            team_2_side=1,
+            league_id="league",
+            capt_team_1_user_id="1",
+            capt_team_1_pfp_extension=None,
+            capt_team_2_user_id="2",
+            capt_team_2_pfp_extension=None,
+            user_ids="1,2",
+            user_pfp_extensions=",",
+            user_names="user1,user2",
+            user_teams="0,1"
+        )
+
+        self.assertFalse(hasattr(match, "__dict__"))
+        self.assertEqual(match.status, MatchLive)
+
+        schema = match.api_schema(True)
+        self.assertIs(match.api_schema(True), schema)
+        self.assertIsNot(match.api_schema(False), schema)
+        self.assertEqual(len(schema["team_1"]["players"]), 1)
+        self.assertNotIn("server_id", schema)
+
+        match.status = MatchFinished
+        match.invalidate()
+
+        self.assertIsNot(match.api_schema(True), schema)
+        self.assertEqual(match.api_schema(True)["status"], 0)
+
+    def test_columnar(self) -> None:
+        """Tests
+            1. Rows are stored per column
+            2. Schemas match the schemas of models built per row
+        """
+
+        rows = [
+            {
+                "name": "integration{}".format(index),
+                "logo": "logo.png",
+                "auth_url": None,
+                "globally_required": bool(index % 2)
+            } for index in range(5)
+        ]
+
+        result = ColumnarResult(IntegrationModel)
+        for row in rows:
+            result.append(row)
+
+        self.assertEqual(len(result), 5)
+        self.assertEqual(result.column("name")[-1], "integration4")
+        self.assertEqual(dict(result[1]), rows[1])
+        self.assertEqual(result[-1].model().name, "integration4")
+        self.assertEqual(
+            result.api_schema(True),
+            [IntegrationModel(**row).api_schema(True) for row in rows]
+        )
+
+    def test_row_schema(self) -> None:
+        """Tests
+            1. Schemas built from rows match the schemas of models
+        """
+
+        Config.b2 = B2Settings("", "", "", "https://cdn.example.com/")
+        Config.pfp = PfpSettings()
+
+        now = datetime.now()
+
+        match = {
+            "match_id": "match",
+            "raw_ip": "127.0.0.1",
+            "game_port": 27015,
+            "server_id": "server",
+            "timestamp": now,
+            "b2_id": "b2",
+            "status": 0,
+            "demo_status": 1,
+            "map": "de_mirage",
+            "team_1_name": "Team 1",
+            "team_2_name": "Team 2",
+            "team_1_score": 16,
+            "team_2_score": 12,
+            "team_1_side": 0,
+            "team_2_side": 1,
+            "league_id": "league",
+            "capt_team_1_user_id": "1",
+            "capt_team_1_pfp_extension": ".png",
+            "capt_team_2_user_id": "3",
+            "capt_team_2_pfp_extension": None,
+            "user_ids": "1,2,3",
+            "user_pfp_extensions": ".png,,.jpg",
+            "user_names": "user1,user2,user3",
+            "user_teams": "0,1,1"
+        }
+
+        player = {
+            "name": "player",
+            "user_id": "1",
+            "timestamp": now,
+            "pfp_extension": ".png",
+            "steam_id": "STEAM_0:1:1",
+            "discord_id": 1,
+            "email": "player@pp.com",
+            "email_confirmed": True,
+            "dathost_id": None,
+            "kills": 20,
+            "deaths": 0,
+            "headshots": 5,
+            "matches": 3,
+            "elo": 1.0
+        }
+
+        for model, row in ((MatchModel, match),
+                           (UserOverviewModel, player)):
+            for public in (True, False):
+                self.assertEqual(
+                    model.row_schema(row, public),
+                    model(**row).api_schema(public)
+                )
@@ -0,0 +1,96 @@
+import asyncio
+
+from .base_test import TestBase
+
+from ..resources import QueueGlobal
+from ..queue.timer import TimerWheel
+from ..exceptions import NotInReadyCheck
+
+
+class TestQueue(TestBase):
+    async def test_ready_check(self) -> None:
+        """Tests
+            1. Ready check started once full
+            2. Backfill when queue full
+            3. Unready players dropped & slot backfilled
+            4. on_queue_full only once all accepted
+        """
+
+        users = []
+        for index in range(3):
+            _, user = await self.skrim.create_user(
+                name="Queue {}".format(index),
+                email="queue{}@pp.com".format(index),
+                password="epicpassword123"
+            )
+            users.append(user)
+
+        full = []
+        QueueGlobal.on_queue_full.append(
+            lambda queue: full.append(queue)
+        )
+
+        queue = self.skrim.create_queue(capacity=2, ready_timeout=1.0)
+
+        for user in users:
+            await queue.join(user)
+
+        self.assertEqual(len(queue.waiting), 2)
+        self.assertListEqual(queue.backfill, [users[2].user_id])
+        self.assertIsNotNone(queue.ready_deadline)
+
+        with self.assertRaises(NotInReadyCheck):
+            await queue.accept(users[2])
+
+        await queue.accept(users[0])
+
+        await asyncio.sleep(2.5)
+
+        self.assertListEqual(
+            queue.waiting, [users[0].user_id, users[2].user_id]
+        )
+        self.assertListEqual(queue.backfill, [])
+        self.assertListEqual(full, [])
+
+        await queue.accept(users[0])
+        await queue.accept(users[2])
+
+        await asyncio.sleep(0.1)
+
+        self.assertEqual(len(full), 1)
+        self.assertIsNone(queue.ready_deadline)
+
+        QueueGlobal.on_queue_full.clear()
+
+    async def test_timer_wheel(self) -> None:
+        """Tests
+            1. Timers never fire before their delay
+            2. Slow callbacks don't hold up other timers
+        """
+
+        wheel = TimerWheel(resolution=0.05, slots=8)
+        loop = asyncio.get_event_loop()
+
+        fired = {}
+
+        async def slow() -> None:
+            await asyncio.sleep(60)
+
+        for delay in (0.05, 0.12, 0.5):
+            wheel.schedule(0.01, slow)
+            await asyncio.sleep(0.02)
+
+            def callback(delay: float = delay,
+                         start: float = loop.time()) -> None:
+                fired[delay] = loop.time() - start
+
+            wheel.schedule(delay, callback)
+
+        await asyncio.sleep(0.8)
+
+        self.assertEqual(len(fired), 3)
+        for delay, elapsed in fired.items():
+            self.assertGreaterEqual(elapsed, delay)
+            self.assertLess(elapsed, delay + 0.1)
+
+        await wheel.close()
@@ -0,0 +1,130 @@
+import asyncio
+
+from .base_test import TestBase
+
+from ..resources import Sessions
+from .. import scheduler
+from ..scheduler import JobScheduler, periodic, resumable
+from ..settings.scheduler import SchedulerSettings, JobClassSettings
+
+
+resumed = []
+
+
+@resumable("test.resume")
+async def resume_test(upper, value: int) -> None:
+    resumed.append(value)
+
+
+class TestScheduler(TestBase):
+    async def test_drain(self) -> None:
+        """Tests
+            1. Jobs finishing within their deadline run
+            2. Jobs past their deadline are persisted
+            3. Persisted jobs are resumed
+        """
+
+        await Sessions.scheduler.drain()
+
+        Sessions.scheduler = JobScheduler(SchedulerSettings({
+            "test": JobClassSettings(deadline=0.1)
+        }))
+
+        finished = []
+
+        async def quick() -> None:
+            await asyncio.sleep(0.01)
+            finished.append(True)
+
+        await Sessions.scheduler.spawn(quick(), "test")
+        await Sessions.scheduler.spawn(
+            asyncio.sleep(60), "test", ("test.resume", {"value": 1})
+        )
+
+        self.assertEqual(await Sessions.scheduler.drain(), {
+            "finished": 1,
+            "cancelled": 1,
+            "persisted": 1
+        })
+        self.assertEqual(finished, [True])
+
+        with self.assertRaises(RuntimeError):
+            await Sessions.scheduler.spawn(quick())
+
+        Sessions.scheduler = JobScheduler()
+
+        self.assertEqual(await Sessions.scheduler.resume(self.skrim), 1)
+        await asyncio.sleep(0.01)
+
+        self.assertEqual(resumed, [1])
+
+    async def test_priority(self) -> None:
+        """Tests
+            1. Spawning waits once a class's pending limit is reached
+            2. Waiting jobs start by priority
+            3. Queue depth is exposed
+        """
+
+        await Sessions.scheduler.drain()
+
+        Sessions.scheduler = JobScheduler(SchedulerSettings({
+            "test": JobClassSettings(limit=1, pending_limit=2)
+        }))
+
+        started = []
+        gate = asyncio.Event()
+
+        async def job(name: str) -> None:
+            if name == "first":
+                await gate.wait()
+            started.append(name)
+
+        await Sessions.scheduler.spawn(job("first"), "test")
+        await Sessions.scheduler.spawn(job("low"), "test")
+        await Sessions.scheduler.spawn(job("lowest"), "test", priority=-1)
+
+        waiting = asyncio.ensure_future(
+            Sessions.scheduler.spawn(job("high"), "test", priority=1)
+        )
+        await asyncio.sleep(0.01)
+
+        self.assertFalse(waiting.done())
+        self.assertEqual(self.skrim.job_stats()["test"]["pending"], 2)
+
+        gate.set()
+        await waiting
+        await asyncio.sleep(0.01)
+
+        # low started when first finished, freeing the slot high took.
+        self.assertEqual(started, ["first", "low", "high", "lowest"])
+        self.assertEqual(self.skrim.job_stats()["test"]["spawned"], 4)
+
+        Sessions.scheduler = JobScheduler()
+
+    async def test_periodic(self) -> None:
+        """Tests
+            1. Failing runs are retried
+            2. Cancelling stops it
+        """
+
+        backoff = scheduler.RETRY_BACKOFF
+        scheduler.RETRY_BACKOFF = 0.01
+
+        runs = []
+
+        async def step() -> None:
+            runs.append(True)
+            if len(runs) < 3:
+                raise RuntimeError("Failed run")
+
+        task = asyncio.ensure_future(periodic(step, 0.01, "Test"))
+        await asyncio.sleep(0.1)
+
+        self.assertFalse(task.done())
+        self.assertGreater(len(runs), 3)
+
+        task.cancel()
+        with self.assertRaises(asyncio.CancelledError):
+            await task
+
+        scheduler.RETRY_BACKOFF = backoff
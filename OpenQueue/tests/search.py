@@ -0,0 +1,81 @@
+import asynctest
+
+from ..resources import Sessions
+from ..database import InstrumentedDatabase
+from ..tables import scoreboard_total_table
+from ..search import SearchIndex, TrigramIndex, needs_like, text_search
+
+
+class TestSearch(asynctest.TestCase):
+    def test_trigram_index(self) -> None:
+        """Tests
+            1. Terms containing the text are found, ignoring case
+            2. Text shorter then a trigram checks every term
+            3. No matches gives a empty list
+            4. More then max_terms matches gives None
+        """
+
+        index = TrigramIndex(max_terms=1)
+        for term in ("de_dust2", "de_inferno", "Cobra Squad", "de_dust2"):
+            index.add(term)
+
+        self.assertEqual(len(index), 3)
+
+        self.assertEqual(index.search("DUST"), ["de_dust2"])
+        self.assertEqual(index.search("squad"), ["Cobra Squad"])
+        self.assertEqual(sorted(index.search("in")), ["de_inferno"])
+
+        self.assertEqual(index.search("zzzz"), [])
+
+        self.assertIsNone(index.search("de_"))
+        self.assertIsNone(index.search("e"))
+
+    def test_search_index(self) -> None:
+        """Tests
+            1. Match & user names are kept apart
+        """
+
+        index = SearchIndex()
+        index.add_match("de_mirage", "Team Havoc", "Team Onyx")
+        index.add_user("Havoc12")
+
+        self.assertEqual(index.matches.search("havoc"), ["Team Havoc"])
+        self.assertEqual(index.users.search("havoc"), ["Havoc12"])
+        self.assertEqual(index.users.search("mirage"), [])
+
+    async def test_text_search(self) -> None:
+        """Tests
+            1. SQLite matches the names found by the index
+            2. SQLite falls back to LIKE when the index finds nothing
+            3. MySQL & PostgreSQL use full text, unless told to LIKE
+        """
+
+        columns = [scoreboard_total_table.c.map]
+
+        index = TrigramIndex()
+        index.add("de_dust2")
+
+        previous = getattr(Sessions, "database", None)
+
+        def compiled(search: str, index: TrigramIndex = None,
+                     like: bool = False) -> str:
+            return str(text_search(columns, index, search, like).compile(
+                dialect=Sessions.database.dialect
+            ))
+
+        try:
+            Sessions.database = InstrumentedDatabase("sqlite:///search.db")
+
+            self.assertIn(" IN ", compiled("dust", index))
+            self.assertIn(" LIKE ", compiled("nuke", index))
+            self.assertIn(" LIKE ", compiled("dust"))
+            self.assertFalse(await needs_like(scoreboard_total_table.select()))
+
+            for url in ("mysql://localhost/db", "postgresql://localhost/db"):
+                Sessions.database = InstrumentedDatabase(url)
+
+                self.assertNotIn(" LIKE ", compiled("dust"))
+                self.assertIn(" LIKE ", compiled("dust", like=True))
+                self.assertIn(" LIKE ", compiled("--"))
+        finally:
+            Sessions.database = previous
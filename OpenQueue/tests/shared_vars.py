@@ -26,6 +26,7 @@ cli.add_argument("--smtp_port", type=int, default=25)
 cli.add_argument("--smtp_email", type=str, default="")
 cli.add_argument("--smtp_username", type=str, default="")
 cli.add_argument("--smtp_password", type=str, default="")
+cli.add_argument("--smtp_code_key", type=str, default="test-code-key")
 
 cli.add_argument("--webhook_key", type=str, default="")
 cli.add_argument(
@@ -72,5 +73,6 @@ SMTP = {
     "port": args["smtp_port"],
     "email": args["smtp_email"],
     "username": args["smtp_username"],
-    "password": args["smtp_password"]
+    "password": args["smtp_password"],
+    "code_key": args["smtp_code_key"].encode()
 }
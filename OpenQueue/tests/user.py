@@ -1,5 +1,15 @@
+import asyncio
+
+from datetime import datetime, timedelta
+
 from .base_test import TestBase
 
+from ..resources import Cache, Sessions
+from ..tables import user_table, ban_table
+from ..external_ids import ExternalIdResolver
+from ..ban_index import ActiveBanIndex
+from ..settings.ban import BanSettings
+
 from ..models.user import UserModel
 from ..user import User
 
@@ -109,3 +119,124 @@ class TestUser(TestBase):
 
         async for integration in league.integrations():
             self.assertIsInstance(integration, IntegrationModel)
+
+    async def test_external_id_ttl(self) -> None:
+        """Tests
+            1. Lookups are cached
+            2. IDs changed by another process resolve to the new
+               user once the lookup expires
+        """
+
+        resolver = Cache.external_ids
+        Cache.external_ids = ExternalIdResolver(ttl=0.2)
+
+        first, _ = await self.skrim.create_user(
+            name="First", email="first@pp.com", password="password123"
+        )
+        second, _ = await self.skrim.create_user(
+            name="Second", email="second@pp.com", password="password123"
+        )
+
+        await self.skrim.user(first.user_id).update(steam_id="ttl_steam_id")
+
+        model, _ = await self.skrim.external_id_to_user("ttl_steam_id")
+        self.assertEqual(model.user_id, first.user_id)
+
+        # As another process would, without invalidating.
+        await Sessions.database.execute(
+            user_table.update().values(steam_id=None).where(
+                user_table.c.user_id == first.user_id
+            )
+        )
+        await Sessions.database.execute(
+            user_table.update().values(steam_id="ttl_steam_id").where(
+                user_table.c.user_id == second.user_id
+            )
+        )
+
+        model, _ = await self.skrim.external_id_to_user("ttl_steam_id")
+        self.assertEqual(model.user_id, first.user_id)
+
+        await asyncio.sleep(0.3)
+
+        model, _ = await self.skrim.external_id_to_user("ttl_steam_id")
+        self.assertEqual(model.user_id, second.user_id)
+
+        Cache.external_ids = resolver
+
+    async def test_pfp_external_ids(self) -> None:
+        """Tests
+            1. Adding & removing a pfp drops cached lookups
+        """
+
+        user, _ = await self.skrim.create_user(
+            name="Pfp", email="pfp@pp.com", password="password123"
+        )
+        await self.skrim.user(user.user_id).update(steam_id="pfp_steam_id")
+
+        model, _ = await self.skrim.external_id_to_user("pfp_steam_id")
+        self.assertIsNone(model.pfp)
+
+        # What add_pfp saves once uploaded.
+        await self.skrim.user(user.user_id).update(pfp_extension=".png")
+
+        model, _ = await self.skrim.external_id_to_user("pfp_steam_id")
+        self.assertTrue(model.pfp.endswith(user.user_id + ".png"))
+
+        await self.skrim.user(user.user_id).remove_pfp()
+
+        model, _ = await self.skrim.external_id_to_user("pfp_steam_id")
+        self.assertIsNone(model.pfp)
+
+    async def test_ban_index(self) -> None:
+        """Tests
+            1. Bans & revokes of this process apply straight away
+            2. Bans written by another process apply once the
+               index is reloaded
+        """
+
+        bans = Cache.bans
+        Cache.bans = ActiveBanIndex(ttl=0.2)
+        await Cache.bans.load()
+
+        model, user = await self.skrim.create_user(
+            name="Banned", email="banned@pp.com", password="password123"
+        )
+        other, _ = await self.skrim.create_user(
+            name="Other", email="other@pp.com", password="password123"
+        )
+
+        ban_model, ban = await user.create_ban(BanSettings(
+            "Index", timedelta(hours=1), model.user_id
+        ))
+
+        self.assertTrue(await Cache.bans.is_banned(model.user_id))
+
+        await ban.revoke()
+
+        self.assertFalse(await Cache.bans.is_banned(model.user_id))
+
+        # As another process would, without updating the index.
+        await Sessions.database.execute(ban_table.insert().values(
+            ban_id="index_ban",
+            user_id=other.user_id,
+            global_=True,
+            reason="Index",
+            timestamp=datetime.now(),
+            expires=datetime.now() + timedelta(hours=1),
+            revoked=False,
+            banner_id=model.user_id,
+            league_id=None
+        ))
+
+        self.assertFalse(await Cache.bans.is_banned(other.user_id))
+
+        await asyncio.sleep(0.3)
+
+        self.assertEqual(
+            [ban.ban_id for ban in
+             await Cache.bans.active_bans([model.user_id, other.user_id])],
+            ["index_ban"]
+        )
+
+        Cache.bans = bans
@@ -1,18 +1,15 @@
 # -*- coding: utf-8 -*-
 
+import asyncio
 import validators
-import dathost
-import bcrypt
 
 from os import path
 from typing import AsyncGenerator, TYPE_CHECKING, Tuple, Union
 from datetime import datetime
-from sqlalchemy.sql import func, select
+from sqlalchemy.sql import Select, bindparam, func, select, and_, union_all
 from mimetypes import guess_extension
-from backblaze.settings import UploadSettings
-from secrets import token_urlsafe
 
-from .resources import Config, Sessions
+from .resources import Config, Sessions, Cache
 
 from .tables import (
     league_table,
@@ -36,7 +33,9 @@ from .models.user import UserModel
 from .models.ban import BanModel
 
 from .misc import str_uuid4, leagues
-from .email import send_email
+from .database import unique_violation
+from .email import send_template
+from .email.code import create_email_code, compare_email_code
 
 from .webhook import WebhookSender
 
@@ -45,10 +44,35 @@ from .settings.dathost import DathostSettings
 
 from .decorators import validate_region, validate_tickrate
 
+from .statements import Statement
+
 if TYPE_CHECKING:
+    from dathost.models.account import AccountModel
+
     from . import OpenQueue
 
 
+@Statement
+def user_statement() -> Select:
+    return select([
+        user_table,
+        func.group_concat(
+            league_table.c.league_id
+        ).label("league_ids")
+    ]).select_from(
+        user_table.join(
+            league_table,
+            league_table.c.user_id == user_table.c.user_id,
+            isouter=True
+        )
+    ).where(
+        user_table.c.user_id == bindparam("user_id")
+    ).group_by(
+        user_table.c.user_id,
+        league_table.c.user_id
+    )
+
+
 class User:
     def __init__(self, upper: "OpenQueue",  user_id: str) -> None:
         """Used to interact with user.
@@ -111,22 +135,44 @@ class User:
         Returns
         -------
         bool
+
+        Notes
+        -----
+        Codes can only be used once.
         """
 
-        valid_code = await Sessions.database.fetch_val(
-            select([user_table.c.email_code]).select_from(
+        row = await Sessions.database.fetch_one(
+            select([
+                user_table.c.email_code,
+                user_table.c.email_code_expires
+            ]).select_from(
                 user_table
             ).where(
                 user_table.c.user_id == self.user_id
             )
         )
 
-        hashed_code = bcrypt.hashpw(
-            code.encode(),
-            bcrypt.gensalt()
-        )
+        if not row or not row["email_code"] or (
+                row["email_code_expires"] and
+                row["email_code_expires"] <= datetime.now()):
+            return False
+
+        if not compare_email_code(code, row["email_code"]):
+            return False
 
-        return bcrypt.checkpw(valid_code.encode(), hashed_code)
+        # Only one of any requests racing with the same code
+        # clears it.
+        return await Sessions.database.execute_rowcount(
+            user_table.update().values(
+                email_code=None,
+                email_code_expires=None
+            ).where(
+                and_(
+                    user_table.c.user_id == self.user_id,
+                    user_table.c.email_code == row["email_code"]
+                )
+            )
+        ) == 1
 
     async def update(self, name: str = None, pfp_extension: str = None,
                      email: str = None, password: str = None,
@@ -174,81 +220,139 @@ class User:
         if email:
             values["email"] = email
             values["email_confirmed"] = False
-            values["email_code"] = token_urlsafe(24)
+            email_code, values["email_code"], \
+                values["email_code_expires"] = create_email_code()
 
             await Sessions.scheduler.spawn(
-                send_email(
-                    to=email,
-                    subject="OpenQueue | Please confirm your email!",
-                    header="Welcome to OpenQueue, {}!".format(name),
-                    body="""Thanks for joining OpenQueue!
-                    Please click the button to confirm your email.
-
-                    If you didn't sign up to OpenQueue, please
-                    ignore this email.""",
-                    button="Confirm my email",
-                    url=Config.smtp.confirmation + values["email_code"]
-                )
+                send_template(
+                    email, "email_update", name=name,
+                    url=Config.smtp.confirmation + email_code
+                ),
+                "email"
             )
         if password:
+            import bcrypt
+
             values["password"] = bcrypt.hashpw(
                 password.encode(), bcrypt.gensalt()
             )
-        if dathost_settings:
-            try:
-                dathost_account = await dathost.Awaiting(
-                    email=dathost_settings.email,
-                    password=dathost_settings.password,
-                ).account()
-            except Exception:
-                raise InvalidDathostDetails()
-            else:
-                try:
-                    await self.upper.external_id_to_user(
-                        dathost_account.account_id
-                    )
-                except InvalidUser:
-                    pass
-                else:
-                    raise ExternalInUse()
-
-                values["dathost_id"] = dathost_account.account_id
         if steam_id:
-            try:
-                await self.upper.external_id_to_user(steam_id)
-            except InvalidUser:
-                pass
-            else:
-                raise ExternalInUse()
-
             values["steam_id"] = steam_id
         if discord_id:
-            try:
-                await self.upper.external_id_to_user(discord_id)
-            except InvalidUser:
-                pass
-            else:
-                raise ExternalInUse()
-
             values["discord_id"] = discord_id
+
+        # Dathost login is checked while steam & discord
+        # IDs are checked, dathost IDs are protected by
+        # user.dathost_id being unique.
+        if dathost_settings:
+            dathost_account, external_in_use = await asyncio.gather(
+                self.__dathost_account(dathost_settings),
+                self.__external_ids_in_use(steam_id, discord_id)
+            )
+
+            values["dathost_id"] = dathost_account.account_id
+        else:
+            external_in_use = await self.__external_ids_in_use(
+                steam_id, discord_id
+            )
+
+        if external_in_use:
+            raise ExternalInUse()
+
         if email_confirmed is not None:
             values["email_confirmed"] = email_confirmed
 
         if values:
-            await Sessions.database.execute(
-                user_table.update().values(**values).where(
-                    user_table.c.user_id == self.user_id
+            try:
+                await Sessions.database.execute(
+                    user_table.update().values(**values).where(
+                        user_table.c.user_id == self.user_id
+                    )
                 )
-            )
+            except Exception as error:
+                if "dathost_id" in values and \
+                        unique_violation(error, user_table.c.dathost_id):
+                    raise ExternalInUse()
+
+                raise
+
+            if name and Cache.search:
+                Cache.search.add_user(name)
+
+            Cache.external_ids.invalidate(self.user_id)
 
             user_model = await self.get()
 
-            await Sessions.scheduler.spawn(
-                WebhookSender(user_model).user_updated()
-            )
+            await WebhookSender(user_model).spawn("user.updated")
 
             return user_model
 
+    async def __dathost_account(self, dathost_settings: DathostSettings
+                                ) -> "AccountModel":
+        """Used to verify dathost login.
+
+        Parameters
+        ----------
+        dathost_settings : DathostSettings
+
+        Returns
+        -------
+        AccountModel
+
+        Raises
+        ------
+        InvalidDathostDetails
+        """
+
+        import dathost
+
+        try:
+            return await dathost.Awaiting(
+                email=dathost_settings.email,
+                password=dathost_settings.password,
+            ).account()
+        except Exception:
+            raise InvalidDathostDetails()
+
+    async def __external_ids_in_use(self, steam_id: str = None,
+                                    discord_id: int = None) -> bool:
+        """Checks if external IDs are used by another user
+        with one query, every ID is looked up by its own index.
+
+        Parameters
+        ----------
+        steam_id : str, optional
+            by default None
+        discord_id : int, optional
+            by default None
+
+        Returns
+        -------
+        bool
+        """
+
+        probes = [
+            select([user_table.c.user_id]).select_from(
+                user_table
+            ).where(
+                and_(
+                    column == value,
+                    user_table.c.user_id != self.user_id
+                )
+            )
+            for column, value in (
+                (user_table.c.steam_id, steam_id),
+                (user_table.c.discord_id, discord_id)
+            ) if value
+        ]
+
+        if not probes:
+            return False
+
+        return await Sessions.database.fetch_one(
+            union_all(*probes) if len(probes) > 1 else probes[0]
+        ) is not None
+
     async def add_pfp(self, url: str) -> Union[UserModel, None]:
         """Used to add pfp to profile from URL.
 
@@ -274,6 +378,8 @@ class User:
                 if not extension:
                     return
 
+                from backblaze.settings import UploadSettings
+
                 await Sessions.bucket.upload(UploadSettings(
                     path.join(
                         Config.pfp.pathway,
@@ -283,6 +389,33 @@ class User:
 
                 return await self.update(pfp_extension=extension)
 
+    async def remove_pfp(self) -> UserModel:
+        """Used to remove pfp from profile.
+
+        Returns
+        -------
+        UserModel
+
+        Notes
+        -----
+        The uploaded pfp is left in the bucket, it's replaced
+        by the next add_pfp with the same extension.
+        """
+
+        await Sessions.database.execute(
+            user_table.update().values(pfp_extension=None).where(
+                user_table.c.user_id == self.user_id
+            )
+        )
+
+        Cache.external_ids.invalidate(self.user_id)
+
+        user_model = await self.get()
+
+        await WebhookSender(user_model).spawn("user.updated")
+
+        return user_model
+
     async def create_ban(self, ban_settings: BanSettings
                          ) -> Tuple[BanModel, Ban]:
         """Used to ban user.
@@ -325,10 +458,9 @@ class User:
             raise InvalidUser()
         else:
             ban_model = BanModel(**values)
+            Cache.bans.add(ban_model)
 
-            await Sessions.scheduler.spawn(
-                WebhookSender(ban_model).user_banned()
-            )
+            await WebhookSender(ban_model).spawn("user.banned")
 
             return ban_model, self.ban(values["ban_id"])
 
@@ -346,9 +478,15 @@ class User:
             )
         ) == 1
 
-    async def get(self) -> UserModel:
+    async def get(self, replica: bool = False) -> UserModel:
         """Used to get user.
 
+        Parameters
+        ----------
+        replica : bool, optional
+            If the user can be read from a replica, only for
+            showing profiles, by default False
+
         Returns
         -------
         UserModel
@@ -359,23 +497,7 @@ class User:
         """
 
         row = await Sessions.database.fetch_one(
-            select([
-                user_table,
-                func.group_concat(
-                    league_table.c.league_id
-                ).label("league_ids")
-            ]).select_from(
-                user_table.join(
-                    league_table,
-                    league_table.c.user_id == user_table.c.user_id,
-                    isouter=True
-                )
-            ).where(
-                user_table.c.user_id == self.user_id
-            ).group_by(
-                user_table.c.user_id,
-                league_table.c.user_id
-            )
+            user_statement(user_id=self.user_id), replica=replica
         )
 
         if row:
@@ -483,14 +605,16 @@ class User:
         except Exception:
             raise LeagueTaken()
         else:
+            Cache.external_ids.invalidate(self.user_id)
+
             league_model = LeagueModel(
                 email=user.email,
                 dathost_id=user.dathost_id,
                 **values
             )
 
-            await Sessions.scheduler.spawn(
-                WebhookSender(league_model, league_id).league_created()
-            )
+            await WebhookSender(
+                league_model, league_id
+            ).spawn("league.created")
 
             return league_model, League(league_id)
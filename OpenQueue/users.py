@@ -1,17 +1,18 @@
 # -*- coding: utf-8 -*-
 
 
-from typing import AsyncGenerator, List, Tuple
+from typing import List, Tuple
 from sqlalchemy.sql import select
 from datetime import datetime
 
 from .tables import user_table, ban_table
-from .resources import Sessions
+from .resources import Sessions, Cache
 from .exceptions import InvalidUser
 from .settings.ban import BanSettings
-from .models.ban import BanModel
+from .models.ban import BanModel, BansModel
 from .ban import Ban
 from .webhook import WebhookSender
+from .database import integrity_error
 from .misc import str_uuid4
 
 
@@ -27,28 +28,40 @@ class Users:
 
         self.user_ids = user_ids
 
-    async def create_ban(self, ban_settings: BanSettings
-                         ) -> AsyncGenerator[Tuple[BanModel, Ban], None]:
+    async def create_ban(self, ban_settings: BanSettings,
+                         chunk_size: int = 500
+                         ) -> List[Tuple[BanModel, Ban]]:
         """Used to create bans.
 
+        Notes
+        -----
+        Users are validated with one query & bans are inserted
+        in one transaction, a single users.banned webhook
+        is sent holding every ban, rather then a user.banned
+        webhook per ban.
+
         Parameters
         ----------
         ban_settings : BanSettings
+        chunk_size : int, optional
+            Bans per INSERT statement, by default 500
 
         Returns
         -------
-        BanModel
-        Ban
+        List[Tuple[BanModel, Ban]]
+
+        Raises
+        ------
+        InvalidUser
         """
 
+        await self.validate()
+
         now = datetime.now()
         expires = now + ban_settings.expires
 
-        bans = []
-        bans_append = bans.append
-
-        for user_id in self.user_ids:
-            values = {
+        bans = [
+            {
                 "ban_id": str_uuid4(),
                 "user_id": user_id,
                 "global_": False,
@@ -58,24 +71,40 @@ class Users:
                 "revoked": False,
                 "banner_id": ban_settings.banner_id,
                 "league_id": None
-            }
+            } for user_id in self.user_ids
+        ]
 
-            bans_append(values)
+        if not bans:
+            return []
 
+        try:
+            async with Sessions.database.transaction():
+                for index in range(0, len(bans), chunk_size):
+                    await Sessions.database.execute(
+                        ban_table.insert().values(
+                            bans[index:index + chunk_size]
+                        )
+                    )
+        except Exception as error:
+            # A user deleted since being validated.
+            if integrity_error(error):
+                raise InvalidUser()
+
+            raise
+
+        ban_models = []
+        ban_models_append = ban_models.append
+        for values in bans:
             ban_model = BanModel(**values)
+            Cache.bans.add(ban_model)
+            ban_models_append(ban_model)
 
-            await Sessions.scheduler.spawn(
-                WebhookSender(ban_model).user_banned()
-            )
+        await WebhookSender(BansModel(ban_models)).spawn("users.banned")
 
-            yield ban_model, Ban(values["ban_id"], values["user_id"])
-
-        try:
-            await Sessions.database.execute_many(
-                ban_table.insert(), bans
-            )
-        except Exception:
-            raise InvalidUser()
+        return [
+            (ban_model, Ban(ban_model.ban_id, ban_model.user_id))
+            for ban_model in ban_models
+        ]
 
     async def validate(self) -> None:
         """Used to check if users are valid.
@@ -86,18 +115,23 @@ class Users:
             If users invalid.
         """
 
-        user_ids_clone = list(self.user_ids)
-
         query = select([
             user_table.c.user_id
         ]).select_from(user_table).where(
             user_table.c.user_id.in_(self.user_ids)
         )
 
-        async for row in Sessions.database.iterate(query=query):
-            user_ids_clone.remove(row["user_id"])
+        valid_ids = {
+            row["user_id"] async for row in
+            Sessions.database.iterate(query=query)
+        }
+
+        invalid_ids = [
+            user_id for user_id in self.user_ids
+            if user_id not in valid_ids
+        ]
 
-        if len(user_ids_clone) != 0:
+        if invalid_ids:
             raise InvalidUser(
-                invalid_users=user_ids_clone
+                invalid_users=invalid_ids
             )
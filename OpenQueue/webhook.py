@@ -1,13 +1,30 @@
 # -*- coding: utf-8 -*-
 
-from aiohttp import BasicAuth, ClientConnectionError
-
+from typing import TYPE_CHECKING, Awaitable, Dict, Optional, Tuple
 from sqlalchemy.sql import select, and_
 
 from .resources import Config, Sessions
 from .tables import webhook_table
 from .constants import WEBHOOK_EVENTS
+from .encoding import encode_payload
 from .models.base import ApiSchema
+from .scheduler import resumable
+
+if TYPE_CHECKING:
+    from . import OpenQueue
+
+
+# Queued webhooks with a higher priority are sent first,
+# anything not listed is 0.
+PRIORITIES = {
+    "match.start": 2,
+    "match.end": 2,
+    "match.update": 1,
+    "user.banned": 1,
+    "user.ban.revoked": 1,
+    "users.banned": 1,
+    "users.ban.revoked": 1
+}
 
 
 class WebhookSender:
@@ -25,37 +42,82 @@ class WebhookSender:
         self.league_id = league_id
         self.api_schema = model.api_schema(True)
 
-    async def __send(self, url: str, key: str = None,
-                     additional_data: dict = None,
-                     additional_headers: dict = {}) -> None:
+        self.__body: Optional[Tuple[bytes, Dict[str, str]]] = None
+
+    @classmethod
+    def from_schema(cls, api_schema: dict,
+                    league_id: str = None) -> "WebhookSender":
+        """Used to send a payload what was already built.
+
+        Parameters
+        ----------
+        api_schema : dict
+        league_id : str, optional
+            by default None
+
+        Returns
+        -------
+        WebhookSender
+        """
+
+        sender = cls.__new__(cls)
+        sender.league_id = league_id
+        sender.api_schema = api_schema
+        sender.__body = None
+
+        return sender
+
+    def __encode(self, payload: dict) -> Tuple[bytes, Dict[str, str]]:
+        return encode_payload(
+            payload,
+            Config.webhooks.gzip_threshold,
+            Config.webhooks.gzip_level
+        )
+
+    def body(self) -> Tuple[bytes, Dict[str, str]]:
+        """Used to get the payload serialized, shared by every URL
+        the event is sent to.
+
+        Returns
+        -------
+        bytes
+            Body
+        Dict[str, str]
+            Content headers.
+        """
+
+        if self.__body is None:
+            self.__body = self.__encode(self.api_schema)
+
+        return self.__body
+
+    async def __send(self, url: str, body: Tuple[bytes, Dict[str, str]],
+                     key: str = None, additional_headers: dict = {}
+                     ) -> None:
         """Used to send payload.
 
         Parameters
         ----------
         url : str
+        body : Tuple[bytes, Dict[str, str]]
+            Serialized payload & its content headers.
         key : str, optional
             by default None
-        additional_data : dict, optional
-            by default None
         additional_headers : dict, optional
             by default None
         """
 
-        if additional_data:
-            payload = {
-                **self.api_schema,
-                **additional_data
-            }
-        else:
-            payload = self.api_schema
+        from aiohttp import BasicAuth, ClientConnectionError, ClientTimeout
+
+        data, headers = body
 
         try:
             await Sessions.requests.post(
                 url,
-                timeout=Config.webhooks.timeout,
-                json=payload,
+                timeout=ClientTimeout(total=Config.webhooks.timeout),
+                data=data,
                 auth=BasicAuth("", key) if key else None,
-                headers=additional_headers
+                headers={**headers, **additional_headers}
             )
         except ClientConnectionError:
             pass
@@ -78,11 +140,12 @@ class WebhookSender:
                 event_id in Config.webhooks.global_webhooks):
             await self.__send(
                 Config.webhooks.global_webhook_url,
-                Config.webhooks.key,
-                {
+                self.__encode({
+                    **self.api_schema,
                     "__wh_event_id": event_id,
                     "league_id": self.league_id
-                },
+                }),
+                Config.webhooks.key,
                 {"CachingWebhook": "true"}
             )
 
@@ -102,77 +165,117 @@ class WebhookSender:
         async for row in Sessions.database.iterate(query):
             await self.__send(
                 row["url"],
+                self.body(),
                 row["webhook_key"] if self.league_id else Config.webhooks.key
             )
 
+    async def send(self, event: str) -> None:
+        """Used to send a webhook by event name.
+
+        Parameters
+        ----------
+        event : str
+            Key of WEBHOOK_EVENTS, e.g. "match.start".
+        """
+
+        await self.__event(WEBHOOK_EVENTS[event])
+
+    async def spawn(self, event: str) -> None:
+        """Used to send a webhook in the background, persisted
+        if it wasn't sent before shutdown. Match webhooks are
+        sent before user & league ones when webhooks are queued.
+
+        Parameters
+        ----------
+        event : str
+            Key of WEBHOOK_EVENTS, e.g. "match.start".
+        """
+
+        await Sessions.scheduler.spawn(
+            self.send(event),
+            "webhook",
+            ("webhook", {
+                "event": event,
+                "league_id": self.league_id,
+                "api_schema": self.api_schema
+            }),
+            PRIORITIES.get(event, 0)
+        )
+
     async def match_update(self) -> None:
         """Used to send match update webhook.
         """
 
-        await self.__event(WEBHOOK_EVENTS["match.update"])
+        await self.spawn("match.update")
 
     async def match_end(self) -> None:
         """Used to send match end webhook.
         """
 
-        await self.__event(WEBHOOK_EVENTS["match.end"])
+        await self.spawn("match.end")
 
     async def match_start(self) -> None:
         """Used to send match start webhook.
         """
 
-        await self.__event(WEBHOOK_EVENTS["match.start"])
+        await self.spawn("match.start")
 
     async def demo_uploaded(self) -> None:
         """Used to send demo uploaded webhook
         """
 
-        await self.__event(WEBHOOK_EVENTS["demo.uploaded"])
+        await self.spawn("demo.uploaded")
 
     async def user_banned(self) -> None:
         """Used to send user banned webhook.
         """
 
-        await self.__event(WEBHOOK_EVENTS["user.banned"])
+        await self.spawn("user.banned")
 
     async def user_ban_revoked(self) -> None:
         """Used to send user ban revoked webhook.
         """
 
-        await self.__event(WEBHOOK_EVENTS["user.ban.revoked"])
+        await self.spawn("user.ban.revoked")
 
     async def league_created(self) -> None:
         """Used to send league created webhook
         """
 
-        await self.__event(WEBHOOK_EVENTS["league.created"])
+        await self.spawn("league.created")
 
     async def league_updated(self) -> None:
         """Used tp send league updated webhooks.
         """
 
-        await self.__event(WEBHOOK_EVENTS["league.updated"])
+        await self.spawn("league.updated")
 
     async def user_created(self) -> None:
         """Called when user created.
         """
 
-        await self.__event(WEBHOOK_EVENTS["user.created"])
+        await self.spawn("user.created")
 
     async def user_updated(self) -> None:
         """Called when user updated.
         """
 
-        await self.__event(WEBHOOK_EVENTS["user.updated"])
+        await self.spawn("user.updated")
 
     async def league_user_created(self) -> None:
         """Called when league user created.
         """
 
-        await self.__event(WEBHOOK_EVENTS["league.user.created"])
+        await self.spawn("league.user.created")
 
     async def league_user_updated(self) -> None:
         """Called when league user updated.
         """
 
-        await self.__event(WEBHOOK_EVENTS["league.user.updated"])
+        await self.spawn("league.user.updated")
+
+
+@resumable("webhook")
+def resume_webhook(upper: "OpenQueue", event: str, league_id: str,
+                   api_schema: dict) -> Awaitable:
+    return WebhookSender.from_schema(api_schema, league_id).send(event)
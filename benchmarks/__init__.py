@@ -0,0 +1,5 @@
+# -*- coding: utf-8 -*-
+
+"""Benchmarks, run from the project root e.g.
+``python -m benchmarks.ban_wave``.
+"""
@@ -0,0 +1,87 @@
+# -*- coding: utf-8 -*-
+
+"""Sets up the OpenQueue singletons against a throwaway SQLite
+database, so code paths can be timed without MySQL, B2 or Dathost.
+"""
+
+import os
+
+from datetime import datetime
+from tempfile import mkdtemp
+from typing import List
+
+from OpenQueue.resources import Config, Sessions, Cache
+from OpenQueue.database import InstrumentedDatabase
+from OpenQueue.scheduler import JobScheduler
+from OpenQueue.tables import create_tables, user_table
+from OpenQueue.settings.webhook import WebhookSettings
+from OpenQueue.ban_index import ActiveBanIndex
+from OpenQueue.external_ids import ExternalIdResolver
+from OpenQueue.misc import str_uuid4
+
+
+async def startup() -> str:
+    """Creates a SQLite database & connects sessions.
+
+    Returns
+    -------
+    str
+        Path of the database file.
+    """
+
+    pathway = os.path.join(mkdtemp(), "benchmark.db")
+    url = "sqlite:///" + pathway
+
+    create_tables(url)
+
+    Config.webhooks = WebhookSettings(global_webhook_url=None)
+
+    Sessions.database = InstrumentedDatabase(url)
+    await Sessions.database.connect()
+
+    Sessions.scheduler = JobScheduler()
+
+    Cache.bans = ActiveBanIndex()
+    Cache.external_ids = ExternalIdResolver()
+
+    return pathway
+
+
+async def shutdown() -> None:
+    await Sessions.scheduler.drain()
+    await Sessions.database.disconnect()
+
+
+async def create_users(amount: int, chunk_size: int = 500) -> List[str]:
+    """Inserts users.
+
+    Parameters
+    ----------
+    amount : int
+    chunk_size : int, optional
+        by default 500
+
+    Returns
+    -------
+    List[str]
+        User IDs.
+    """
+
+    now = datetime.now()
+    users = []
+    for index in range(amount):
+        user_id = str_uuid4()
+        users.append({
+            "user_id": user_id,
+            "name": "user{}".format(index),
+            "email": "{}@example.com".format(user_id),
+            "email_confirmed": True,
+            "timestamp": now
+        })
+
+    for index in range(0, amount, chunk_size):
+        await Sessions.database.execute(
+            user_table.insert().values(users[index:index + chunk_size])
+        )
+
+    return [user["user_id"] for user in users]
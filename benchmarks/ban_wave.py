@@ -0,0 +1,49 @@
+# -*- coding: utf-8 -*-
+
+"""Throughput of Users.create_ban for ban waves.
+
+python -m benchmarks.ban_wave
+"""
+
+import asyncio
+
+from datetime import timedelta
+from time import perf_counter
+
+from OpenQueue.users import Users
+from OpenQueue.settings.ban import BanSettings
+
+from . import _sqlite
+
+
+WAVES = [1000, 10000]
+
+
+async def main() -> None:
+    await _sqlite.startup()
+
+    banner_id = (await _sqlite.create_users(1))[0]
+    settings = BanSettings(
+        reason="Cheating",
+        expires=timedelta(days=30),
+        banner_id=banner_id
+    )
+
+    for amount in WAVES:
+        user_ids = await _sqlite.create_users(amount)
+
+        start = perf_counter()
+        bans = await Users(user_ids).create_ban(settings)
+        elapsed = perf_counter() - start
+
+        assert len(bans) == amount
+
+        print("{:>6} bans: {:.3f}s ({:,.0f} bans/s)".format(
+            amount, elapsed, amount / elapsed
+        ))
+
+    await _sqlite.shutdown()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,165 @@
+# -*- coding: utf-8 -*-
+
+"""Listing every match & player of a league as models against
+ColumnarResult, memory held by the listing measured with tracemalloc.
+
+python -m benchmarks.columnar
+"""
+
+import asyncio
+import tracemalloc
+
+from datetime import datetime, timedelta
+from time import perf_counter
+from typing import Any, Awaitable, Callable, List
+
+from OpenQueue.resources import Config, Sessions
+from OpenQueue.league import League
+from OpenQueue.models.columnar import ColumnarResult
+from OpenQueue.settings.upload import B2Settings, PfpSettings
+from OpenQueue.tables import (
+    league_table,
+    scoreboard_total_table,
+    scoreboard_table,
+    statistic_table,
+    user_table
+)
+
+from . import _sqlite
+
+
+MATCHES = 2000
+PLAYERS = 10
+
+
+async def seed(league_id: str) -> None:
+    user_ids = await _sqlite.create_users(PLAYERS * 10)
+    now = datetime.now()
+
+    # group_concat skips NULLs, every player needs a pfp.
+    Config.b2 = B2Settings("", "", "", "https://cdn.example.com/")
+    Config.pfp = PfpSettings()
+    await Sessions.database.execute(
+        user_table.update().values(pfp_extension=".png")
+    )
+
+    await Sessions.database.execute(league_table.insert().values(
+        league_id=league_id,
+        league_name="Benchmark",
+        region="oce",
+        user_id=user_ids[0],
+        timestamp=now
+    ))
+
+    await Sessions.database.execute(statistic_table.insert().values([
+        {
+            "user_id": user_id,
+            "league_id": league_id,
+            "elo": float(index),
+            "kills": index,
+            "headshots": index // 2,
+            "deaths": 100 - index,
+            "shots_fired": 1000,
+            "shots_hit": 300
+        } for index, user_id in enumerate(user_ids)
+    ]))
+
+    for match_index in range(MATCHES):
+        match_id = "match{}".format(match_index)
+        players = user_ids[match_index % 10 * PLAYERS:][:PLAYERS]
+
+        await Sessions.database.execute(
+            scoreboard_total_table.insert().values(
+                match_id=match_id,
+                league_id=league_id,
+                raw_ip="127.0.0.1",
+                game_port=27015,
+                timestamp=now - timedelta(minutes=match_index),
+                status=0,
+                demo_status=0,
+                map="de_dust2",
+                team_1_name="Team 1",
+                team_2_name="Team 2",
+                team_1_score=16,
+                team_2_score=14,
+                team_1_side=0,
+                team_2_side=1
+            )
+        )
+
+        await Sessions.database.execute(scoreboard_table.insert().values([
+            {
+                "match_id": match_id,
+                "user_id": user_id,
+                "captain": index in (0, 5),
+                "team": 0 if index < 5 else 1
+            } for index, user_id in enumerate(players)
+        ]))
+
+
+async def measure(name: str, fetch: Callable[[], Awaitable[Any]],
+                  serialize: Callable[[Any], List[dict]]) -> List[dict]:
+    # Timed without tracemalloc, it slows every allocation.
+    start = perf_counter()
+    listing = await fetch()
+    fetched = perf_counter() - start
+
+    del listing
+
+    tracemalloc.start()
+    listing = await fetch()
+    held, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    start = perf_counter()
+    schemas = serialize(listing)
+    serialized = perf_counter() - start
+
+    # Columnar listings build models while serializing,
+    # so only the total compares.
+    print("{:<18} {:>5} rows, fetched {:.3f}s holding {:>6.2f}MB, "
+          "serialized {:.3f}s, total {:.3f}s".format(
+              name, len(schemas), fetched, held / 1024 / 1024, serialized,
+              fetched + serialized
+          ))
+
+    return schemas
+
+
+async def main() -> None:
+    await _sqlite.startup()
+    await seed("bench")
+
+    league = League("bench")
+
+    def models(listing: list) -> List[dict]:
+        return [model.api_schema(True) for model in listing]
+
+    def columnar(listing: ColumnarResult) -> List[dict]:
+        return listing.api_schema(True)
+
+    async def matches() -> list:
+        return [
+            model async for model, _ in league.matches(limit=MATCHES)
+        ]
+
+    async def players() -> list:
+        return [
+            model async for model, _ in
+            league.players(limit=PLAYERS * 10)
+        ]
+
+    assert await measure("matches", matches, models) == await measure(
+        "matches_columnar",
+        lambda: league.matches_columnar(limit=MATCHES), columnar
+    )
+    assert await measure("players", players, models) == await measure(
+        "players_columnar",
+        lambda: league.players_columnar(limit=PLAYERS * 10), columnar
+    )
+
+    await _sqlite.shutdown()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,110 @@
+# -*- coding: utf-8 -*-
+
+"""Time of `import OpenQueue` in a fresh interpreter, against a
+budget so regressions fail loudly. Optional subsystems must stay
+lazy, they're listed if they were imported.
+
+python -m benchmarks.import_time [budget ms]
+"""
+
+import os
+import subprocess
+import sys
+
+from typing import Dict, List, Tuple
+
+
+BUDGET_MS = 400.0
+RUNS = 5
+
+LAZY = (
+    "aiohttp",
+    "aiosmtplib",
+    "backblaze",
+    "bcrypt",
+    "dathost",
+    "jinja2",
+    "zipstream",
+    "sqlalchemy.dialects.postgresql"
+)
+
+ROOT = os.path.dirname(os.path.dirname(os.path.realpath(__file__)))
+
+
+def import_time() -> Tuple[float, Dict[str, float], List[str]]:
+    """Imports OpenQueue in a new interpreter.
+
+    Returns
+    -------
+    float
+        Cumulative ms of importing OpenQueue.
+    Dict[str, float]
+        Cumulative ms per module imported by OpenQueue directly.
+    List[str]
+        Lazy modules what were imported.
+    """
+
+    result = subprocess.run(
+        [
+            sys.executable, "-X", "importtime", "-c",
+            "import sys, OpenQueue; print(' '.join("
+            "name for name in {!r} if name in sys.modules))".format(LAZY)
+        ],
+        cwd=ROOT,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        universal_newlines=True,
+        check=True
+    )
+
+    total = 0.0
+    modules: Dict[str, float] = {}
+    for line in result.stderr.splitlines():
+        _, cumulative, name = line.split("|")
+        if not cumulative.strip().isdigit():
+            continue
+
+        # Each level of nesting is indented by 2 spaces.
+        depth = (len(name) - len(name.lstrip())) // 2
+        name = name.strip()
+
+        if depth == 0:
+            if name == "OpenQueue":
+                total = int(cumulative) / 1000
+                break
+
+            # Children are logged before their parent.
+            modules = {}
+        elif depth == 1:
+            modules[name] = int(cumulative) / 1000
+
+    return total, modules, result.stdout.split()
+
+
+def main() -> None:
+    budget = float(sys.argv[1]) if len(sys.argv) > 1 else BUDGET_MS
+
+    runs = [import_time() for _ in range(RUNS)]
+    total, modules, loaded = min(runs, key=lambda run: run[0])
+
+    print("import OpenQueue: {:.1f}ms (best of {}, budget {:.0f}ms)".format(
+        total, RUNS, budget
+    ))
+    for name, ms in sorted(modules.items(), key=lambda item: -item[1])[:8]:
+        print("  {:<24} {:>8.1f}ms".format(name, ms))
+
+    failed = False
+
+    if loaded:
+        print("Imported eagerly: " + ", ".join(loaded))
+        failed = True
+
+    if total > budget:
+        print("Over budget by {:.1f}ms".format(total - budget))
+        failed = True
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,164 @@
+# -*- coding: utf-8 -*-
+
+"""Throughput & peak memory of exporting a league to ndjson & csv,
+then importing it back.
+
+python -m benchmarks.league_transfer [matches]
+"""
+
+import asyncio
+import os
+import sys
+import tracemalloc
+
+from datetime import datetime, timedelta
+from tempfile import mkdtemp
+from time import perf_counter
+from typing import Awaitable, Callable, Dict
+
+from OpenQueue.resources import Sessions
+from OpenQueue.league import League
+from OpenQueue.league.transfer import PLAYER_TABLES, TABLES, import_league
+from OpenQueue.tables import (
+    league_table,
+    scoreboard_total_table,
+    scoreboard_table,
+    statistic_table
+)
+
+from . import _sqlite
+
+
+MATCHES = 20000
+PLAYERS = 10
+CHUNK_SIZE = 500
+
+
+async def insert(table, rows: list) -> None:
+    for index in range(0, len(rows), CHUNK_SIZE):
+        await Sessions.database.execute(
+            table.insert().values(rows[index:index + CHUNK_SIZE])
+        )
+
+
+async def seed(league_id: str, matches: int) -> None:
+    user_ids = await _sqlite.create_users(PLAYERS * 10)
+    now = datetime.now()
+
+    await Sessions.database.execute(league_table.insert().values(
+        league_id=league_id,
+        league_name="Benchmark",
+        region="oce",
+        user_id=user_ids[0],
+        timestamp=now
+    ))
+
+    await insert(statistic_table, [
+        {
+            "user_id": user_id,
+            "league_id": league_id,
+            "elo": 1000.0,
+            "kills": 10,
+            "deaths": 10
+        } for user_id in user_ids
+    ])
+
+    for start in range(0, matches, CHUNK_SIZE):
+        match_ids = [
+            "m{}".format(index)
+            for index in range(start, min(start + CHUNK_SIZE, matches))
+        ]
+
+        await insert(scoreboard_total_table, [
+            {
+                "match_id": match_id,
+                "league_id": league_id,
+                "raw_ip": "127.0.0.1",
+                "game_port": 27015,
+                "timestamp": now - timedelta(minutes=index),
+                "status": 0,
+                "demo_status": 0,
+                "map": "de_dust2",
+                "team_1_name": "Team 1",
+                "team_2_name": "Team 2",
+                "team_1_score": 16,
+                "team_2_score": 14,
+                "team_1_side": 0,
+                "team_2_side": 1
+            } for index, match_id in enumerate(match_ids)
+        ])
+
+        await insert(scoreboard_table, [
+            {
+                "match_id": match_id,
+                "user_id": user_ids[(index + player) % len(user_ids)],
+                "captain": player in (0, 5),
+                "team": 0 if player < 5 else 1,
+                "kills": player,
+                "deaths": 10 - player
+            } for index, match_id in enumerate(match_ids)
+            for player in range(PLAYERS)
+        ])
+
+
+async def delete(league_id: str) -> None:
+    for table in PLAYER_TABLES:
+        await Sessions.database.execute(table.delete())
+    for table in reversed(list(TABLES.values())):
+        if table not in PLAYER_TABLES:
+            await Sessions.database.execute(
+                table.delete().where(table.c.league_id == league_id)
+            )
+
+
+async def timed(name: str, transfer: Callable[[], Awaitable[Dict[str, int]]]
+                ) -> Dict[str, int]:
+    tracemalloc.start()
+
+    start = perf_counter()
+    counts = await transfer()
+    elapsed = perf_counter() - start
+
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    rows = sum(counts.values())
+    print("{:<14} {:>9,} rows {:>7.2f}s {:>9,.0f} rows/s {:>6.2f}MB peak"
+          .format(name, rows, elapsed, rows / elapsed, peak / 1024 / 1024))
+
+    return counts
+
+
+async def main() -> None:
+    matches = int(sys.argv[1]) if len(sys.argv) > 1 else MATCHES
+
+    await _sqlite.startup()
+    await seed("bench", matches)
+
+    league = League("bench")
+    directory = mkdtemp()
+    ndjson = os.path.join(directory, "league.ndjson")
+    csv = os.path.join(directory, "csv")
+
+    exported = await timed(
+        "export ndjson", lambda: league.export(ndjson, "ndjson")
+    )
+    assert await timed(
+        "export csv", lambda: league.export(csv, "csv")
+    ) == exported
+
+    for pathway, format in ((ndjson, "ndjson"), (csv, "csv")):
+        await delete("bench")
+        imported = await timed(
+            "import " + format,
+            lambda: import_league(pathway, format, CHUNK_SIZE)
+        )
+        assert {
+            table: rows for table, rows in exported.items() if rows
+        } == imported
+
+    await _sqlite.shutdown()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,93 @@
+# -*- coding: utf-8 -*-
+
+"""Throughput of a signup wave of confirmation mails against a
+local aiosmtpd server, a connection per mail like send_email
+used to do vs the pooled MailSender.
+
+python -m benchmarks.mail
+"""
+
+import asyncio
+import aiosmtplib
+
+from email.mime.text import MIMEText
+from time import perf_counter
+from aiosmtpd.controller import Controller
+
+from OpenQueue.email.sender import MailSender
+from OpenQueue.settings.smtp import SmtpSettings
+
+
+HOSTNAME = "127.0.0.1"
+PORT = 8025
+WAVES = [100, 500]
+
+
+class Recorder:
+    def __init__(self) -> None:
+        self.received = 0
+        self.sessions = set()
+
+    async def handle_DATA(self, server, session, envelope) -> str:
+        self.received += 1
+        self.sessions.add(id(session))
+        return "250 OK"
+
+
+def message(index: int) -> MIMEText:
+    message = MIMEText("<p>Please confirm your email.</p>", "html")
+    message["From"] = "bench@openqueue.test"
+    message["To"] = "user{}@openqueue.test".format(index)
+    message["Subject"] = "Please confirm your email!"
+
+    return message
+
+
+async def per_mail(amount: int) -> list:
+    return await asyncio.gather(*[
+        aiosmtplib.send(message(index), hostname=HOSTNAME, port=PORT)
+        for index in range(amount)
+    ], return_exceptions=True)
+
+
+async def pooled(amount: int) -> list:
+    sender = MailSender(SmtpSettings(
+        hostname=HOSTNAME,
+        port=PORT,
+        email="bench@openqueue.test",
+        code_key=b"bench-code-key"
+    ))
+
+    results = await asyncio.gather(*[
+        sender.send(message(index)) for index in range(amount)
+    ], return_exceptions=True)
+    await sender.close()
+
+    return results
+
+
+async def main() -> None:
+    for amount in WAVES:
+        for name, send in (("per mail", per_mail), ("pooled", pooled)):
+            recorder = Recorder()
+            controller = Controller(recorder, hostname=HOSTNAME, port=PORT)
+            controller.start()
+
+            try:
+                start = perf_counter()
+                results = await send(amount)
+                elapsed = perf_counter() - start
+            finally:
+                controller.stop()
+
+            failed = sum(isinstance(result, Exception) for result in results)
+
+            print("{:>4} mails {:<9} {:.3f}s ({:,.0f} mails/s, "
+                  "{} connections, {} failed)".format(
+                      amount, name, elapsed, recorder.received / elapsed,
+                      len(recorder.sessions), failed
+                  ))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,132 @@
+# -*- coding: utf-8 -*-
+
+"""Listing latency of the first & a deep page of matches before and
+after archiving matches older then the horizon.
+
+python -m benchmarks.match_archive [matches]
+"""
+
+import asyncio
+import sys
+
+from datetime import datetime, timedelta
+from time import perf_counter
+
+from OpenQueue.resources import Config, Sessions
+from OpenQueue.league import League
+from OpenQueue.match_archiver import MatchArchiver
+from OpenQueue.settings.archive import MatchArchiveSettings
+from OpenQueue.settings.upload import B2Settings, PfpSettings
+from OpenQueue.tables import (
+    league_table,
+    scoreboard_total_table,
+    scoreboard_table,
+    user_table
+)
+
+from . import _sqlite
+
+
+MATCHES = 20000
+PLAYERS = 10
+CHUNK_SIZE = 500
+# A match every hour, the last 30 days stay hot.
+HORIZON = 30
+RUNS = 20
+
+
+async def seed(league_id: str, matches: int) -> None:
+    user_ids = await _sqlite.create_users(PLAYERS * 10)
+    now = datetime.now()
+
+    # group_concat skips NULLs, every player needs a pfp.
+    Config.b2 = B2Settings("", "", "", "https://cdn.example.com/")
+    Config.pfp = PfpSettings()
+    await Sessions.database.execute(
+        user_table.update().values(pfp_extension=".png")
+    )
+
+    await Sessions.database.execute(league_table.insert().values(
+        league_id=league_id,
+        league_name="Benchmark",
+        region="oce",
+        user_id=user_ids[0],
+        timestamp=now,
+        archive_horizon=HORIZON
+    ))
+
+    for start in range(0, matches, CHUNK_SIZE):
+        indexes = range(start, min(start + CHUNK_SIZE, matches))
+
+        await Sessions.database.execute(
+            scoreboard_total_table.insert().values([
+                {
+                    "match_id": "m{}".format(index),
+                    "league_id": league_id,
+                    "raw_ip": "127.0.0.1",
+                    "game_port": 27015,
+                    "timestamp": now - timedelta(hours=index),
+                    "status": 0,
+                    "demo_status": 0,
+                    "map": "de_dust2",
+                    "team_1_name": "Team 1",
+                    "team_2_name": "Team 2",
+                    "team_1_score": 16,
+                    "team_2_score": 14,
+                    "team_1_side": 0,
+                    "team_2_side": 1
+                } for index in indexes
+            ])
+        )
+
+        for index in indexes:
+            await Sessions.database.execute(
+                scoreboard_table.insert().values([
+                    {
+                        "match_id": "m{}".format(index),
+                        "user_id": user_ids[(index + player) % len(user_ids)],
+                        "captain": player in (0, 5),
+                        "team": 0 if player < 5 else 1
+                    } for player in range(PLAYERS)
+                ])
+            )
+
+
+async def timed(league: League, page: int) -> float:
+    start = perf_counter()
+    for _ in range(RUNS):
+        async for _ in league.matches(page=page, limit=10):
+            pass
+
+    return (perf_counter() - start) / RUNS * 1000
+
+
+async def main() -> None:
+    matches = int(sys.argv[1]) if len(sys.argv) > 1 else MATCHES
+    deep_page = matches // 10 - 5
+
+    await _sqlite.startup()
+    await seed("bench", matches)
+
+    league = League("bench")
+
+    before = await timed(league, 1), await timed(league, deep_page)
+
+    start = perf_counter()
+    archived = await MatchArchiver(MatchArchiveSettings()).archive()
+    print("archived {:,} of {:,} matches in {:.2f}s".format(
+        archived, matches, perf_counter() - start
+    ))
+
+    after = await timed(league, 1), await timed(league, deep_page)
+
+    for name, (hot, deep) in (("before", before), ("after", after)):
+        print("{:<7} page 1 {:>8.2f}ms, page {} {:>8.2f}ms".format(
+            name, hot, deep_page, deep
+        ))
+
+    await _sqlite.shutdown()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,127 @@
+# -*- coding: utf-8 -*-
+
+"""Memory held by models built for a 1000 match listing, measured
+with tracemalloc, plus the time to build them.
+
+python -m benchmarks.model_memory
+"""
+
+import tracemalloc
+
+from datetime import datetime
+from time import perf_counter
+from typing import Callable, List
+
+from OpenQueue.models.match import MatchModel, _ScoreboardPlayerModel
+from OpenQueue.models.user import UserOverviewModel
+from OpenQueue.misc import str_uuid4
+
+
+MODELS = 1000
+
+
+def match_row(now: datetime) -> dict:
+    user_ids = [str_uuid4() for _ in range(10)]
+
+    return {
+        "match_id": str_uuid4(),
+        "raw_ip": "127.0.0.1",
+        "game_port": 27015,
+        "server_id": str_uuid4(),
+        "timestamp": now,
+        "b2_id": None,
+        "status": 0,
+        "demo_status": 0,
+        "map": "de_mirage",
+        "team_1_name": "Team 1",
+        "team_2_name": "Team 2",
+        "team_1_score": 16,
+        "team_2_score": 12,
+        "team_1_side": 0,
+        "team_2_side": 1,
+        "league_id": "bench",
+        "capt_team_1_user_id": user_ids[0],
+        "capt_team_1_pfp_extension": None,
+        "capt_team_2_user_id": user_ids[5],
+        "capt_team_2_pfp_extension": None,
+        "user_ids": ",".join(user_ids),
+        "user_pfp_extensions": ",".join([""] * 10),
+        "user_names": ",".join("user{}".format(i) for i in range(10)),
+        "user_teams": ",".join(["0"] * 5 + ["1"] * 5)
+    }
+
+
+def player_row(now: datetime, index: int) -> dict:
+    return {
+        "name": "player{}".format(index),
+        "user_id": str_uuid4(),
+        "team": index % 2,
+        "discord_id": 100000000000000000 + index,
+        "steam_id": "STEAM_0:1:{}".format(10000 + index),
+        "alive": True,
+        "ping": 20,
+        "kills": 20,
+        "headshots": 10,
+        "assists": 4,
+        "deaths": 15,
+        "shots_fired": 400,
+        "shots_hit": 120,
+        "mvps": 3,
+        "score": 50,
+        "disconnected": False,
+        "timestamp": now
+    }
+
+
+def overview_row(now: datetime, index: int) -> dict:
+    return {
+        "name": "user{}".format(index),
+        "user_id": str_uuid4(),
+        "timestamp": now,
+        "kills": 200,
+        "deaths": 150,
+        "headshots": 90,
+        "matches": 20,
+        "elo": 1000
+    }
+
+
+def measure(name: str, build: Callable[[dict], object],
+            rows: List[dict]) -> None:
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+
+    start = perf_counter()
+    models = [build(row) for row in rows]
+    elapsed = perf_counter() - start
+
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+
+    held = sum(
+        stat.size_diff for stat in after.compare_to(before, "filename")
+    )
+    assert not hasattr(models[0], "__dict__")
+    assert models[0].api_schema(True)
+
+    print("{:<24} {:>6} bytes per model, {:>6.2f}us to build".format(
+        name, held // len(models), elapsed / len(models) * 1000000
+    ))
+
+
+def main() -> None:
+    now = datetime.now()
+
+    print("{} models of each".format(MODELS))
+
+    measure("MatchModel", lambda row: MatchModel(**row),
+            [match_row(now) for _ in range(MODELS)])
+    measure("_ScoreboardPlayerModel",
+            lambda row: _ScoreboardPlayerModel(**row),
+            [player_row(now, index) for index in range(MODELS)])
+    measure("UserOverviewModel", lambda row: UserOverviewModel(**row),
+            [overview_row(now, index) for index in range(MODELS)])
+
+
+if __name__ == "__main__":
+    main()
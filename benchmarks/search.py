@@ -0,0 +1,271 @@
+# -*- coding: utf-8 -*-
+
+"""p50 & p99 of match & player searches, as they were (LIKE over
+every joined scoreboard row) against IDs first with LIKE and with the
+in memory trigram index.
+
+python -m benchmarks.search [matches]
+"""
+
+import asyncio
+import random
+import sqlite3
+import sys
+
+from datetime import datetime, timedelta
+from time import perf_counter
+from typing import Awaitable, Callable, List
+from sqlalchemy import or_
+
+from OpenQueue.resources import Cache, Config, Sessions
+from OpenQueue.league import League
+from OpenQueue.league.misc import matches_select
+from OpenQueue.search import SearchIndex
+from OpenQueue.settings.upload import B2Settings, PfpSettings
+from OpenQueue.tables import (
+    league_table,
+    scoreboard_total_table,
+    statistic_table,
+    user_table
+)
+
+from . import _sqlite
+
+
+MATCHES = 1000000
+USERS = 10000
+PLAYERS = 10
+CHUNK_SIZE = 50000
+RUNS = 50
+
+MAPS = ["de_dust2", "de_inferno", "de_mirage", "de_nuke", "de_overpass",
+        "de_vertigo", "de_ancient", "de_anubis", "cs_office", "cs_italy"]
+NAMES = ["Ace", "Blaze", "Cobra", "Dusty", "Echo", "Frost", "Ghost", "Havoc",
+         "Ion", "Jinx", "Kilo", "Lynx", "Mirage", "Nova", "Onyx", "Pyro"]
+
+SEARCHES = {
+    "map": "dust",
+    "team": "Cobra Squad",
+    "player": "Havoc12",
+    "rare player": "Onyx9999",
+    "no results": "zzzz"
+}
+
+
+def timestamp(value: datetime) -> str:
+    # How SQLAlchemy stores TIMESTAMP in SQLite.
+    return value.strftime("%Y-%m-%d %H:%M:%S.%f")
+
+
+def seed(pathway: str, league_id: str, matches: int) -> List[str]:
+    """Seeds with the sqlite3 module, inserting millions of rows
+    through SQLAlchemy would take longer then the benchmark.
+    """
+
+    random.seed(0)
+    now = datetime.now()
+
+    connection = sqlite3.connect(pathway)
+
+    user_ids = ["u{}".format(index) for index in range(USERS)]
+    connection.executemany(
+        "INSERT INTO user (user_id, name, email, email_confirmed, "
+        "pfp_extension, timestamp) VALUES (?, ?, ?, 1, '.png', ?)",
+        [
+            (user_id, "{}{}".format(NAMES[index % len(NAMES)], index),
+             "{}@example.com".format(user_id), timestamp(now))
+            for index, user_id in enumerate(user_ids)
+        ]
+    )
+
+    teams = ["{} Squad".format(name) for name in NAMES]
+
+    for start in range(0, matches, CHUNK_SIZE):
+        indexes = range(start, min(start + CHUNK_SIZE, matches))
+
+        connection.executemany(
+            "INSERT INTO scoreboard_total (match_id, league_id, raw_ip, "
+            "game_port, timestamp, status, demo_status, map, team_1_name, "
+            "team_2_name, team_1_score, team_2_score, team_1_side, "
+            "team_2_side) VALUES (?, ?, '127.0.0.1', 27015, ?, 0, 0, ?, "
+            "?, ?, 16, 14, 0, 1)",
+            [
+                ("m{}".format(index), league_id,
+                 timestamp(now - timedelta(minutes=index)),
+                 random.choice(MAPS), random.choice(teams),
+                 random.choice(teams))
+                for index in indexes
+            ]
+        )
+
+        connection.executemany(
+            "INSERT INTO scoreboard (match_id, user_id, captain, team, "
+            "alive, ping, kills, headshots, assists, deaths, shots_fired, "
+            "shots_hit, mvps, score, disconnected) "
+            "VALUES (?, ?, ?, ?, 1, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0)",
+            [
+                ("m{}".format(index), user_id, player in (0, 5),
+                 0 if player < 5 else 1)
+                for index in indexes
+                for player, user_id in enumerate(
+                    random.sample(user_ids[:USERS - 1], PLAYERS)
+                )
+            ]
+        )
+
+    # Only played in the oldest match.
+    connection.execute(
+        "UPDATE scoreboard SET user_id = ? WHERE match_id = ? AND team = 0 "
+        "AND captain = 0 AND rowid = (SELECT MIN(rowid) FROM scoreboard "
+        "WHERE match_id = ?)",
+        (user_ids[-1], "m{}".format(matches - 1), "m{}".format(matches - 1))
+    )
+    connection.execute(
+        "UPDATE user SET name = 'Onyx9999' WHERE user_id = ?",
+        (user_ids[-1],)
+    )
+
+    connection.commit()
+    connection.close()
+
+    return user_ids
+
+
+async def legacy(league_id: str, search: str) -> List[str]:
+    """The search as it was, every scoreboard row joined
+    then filtered with LIKE.
+    """
+
+    like = "%{}%".format(search)
+
+    query = matches_select(False).where(
+        or_(
+            scoreboard_total_table.c.match_id == search,
+            scoreboard_total_table.c.map.like(like),
+            scoreboard_total_table.c.team_1_name.like(like),
+            scoreboard_total_table.c.team_2_name.like(like),
+            user_table.c.name.like(like),
+            user_table.c.user_id == search,
+            user_table.c.steam_id == search
+        )
+    ).order_by(
+        scoreboard_total_table.c.timestamp.desc()
+    ).limit(10).params(league_id=league_id)
+
+    return [
+        row["match_id"] for row in await Sessions.database.fetch_all(query)
+    ]
+
+
+async def percentiles(search: Callable[[], Awaitable[list]],
+                      runs: int = RUNS) -> str:
+    timings = []
+    for _ in range(runs):
+        start = perf_counter()
+        await search()
+        timings.append((perf_counter() - start) * 1000)
+
+    timings.sort()
+
+    return "{:>9.2f} {:>9.2f}".format(
+        timings[len(timings) // 2],
+        timings[min(len(timings) - 1, int(len(timings) * 0.99))]
+    )
+
+
+async def main() -> None:
+    matches = int(sys.argv[1]) if len(sys.argv) > 1 else MATCHES
+
+    pathway = await _sqlite.startup()
+
+    # group_concat skips NULLs, every player needs a pfp.
+    Config.b2 = B2Settings("", "", "", "https://cdn.example.com/")
+    Config.pfp = PfpSettings()
+
+    start = perf_counter()
+    user_ids = seed(pathway, "bench", matches)
+
+    await Sessions.database.execute(league_table.insert().values(
+        league_id="bench",
+        league_name="Benchmark",
+        region="oce",
+        user_id=user_ids[0],
+        timestamp=datetime.now()
+    ))
+    for index in range(0, USERS, 500):
+        await Sessions.database.execute(statistic_table.insert().values([
+            {"user_id": user_id, "league_id": "bench", "elo": float(index)}
+            for index, user_id in enumerate(user_ids[index:index + 500])
+        ]))
+
+    print("seeded {:,} matches in {:.0f}s".format(
+        matches, perf_counter() - start
+    ))
+
+    league = League("bench")
+
+    start = perf_counter()
+    index = SearchIndex()
+    await index.load()
+    print("trigram index loaded in {:.0f}ms".format(
+        (perf_counter() - start) * 1000
+    ))
+
+    async def listed(search: str) -> List[str]:
+        return [
+            model.match_id async for model, _ in
+            league.matches(search=search, limit=10)
+        ]
+
+    async def players(search: str) -> List[str]:
+        return [
+            model.user_id async for model, _ in
+            league.players(search=search, limit=10)
+        ]
+
+    print("{:<24} {:>9} {:>9}".format("search", "p50 ms", "p99 ms"))
+
+    for name, search in SEARCHES.items():
+        Cache.search = None
+        like = await listed(search)
+        Cache.search = index
+        assert await listed(search) == like
+
+        # The legacy search runs for seconds, fewer runs.
+        print("{:<24} {}".format(
+            "matches " + name + " was",
+            await percentiles(lambda: legacy("bench", search), 5)
+        ))
+
+        Cache.search = None
+        print("{:<24} {}".format(
+            "matches " + name + " like",
+            await percentiles(lambda: listed(search))
+        ))
+
+        Cache.search = index
+        print("{:<24} {}".format(
+            "matches " + name + " index",
+            await percentiles(lambda: listed(search))
+        ))
+
+    for name, search in (("player", "Havoc"), ("rare player", "Onyx9999")):
+        Cache.search = None
+        like = await players(search)
+        print("{:<24} {}".format(
+            "players " + name + " like",
+            await percentiles(lambda: players(search))
+        ))
+
+        Cache.search = index
+        assert await players(search) == like
+        print("{:<24} {}".format(
+            "players " + name + " index",
+            await percentiles(lambda: players(search))
+        ))
+
+    await _sqlite.shutdown()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
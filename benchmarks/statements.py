@@ -0,0 +1,170 @@
+# -*- coding: utf-8 -*-
+
+"""Per call CPU of building & compiling the hot reads, with and
+without the statement cache. Results of both are compared.
+
+python -m benchmarks.statements
+"""
+
+import asyncio
+
+from datetime import datetime
+from time import perf_counter
+from sqlalchemy.sql import Select, bindparam
+from sqlalchemy.sql.elements import BindParameter, ClauseList, Grouping
+from sqlalchemy.sql.visitors import replacement_traverse
+
+from OpenQueue.resources import Sessions
+from OpenQueue.tables import (
+    league_table,
+    scoreboard_total_table,
+    scoreboard_table
+)
+from OpenQueue.league import league_statement
+from OpenQueue.league.match import match_statement, scoreboard_statement
+from OpenQueue.league.misc import (
+    matches_ids_statement,
+    matches_statement
+)
+from OpenQueue.user import user_statement
+
+from . import _sqlite
+
+
+CALLS = 2000
+
+
+async def seed() -> dict:
+    user_ids = await _sqlite.create_users(10)
+
+    await Sessions.database.execute(league_table.insert().values(
+        league_id="bench",
+        league_name="Benchmark",
+        region="oce",
+        user_id=user_ids[0],
+        timestamp=datetime.now()
+    ))
+
+    await Sessions.database.execute(scoreboard_total_table.insert().values(
+        match_id="match",
+        league_id="bench",
+        raw_ip="127.0.0.1",
+        game_port=27015,
+        timestamp=datetime.now(),
+        status=1,
+        demo_status=0,
+        map="de_dust2",
+        team_1_name="Team 1",
+        team_2_name="Team 2",
+        team_1_score=16,
+        team_2_score=14,
+        team_1_side=0,
+        team_2_side=1
+    ))
+
+    await Sessions.database.execute(scoreboard_table.insert().values([
+        {
+            "match_id": "match",
+            "user_id": user_id,
+            "captain": index in (0, 5),
+            "team": 0 if index < 5 else 1
+        } for index, user_id in enumerate(user_ids)
+    ]))
+
+    return {
+        "user_id": user_ids[0],
+        "league_id": "bench",
+        "match_id": "match"
+    }
+
+
+def cases(ids: dict) -> list:
+    return [
+        ("Match.get", match_statement, (), {
+            "league_id": ids["league_id"], "match_id": ids["match_id"]
+        }),
+        ("Match.scoreboard", scoreboard_statement, (), {
+            "league_id": ids["league_id"], "match_id": ids["match_id"]
+        }),
+        ("League.get", league_statement, (), {
+            "league_id": ids["league_id"]
+        }),
+        ("User.get", user_statement, (), {
+            "user_id": ids["user_id"]
+        }),
+        ("matches ids", matches_ids_statement, (False, True, False), {
+            "league_id": ids["league_id"], "limit": 10, "offset": 0
+        }),
+        ("matches ids user", matches_ids_statement, (True, True, False), {
+            "league_id": ids["league_id"], "user_id": ids["user_id"],
+            "limit": 10, "offset": 0
+        }),
+        ("matches", matches_statement, (True, False), {
+            "league_id": ids["league_id"], "match_ids": [ids["match_id"]]
+        })
+    ]
+
+
+def bind(query: Select, values: dict) -> Select:
+    """Binds values without the cache, like the queries were run
+    before.
+    """
+
+    def replace(element):
+        if not isinstance(element, BindParameter):
+            return None
+
+        value = values[element._orig_key]
+        if element.expanding:
+            # A bind per item, like lists were bound before.
+            return Grouping(ClauseList(*[
+                bindparam(None, item, type_=element.type)
+                for item in value
+            ]))
+
+        return bindparam(
+            element.key, value, type_=element.type, unique=element.unique
+        )
+
+    return replacement_traverse(query, {}, replace)
+
+
+def per_call(func) -> float:
+    start = perf_counter()
+    for _ in range(CALLS):
+        func()
+    return (perf_counter() - start) / CALLS * 1000000
+
+
+async def main() -> None:
+    await _sqlite.startup()
+
+    ids = await seed()
+    dialect = Sessions.database.dialect
+
+    print("{:<16} {:>10} {:>10}".format("query", "before", "after"))
+
+    for name, statement, variant, values in cases(ids):
+        built = bind(statement.build(*variant), values)
+        cached = statement(*variant, **values)
+
+        assert [dict(row) for row in
+                await Sessions.database.fetch_all(built)] == \
+            [dict(row) for row in await Sessions.database.fetch_all(cached)]
+
+        before = per_call(
+            lambda: bind(
+                statement.build(*variant), values
+            ).compile(dialect=dialect)
+        )
+        after = per_call(
+            lambda: statement(*variant, **values).compile(dialect=dialect)
+        )
+
+        print("{:<16} {:>8.0f}us {:>8.0f}us".format(name, before, after))
+
+    await _sqlite.shutdown()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,110 @@
+# -*- coding: utf-8 -*-
+
+"""CPU of serializing a 10 player ScoreboardModel webhook, per
+destination like aiohttp's json= did, against once per event.
+
+python -m benchmarks.webhook_payload
+"""
+
+import gzip
+import json
+
+from datetime import datetime
+from time import perf_counter
+
+from OpenQueue import encoding
+from OpenQueue.models.match import ScoreboardModel
+from OpenQueue.misc import str_uuid4
+
+
+EVENTS = 2000
+DESTINATIONS = 5
+
+
+def scoreboard() -> ScoreboardModel:
+    now = datetime.now()
+
+    def player(index: int, team: int) -> dict:
+        return {
+            "name": "player{}".format(index),
+            "user_id": str_uuid4(),
+            "team": team,
+            "discord_id": 100000000000000000 + index,
+            "steam_id": "STEAM_0:1:{}".format(10000 + index),
+            "alive": True,
+            "ping": 20 + index,
+            "kills": 20 + index,
+            "headshots": 10,
+            "assists": 4,
+            "deaths": 15,
+            "shots_fired": 400,
+            "shots_hit": 120,
+            "mvps": 3,
+            "score": 50 + index,
+            "disconnected": False,
+            "timestamp": now
+        }
+
+    return ScoreboardModel(
+        [player(index, 0) for index in range(5)],
+        [player(index, 1) for index in range(5, 10)],
+        {
+            "match_id": str_uuid4(),
+            "raw_ip": "127.0.0.1",
+            "game_port": 27015,
+            "server_id": str_uuid4(),
+            "timestamp": now,
+            "b2_id": None,
+            "status": 1,
+            "demo_status": 0,
+            "map": "de_mirage",
+            "team_1_name": "Team 1",
+            "team_2_name": "Team 2",
+            "team_1_score": 12,
+            "team_2_score": 9,
+            "team_1_side": 0,
+            "team_2_side": 1,
+            "league_id": "bench"
+        }
+    )
+
+
+def timed(name: str, func) -> None:
+    start = perf_counter()
+    for _ in range(EVENTS):
+        func()
+    elapsed = perf_counter() - start
+
+    print("{:<24} {:>8.1f}us per event".format(
+        name, elapsed / EVENTS * 1000000
+    ))
+
+
+def main() -> None:
+    payload = scoreboard().api_schema(True)
+
+    def per_destination() -> None:
+        for _ in range(DESTINATIONS):
+            json.dumps(payload).encode()
+
+    def once_stdlib() -> None:
+        json.dumps(payload, separators=(",", ":")).encode()
+
+    print("{} events to {} destinations, orjson {}".format(
+        EVENTS, DESTINATIONS,
+        "installed" if encoding.orjson else "not installed"
+    ))
+
+    timed("json per destination", per_destination)
+    timed("json once", once_stdlib)
+    timed("encoding.dumps once", lambda: encoding.dumps(payload))
+    timed("encoding.dumps + gzip", lambda: encoding.encode_payload(
+        payload, gzip_threshold=0
+    ))
+
+    body = encoding.dumps(payload)
+    print("{} bytes, {} gzipped".format(len(body), len(gzip.compress(body))))
+
+
+if __name__ == "__main__":
+    main()
@@ -40,7 +40,8 @@ setup(
         "OpenQueue.queue",
         "OpenQueue.models",
         "OpenQueue.settings",
-        "OpenQueue.tests"
+        "OpenQueue.tests",
+        "OpenQueue.tests.league"
     ],
     python_requires=">=3.6",
     include_package_data=True,